@@ -14,13 +14,21 @@ Features:
 import streamlit as st
 import requests
 import pandas as pd
+import numpy as np
 import io
+import json
+import hashlib
 from pyvis.network import Network
 import streamlit.components.v1 as components
-import tempfile
 import os
 import sys
 
+try:
+    import pyarrow as pa
+except ImportError:
+    # Without pyarrow the dashboard falls back to CSV uploads and JSON/NDJSON transfers
+    pa = None
+
 # Import RelationshipMappingAgent from backend
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'lead_commander_backend', 'app', 'agents')))
 RelationshipMappingAgent = None
@@ -30,9 +38,26 @@ except Exception:
     # If import fails, RelationshipMappingAgent remains None
     pass
 
+# Relationship Map limits: nodes drawn individually, and connections drawn per node
+MAP_MAX_NODES = 1500
+MAP_EDGES_PER_NODE = 8
+MAP_OVERVIEW = "(overview)"
+
 # Set your backend base URL here (update as needed)
 API_BASE_URL = "https://lead-commander.onrender.com/leads"
 BACKEND_URL = "https://lead-commander.onrender.com"
+# Streaming response format supported by the backend (one JSON row per line)
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Columnar bulk format (keeps dtypes, no text parsing)
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+# View Leads pulls one page of these columns from the paged /leads/ API
+LEADS_PAGE_SIZE = 100
+MAX_STORED_LEADS = 1000
+VIEW_LEADS_FIELDS = ["id", "name", "company", "score", "win_probability", "estimated_revenue",
+                     "market_signal_detected", "recommended_action"]
+# Optimize Pipeline reads the stored agent outputs instead of re-running the agents per view
+PIPELINE_FIELDS = ["id", "name", "score", "win_probability", "risk_score", "projected_ltv",
+                   "recommended_action"]
 
 # Set Streamlit page config
 st.set_page_config(
@@ -247,6 +272,137 @@ def call_api(endpoint: str, method="GET", payload=None):
         st.error("Unable to process request. Please try again later.")
         return None
 
+def stream_api(endpoint: str, method="GET", payload=None, base_url=API_BASE_URL, progress_every=500):
+    """
+    Helper to call backend endpoints that can stream newline-delimited JSON.
+    Rows are parsed as they arrive and a running count is shown while the response streams.
+    Falls back to a regular JSON body if the backend does not answer with NDJSON.
+    Args:
+        endpoint (str): API endpoint (e.g., "/optimize")
+        method (str): "GET" or "POST"
+        payload (dict or list): Data to send for POST requests
+        base_url (str): Backend base URL
+        progress_every (int): Update the progress message every N rows
+    Returns:
+        List of rows (dicts) or None on error.
+    """
+    url = base_url + endpoint
+    progress = st.empty()
+    rows = []
+    try:
+        with requests.request(method, url, json=payload, headers={"Accept": NDJSON_MIMETYPE},
+                              stream=True, timeout=30) as resp:
+            resp.raise_for_status()
+            if not resp.headers.get("Content-Type", "").startswith(NDJSON_MIMETYPE):
+                return resp.json()
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                rows.append(json.loads(line))
+                if len(rows) % progress_every == 0:
+                    progress.caption(f"Received {len(rows):,} leads...")
+        return rows
+    except Exception as e:
+        st.error("Unable to process request. Please try again later.")
+        return None
+    finally:
+        progress.empty()
+
+def fetch_leads_page(fields, cursor=None, limit=LEADS_PAGE_SIZE):
+    """
+    Fetches one page of leads from the paged /leads/ API, filtered on the server with the
+    sidebar filters and sorted by score.
+    Args:
+        fields (list): Columns to return
+        cursor (str): next_cursor of the previous page (None for the first page)
+        limit (int): Leads per page
+    Returns:
+        (leads, next_cursor), or (None, None) if the API is unavailable.
+    """
+    f = st.session_state["filters"]
+    params = {"fields": ",".join(fields), "limit": limit, "sort": "score"}
+    # Bounds at their full range are not sent, so leads without a score are still listed
+    if tuple(f["score"]) != (0, 100):
+        params["min_score"], params["max_score"] = f["score"]
+    if tuple(f["win_probability"]) != (0, 100):
+        params["min_win_probability"], params["max_win_probability"] = f["win_probability"]
+    if f["market_signal_only"]:
+        params["market_signal_detected"] = "true"
+    if f["recommended_actions"]:
+        params["recommended_action"] = f["recommended_actions"]
+    if cursor:
+        params["cursor"] = cursor
+    try:
+        with st.spinner("Loading leads..."):
+            resp = requests.get(API_BASE_URL + "/", params=params, timeout=30)
+            resp.raise_for_status()
+            data = resp.json().get("data") or {}
+        return data.get("leads", []), data.get("next_cursor")
+    except Exception:
+        return None, None
+
+def leads_filter_signature():
+    """
+    The sidebar filter values the leads API is queried with, as a comparable tuple.
+    """
+    f = st.session_state["filters"]
+    return (tuple(f["score"]), tuple(f["win_probability"]), f["market_signal_only"],
+            tuple(f["recommended_actions"]))
+
+def fetch_revenue_by_action():
+    """
+    Fetches the lead count and estimated revenue per recommended action from the /leads/ API.
+    Returns:
+        pd.DataFrame, or None if the API is unavailable.
+    """
+    try:
+        resp = requests.get(API_BASE_URL + "/revenue_by_action", timeout=30)
+        resp.raise_for_status()
+        return pd.DataFrame(resp.json().get("data") or [])
+    except Exception:
+        return None
+
+def post_frame(endpoint: str, df: pd.DataFrame, base_url=API_BASE_URL) -> pd.DataFrame:
+    """
+    Sends a DataFrame to a backend endpoint as Arrow IPC and reads the Arrow IPC response.
+    Raises on transport or conversion errors so callers can fall back to JSON.
+    Args:
+        endpoint (str): API endpoint (e.g., "/optimize")
+        df (pd.DataFrame): Leads to send
+        base_url (str): Backend base URL
+    Returns:
+        The response as a DataFrame (dtypes preserved).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    resp = requests.post(
+        base_url + endpoint,
+        data=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": ARROW_STREAM_MIMETYPE, "Accept": ARROW_STREAM_MIMETYPE},
+        timeout=30
+    )
+    resp.raise_for_status()
+    if not resp.headers.get("Content-Type", "").startswith(ARROW_STREAM_MIMETYPE):
+        raise ValueError("Backend did not return Arrow IPC.")
+    return pa.ipc.open_stream(resp.content).read_pandas()
+
+def read_leads_file(uploaded_file) -> pd.DataFrame:
+    """
+    Reads an uploaded CSV, Parquet or Arrow IPC (.arrow/.feather file or .arrows stream) file.
+    """
+    name = uploaded_file.name.lower()
+    if name.endswith(".parquet"):
+        return pd.read_parquet(uploaded_file)
+    if name.endswith((".arrow", ".feather")):
+        return pd.read_feather(uploaded_file)
+    if name.endswith(".arrows"):
+        if pa is None:
+            raise ImportError("Reading Arrow streams requires pyarrow.")
+        return pa.ipc.open_stream(uploaded_file.read()).read_pandas()
+    return pd.read_csv(uploaded_file)
+
 def section_header(title: str):
     st.markdown("")
     st.markdown(f'<div class="section-header">{title}</div>', unsafe_allow_html=True)
@@ -324,6 +480,148 @@ def apply_filters(df: pd.DataFrame):
         df = df[df["recommended_action"].isin(f["recommended_actions"])]
     return df
 
+def risk_color(risk) -> str:
+    # Color by risk_score
+    if risk < 0.4:
+        return "green"
+    if risk < 0.7:
+        return "yellow"
+    return "red"
+
+def relationship_graph_hash(leads_df: pd.DataFrame, *settings) -> str:
+    """
+    Content hash of the leads and rendering settings, used as the Relationship Map cache key.
+    """
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(leads_df.astype(str), index=False).to_numpy().tobytes())
+    digest.update(json.dumps([list(map(str, leads_df.columns))] + [str(s) for s in settings]).encode())
+    return digest.hexdigest()
+
+def layout_relationship_map(leads_df: pd.DataFrame, drill=None, max_nodes=MAP_MAX_NODES,
+                            edges_per_node=MAP_EDGES_PER_NODE):
+    """
+    Server-side layout for the Relationship Map.
+
+    Leads are grouped by industry bucket. The largest groups are collapsed into one super-node
+    each until at most max_nodes nodes remain (the drilled-into group always stays expanded).
+    Groups sit on a spiral with their leads around them, so the browser needs no physics.
+    Each industry/location bucket is drawn as a short chain of links instead of a clique, and
+    no node gets more than edges_per_node links.
+
+    Returns (nodes, edges, hidden): pyvis node dicts, (from, to) pairs, and the number of
+    drilled leads not drawn because the group exceeds max_nodes.
+    """
+    leads_list = leads_df.to_dict(orient="records")
+    graph = RelationshipMappingAgent().build_graph(leads_list)
+    n = len(graph)
+    groups = graph.buckets[graph.fields[0]]
+    # Leads without a comparable industry (missing/NaN) are laid out as one more group
+    group_codes = np.where(groups.codes >= 0, groups.codes, len(groups.values))
+    group_labels = [str(value) for value in groups.values] + ["(no industry)"]
+    sizes = np.bincount(group_codes, minlength=len(group_labels))
+    drill_code = next((code for code, label in enumerate(group_labels[:-1]) if label == drill), None)
+
+    # A drilled group larger than max_nodes is drawn up to the limit
+    drawn = np.ones(n, dtype=bool)
+    hidden = 0
+    if drill_code is not None and sizes[drill_code] > max_nodes:
+        members = np.flatnonzero(group_codes == drill_code)
+        drawn[members[max_nodes:]] = False
+        hidden = len(members) - max_nodes
+    collapsed = np.zeros(len(sizes), dtype=bool)
+    node_count = int(drawn.sum())
+    for code in np.argsort(-sizes, kind="stable"):
+        if node_count <= max_nodes or sizes[code] < 2:
+            break
+        if code != drill_code:
+            collapsed[code] = True
+            node_count -= sizes[code] - 1
+
+    # Group centers on a sunflower spiral, spaced by each group's footprint
+    golden = np.pi * (3 - np.sqrt(5))
+    spacing = 18.0
+    order = np.argsort(-sizes, kind="stable")
+    drawn_sizes = np.bincount(group_codes[drawn], minlength=len(sizes))
+    radius = np.where(collapsed, 40.0, spacing * np.sqrt(np.maximum(drawn_sizes, 1)) + 20)
+    ring = np.sqrt(np.cumsum((2 * radius[order]) ** 2))
+    centers = np.zeros((len(sizes), 2))
+    angles = np.arange(len(order)) * golden
+    centers[order] = np.column_stack((ring * np.cos(angles), ring * np.sin(angles)))
+
+    risk = pd.to_numeric(leads_df.get("risk_score", pd.Series(0.0, index=leads_df.index)), errors="coerce").fillna(0.0).to_numpy()
+    ltv = pd.to_numeric(leads_df.get("projected_ltv", pd.Series(100.0, index=leads_df.index)), errors="coerce").fillna(100.0).to_numpy()
+    nodes, display = [], np.full(n, -1, dtype=np.int64)
+    for code in np.flatnonzero(collapsed):
+        members = group_codes == code
+        display[members] = len(nodes)
+        nodes.append({
+            "id": f"group:{code}", "label": f"{group_labels[code]} ({sizes[code]:,} leads)",
+            "color": risk_color(risk[members].mean()), "size": float(min(80, 25 + 5 * np.log2(sizes[code]))),
+            "shape": "dot", "borderWidth": 4,
+            "title": f"{group_labels[code]}<br>{sizes[code]:,} leads<br>Avg risk: {risk[members].mean():.2f}"
+                     f"<br>Total LTV: ${ltv[members].sum():,.2f}<br>Pick it under 'Drill into cluster' to expand.",
+            "x": float(centers[code, 0]), "y": float(centers[code, 1]),
+        })
+    rank_in_group = pd.Series(group_codes).groupby(group_codes).cumcount().to_numpy()
+    for position in np.flatnonzero(~collapsed[group_codes] & drawn):
+        lead = leads_list[position]
+        # Leads on a small sunflower around their group center
+        k = rank_in_group[position]
+        center = centers[group_codes[position]]
+        name = lead.get("name", f"Lead {lead['id']}")
+        display[position] = len(nodes)
+        nodes.append({
+            "id": str(lead["id"]), "label": str(name), "color": risk_color(risk[position]),
+            # Node size by projected_ltv (min 10, max 60)
+            "size": float(max(10, min(60, ltv[position] / 100 * 30 + 20))),
+            "title": f"{name}<br>Risk: {risk[position]:.2f}<br>LTV: ${ltv[position]:,.2f}",
+            "x": float(center[0] + spacing * np.sqrt(k) * np.cos(k * golden)),
+            "y": float(center[1] + spacing * np.sqrt(k) * np.sin(k * golden)),
+        })
+
+    # Each bucket as a chain over its distinct display nodes, then cap links per node
+    reach = max(1, edges_per_node // (2 * len(graph.fields)))
+    edges, degree = [], np.zeros(len(nodes), dtype=np.int64)
+    for field in graph.fields:
+        codes = graph.buckets[field].codes
+        valid = (codes >= 0) & (display >= 0)
+        chain = pd.DataFrame({"bucket": codes[valid], "node": display[valid]}).drop_duplicates()
+        chain = chain.sort_values("bucket", kind="stable")
+        buckets, chain_nodes = chain["bucket"].to_numpy(), chain["node"].to_numpy()
+        for step in range(1, reach + 1):
+            same = buckets[step:] == buckets[:-step]
+            for a, b in zip(chain_nodes[:-step][same], chain_nodes[step:][same]):
+                if degree[a] < edges_per_node and degree[b] < edges_per_node:
+                    edges.append((nodes[a]["id"], nodes[b]["id"]))
+                    degree[a] += 1
+                    degree[b] += 1
+    return nodes, list(dict.fromkeys(edges)), hidden
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def render_relationship_html(graph_hash: str, _leads_df: pd.DataFrame, drill, max_nodes: int, edges_per_node: int):
+    """
+    Builds the Relationship Map HTML once per graph_hash (leads plus settings); reruns with the
+    same leads and settings reuse it instead of rebuilding the network.
+    """
+    nodes, edges, hidden = layout_relationship_map(_leads_df, drill, max_nodes, edges_per_node)
+    net = Network(height="600px", width="100%", bgcolor="#222222", font_color="white", notebook=False,
+                  directed=False, cdn_resources="in_line")
+    for node in nodes:
+        node = dict(node)
+        net.add_node(node.pop("id"), physics=False, **node)
+    for source, target in edges:
+        net.add_edge(source, target)
+    net.toggle_physics(False)
+    net.set_options("""
+    var options = {
+      "nodes": {"borderWidth": 2, "shadow": false},
+      "edges": {"color": {"inherit": true}, "smooth": false},
+      "interaction": {"hover": true, "navigationButtons": true, "keyboard": true, "hideEdgesOnDrag": true},
+      "physics": {"enabled": false}
+    }
+    """)
+    return net.generate_html(notebook=False), len(nodes), len(edges), hidden
+
 st.title("Lead Commander Dashboard")
 
 # Sidebar navigation menu (inserted after login and dashboard title)
@@ -341,7 +639,10 @@ menu = st.sidebar.selectbox(
 
 if menu == "Upload Leads":
     section_header("Upload Leads")
-    uploaded_file = st.file_uploader("Upload a CSV file of leads", type=["csv"])
+    uploaded_file = st.file_uploader(
+        "Upload a file of leads (CSV, Parquet or Arrow)",
+        type=["csv", "parquet", "arrow", "arrows", "feather"]
+    )
     clear = st.button("Clear Uploaded Leads")
     if clear:
         st.session_state["uploaded_leads"] = None
@@ -349,7 +650,7 @@ if menu == "Upload Leads":
 
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            df = read_leads_file(uploaded_file)
             # Validate for 'name' or 'company' column
             cols = [c.lower() for c in df.columns]
             if "name" not in cols and "company" not in cols:
@@ -360,7 +661,7 @@ if menu == "Upload Leads":
                 st.markdown(f"**Columns detected:** {', '.join(df.columns)}")
                 st.markdown("---")
         except Exception as e:
-            st.error(f"Error reading CSV: {e}")
+            st.error(f"Error reading file: {e}")
 
 elif menu == "Relationship Map":
     section_header("Relationship Map")
@@ -387,75 +688,23 @@ elif menu == "Relationship Map":
                 leads_df["risk_score"] = 0.0
             if "projected_ltv" not in leads_df.columns:
                 leads_df["projected_ltv"] = 100.0
-            # Step 2: Generate relationships
-            leads_list = leads_df.to_dict(orient="records")
-            agent = RelationshipMappingAgent()
-            relationships = agent.run(leads_list)
-            lead_data = {str(lead["id"]): lead for lead in leads_list}
-            # Step 3: Build pyvis network
-            net = Network(height="600px", width="100%", bgcolor="#222222", font_color="white", notebook=False, directed=False)
-            for lead_id, data in relationships.items():
-                lead = lead_data.get(str(lead_id)) or lead_data.get(lead_id)
-                if not lead:
-                    continue
-                risk = lead.get("risk_score", 0.0)
-                ltv = lead.get("projected_ltv", 100.0)
-                name = lead.get("name", f"Lead {lead_id}")
-                # Color by risk_score
-                if risk < 0.4:
-                    risk_color = "green"
-                elif risk < 0.7:
-                    risk_color = "yellow"
-                else:
-                    risk_color = "red"
-                # Node size by projected_ltv (min 10, max 60)
-                node_size = max(10, min(60, ltv / 100 * 30 + 20))
-                tooltip = f"{name}<br>Risk: {risk:.2f}<br>LTV: ${ltv:,.2f}"
-                net.add_node(
-                    lead_id,
-                    label=name,
-                    color=risk_color,
-                    size=node_size,
-                    title=tooltip
+            # Step 2: Pick a cluster to expand (large industry clusters are drawn as super-nodes)
+            industries = leads_df["industry"].dropna().astype(str).value_counts() if "industry" in leads_df.columns else pd.Series(dtype=int)
+            clusters = [MAP_OVERVIEW] + industries[industries > 1].index[:200].tolist()
+            drill = st.selectbox("Drill into cluster", clusters)
+            drill = None if drill == MAP_OVERVIEW else drill
+            # Step 3: Layout and HTML are computed once per graph and cached by its hash
+            graph_hash = relationship_graph_hash(leads_df, drill, MAP_MAX_NODES, MAP_EDGES_PER_NODE)
+            with st.spinner("Building relationship map..."):
+                html, node_count, edge_count, hidden = render_relationship_html(
+                    graph_hash, leads_df, drill, MAP_MAX_NODES, MAP_EDGES_PER_NODE
                 )
-                for connection_id in data.get("connections", []):
-                    net.add_edge(lead_id, connection_id)
-            net.toggle_physics(True)
-            net.set_options("""
-            var options = {
-              "nodes": {
-                "borderWidth": 2,
-                "shadow": true
-              },
-              "edges": {
-                "color": {
-                  "inherit": true
-                },
-                "smooth": false
-              },
-              "interaction": {
-                "hover": true,
-                "navigationButtons": true,
-                "keyboard": true
-              },
-              "physics": {
-                "enabled": true,
-                "barnesHut": {
-                  "gravitationalConstant": -8000,
-                  "centralGravity": 0.3,
-                  "springLength": 95,
-                  "springConstant": 0.04,
-                  "damping": 0.09,
-                  "avoidOverlap": 0.1
-                }
-              }
-            }
-            """)
-            # Step 4: Save and display
-            with tempfile.NamedTemporaryFile("w+", suffix=".html", delete=False) as tmp_file:
-                net.save_graph(tmp_file.name)
-                tmp_file.flush()
-                components.iframe(tmp_file.name, height=600, scrolling=True)
+            # Step 4: Display
+            components.html(html, height=620, scrolling=True)
+            if hidden:
+                st.caption(f"Showing the first {MAP_MAX_NODES:,} leads of this cluster ({hidden:,} more not drawn).")
+            st.caption(f"{node_count:,} nodes, {edge_count:,} links (at most {MAP_EDGES_PER_NODE} per node). "
+                       "Large clusters are drawn as super-nodes; pick one above to expand it.")
             st.caption("Pan, zoom, and hover nodes for details. Node color = risk, size = LTV.")
 
 elif menu == "View Leads":
@@ -465,14 +714,22 @@ elif menu == "View Leads":
         st.info("Viewing uploaded leads")
         df = st.session_state["uploaded_leads"]
     else:
-        if st.button("Refresh Leads"):
-            leads = call_api("/get_leads", method="GET")
-        else:
+        # A cursor only continues the listing it came from: start over when the filters change
+        filter_signature = leads_filter_signature()
+        if st.button("Refresh Leads") or st.session_state.get("leads_cursor_filters") != filter_signature:
+            st.session_state["leads_cursor"] = None
+            st.session_state["leads_cursor_filters"] = filter_signature
+        # One filtered page of the columns shown here; older backends only offer the full list
+        leads, next_cursor = fetch_leads_page(VIEW_LEADS_FIELDS, st.session_state.get("leads_cursor"))
+        if leads is None:
             leads = call_api("/get_leads", method="GET")
         if leads is not None and isinstance(leads, list) and len(leads) > 0:
             df = pd.DataFrame(leads)
         else:
             df = pd.DataFrame()
+        if next_cursor and st.button("Next Page"):
+            st.session_state["leads_cursor"] = next_cursor
+            st.rerun()
     # Optimize Pipeline Button
     if not df.empty:
         st.markdown(
@@ -486,18 +743,21 @@ elif menu == "View Leads":
     if not df.empty and optimize_clicked:
         with st.spinner("Optimizing leads..."):
             try:
-                # Send to backend /optimize endpoint
-                leads_json = df.to_dict(orient="records")
-                import requests
-                response = requests.post(
-                    BACKEND_URL + "/optimize",
-                    json=leads_json,
-                    headers={"Content-Type": "application/json"},
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    scored_leads = response.json()
+                # Send to backend /optimize endpoint as Arrow IPC when possible (sorted by Score);
+                # otherwise scored rows stream back as NDJSON in upload order
+                scored_leads = None
+                if pa is not None:
+                    try:
+                        scored_leads = post_frame("/optimize", df, base_url=BACKEND_URL)
+                    except Exception:
+                        scored_leads = None
+                if scored_leads is None:
+                    scored_leads = stream_api("/optimize", method="POST", payload=df.to_dict(orient="records"),
+                                              base_url=BACKEND_URL)
+                if scored_leads is not None:
                     df = pd.DataFrame(scored_leads)
+                    if "Score" in df.columns:
+                        df = df.sort_values("Score", ascending=False, kind="stable")
                     st.session_state["uploaded_leads"] = df
                     st.success("Leads optimized and scored!")
                 else:
@@ -531,14 +791,22 @@ elif menu == "Optimize Pipeline":
     if "optimized_leads" not in st.session_state:
         st.session_state["optimized_leads"] = None
     leads = None
+    stored = None
     if st.session_state["uploaded_leads"] is not None:
         leads = st.session_state["uploaded_leads"].to_dict(orient="records")
     else:
-        api_leads = call_api("/get_leads", method="GET")
-        if api_leads is not None and isinstance(api_leads, list) and len(api_leads) > 0:
-            leads = api_leads
+        # Scored leads from the database (top by score); older backends only offer the full list
+        stored, _ = fetch_leads_page(PIPELINE_FIELDS, limit=MAX_STORED_LEADS)
+        # Nulls sort last: an unscored first lead means the score recompute job has not run yet
+        if not stored or stored[0].get("score") is None:
+            stored = None
+            api_leads = call_api("/get_leads", method="GET")
+            if api_leads is not None and isinstance(api_leads, list) and len(api_leads) > 0:
+                leads = api_leads
     df = pd.DataFrame()
-    if leads is not None:
+    if stored is not None:
+        df = pd.DataFrame(stored)
+    elif leads is not None:
         try:
             if st.session_state["optimized_leads"] is not None:
                 optimized = st.session_state["optimized_leads"]
@@ -582,6 +850,11 @@ elif menu == "Optimize Pipeline":
             height=min(600, 40 + 35 * len(filtered)),
             hide_index=True
         )
+        if stored is not None:
+            revenue = fetch_revenue_by_action()
+            if revenue is not None and not revenue.empty:
+                st.markdown("**Estimated revenue by recommended action**")
+                st.dataframe(revenue, use_container_width=True, hide_index=True)
     else:
         st.info("No optimized pipeline data available.")
     st.markdown("---")
@@ -665,7 +938,7 @@ elif menu == "Coaching Tips":
             if st.session_state["coaching_tips"] is not None:
                 coached = st.session_state["coaching_tips"]
             else:
-                coached = call_api("/generate_coaching", method="POST", payload=leads)
+                coached = stream_api("/generate_coaching", method="POST", payload=leads)
                 if not (coached and isinstance(coached, list) and len(coached) > 0):
                     coached = [
                         {
@@ -4,10 +4,25 @@ automation_agent.py
 Defines the AutomationAgent class for simulating automated actions based on recommended pipeline actions.
 
 - execute_action: Enriches a lead with an automation_status field based on recommended_action.
+- execute_action_batch: Computes automation_status for a whole DataFrame of leads.
+- automation_status_for: Returns the automation status for a recommended action.
 """
 
 from typing import Dict
 
+import pandas as pd
+
+from app.services.column_ops import column, labels, rowwise
+
+# recommended_action -> automation_status
+AUTOMATION_STATUSES = {
+    "Move to Contract Stage": "CRM task created",
+    "Schedule Follow-Up Call": "Follow-up call scheduled",
+    "Send Discount Offer": "Discount email sent",
+    "Nurture — Low Priority": "Nurture task scheduled",
+}
+NO_ACTION = "No action taken"
+
 class AutomationAgent:
     """
     Simulates automation of actions for leads based on recommended_action.
@@ -36,17 +51,33 @@ class AutomationAgent:
             dict: The updated lead dictionary with automation_status.
         """
         lead = lead.copy()
-        action = lead.get("recommended_action", "")
-
-        if action == "Move to Contract Stage":
-            lead["automation_status"] = "CRM task created"
-        elif action == "Schedule Follow-Up Call":
-            lead["automation_status"] = "Follow-up call scheduled"
-        elif action == "Send Discount Offer":
-            lead["automation_status"] = "Discount email sent"
-        elif action == "Nurture — Low Priority":
-            lead["automation_status"] = "Nurture task scheduled"
+        lead["automation_status"] = self.automation_status_for(lead.get("recommended_action", ""))
+        return lead
+
+    def execute_action_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        Applies the automation rules to every row of a DataFrame.
+
+        Returns:
+            pd.Series: automation_status aligned with leads.index, identical to execute_action
+            on leads.to_dict(orient="records").
+        """
+        action = column(leads, "recommended_action", "")
+        try:
+            codes, uniques = pd.factorize(action)
+        except TypeError:
+            statuses = rowwise(self.automation_status_for, action)
         else:
-            lead["automation_status"] = "No action taken"
+            # Apply the rules once per distinct action; nulls match no action
+            statuses = labels(codes, [self.automation_status_for(value) for value in uniques] + [NO_ACTION])
+        return pd.Series(statuses, index=leads.index, name="automation_status", dtype=object)
 
-        return lead
+    def automation_status_for(self, action) -> str:
+        """
+        Returns the automation status for the given recommended_action
+        (the rules of execute_action, without copying a lead).
+        """
+        for known, status in AUTOMATION_STATUSES.items():
+            if action == known:
+                return status
+        return NO_ACTION
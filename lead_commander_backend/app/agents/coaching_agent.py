@@ -4,10 +4,24 @@ coaching_agent.py
 Defines the CoachingAgent class for generating sales coaching tips for leads.
 
 - generate_coaching_tip: Enriches a lead with a coaching_tip field based on market_signal_detected and win_probability.
+- generate_coaching_tip_batch: Computes coaching_tip for a whole DataFrame of leads with vectorized selects.
+- coaching_tip_for: Returns the coaching tip for a win probability and market signal flag.
 """
 
 from typing import Dict
 
+import numpy as np
+import pandas as pd
+
+from app.services.column_ops import column, labels, numeric_values, rowwise, truthy
+
+COACHING_TIPS = [
+    "Use market momentum to close quickly.",
+    "Highlight lead's internal motivation to close deal.",
+    "Address objections early and reinforce value proposition.",
+    "Focus on building relationship and understanding lead’s deeper needs.",
+]
+
 class CoachingAgent:
     """
     Provides simple rule-based coaching tips for sales reps based on lead context.
@@ -34,16 +48,40 @@ class CoachingAgent:
             dict: The updated lead dictionary with coaching_tip.
         """
         lead = lead.copy()
-        win_prob = lead.get("win_probability", 0)
-        signal = lead.get("market_signal_detected", False)
+        lead["coaching_tip"] = self.coaching_tip_for(
+            lead.get("win_probability", 0), lead.get("market_signal_detected", False)
+        )
+        return lead
+
+    def generate_coaching_tip_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        Applies the coaching rules to every row of a DataFrame.
+
+        Returns:
+            pd.Series: coaching_tip aligned with leads.index, identical to generate_coaching_tip
+            on leads.to_dict(orient="records").
+        """
+        win_prob = column(leads, "win_probability", 0)
+        signal = column(leads, "market_signal_detected", False)
+        values = numeric_values(win_prob)
+        if values is None:
+            tips = rowwise(self.coaching_tip_for, win_prob, signal)
+        else:
+            high = values >= 80
+            codes = np.select([truthy(signal) & high, high, (values >= 50) & (values < 80)], [0, 1, 2], 3)
+            tips = labels(codes, COACHING_TIPS)
+        return pd.Series(tips, index=leads.index, name="coaching_tip", dtype=object)
 
+    def coaching_tip_for(self, win_prob, signal) -> str:
+        """
+        Returns the coaching tip for the given win_probability and market_signal_detected values
+        (the rules of generate_coaching_tip, without copying a lead).
+        """
         if signal and win_prob >= 80:
-            lead["coaching_tip"] = "Use market momentum to close quickly."
+            return COACHING_TIPS[0]
         elif win_prob >= 80:
-            lead["coaching_tip"] = "Highlight lead's internal motivation to close deal."
+            return COACHING_TIPS[1]
         elif 50 <= win_prob < 80:
-            lead["coaching_tip"] = "Address objections early and reinforce value proposition."
+            return COACHING_TIPS[2]
         else:
-            lead["coaching_tip"] = "Focus on building relationship and understanding lead’s deeper needs."
-
-        return lead
+            return COACHING_TIPS[3]
@@ -4,21 +4,53 @@ insight_agent.py
 Implements the InsightSummarizationAgent class for generating intelligent lead opportunity summaries using GPT-4.
 
 - generate_insight: Uses OpenAI GPT-4 (via service layer) to create a short summary of the lead's opportunity potential.
+  Responses are cached by a hash of the prompt and model (app.services.llm_cache), so unchanged leads cost no API call.
+- generate_insights / agenerate_insights: Batch version; cache misses are completed concurrently under the
+  service's rate limits, and summaries are returned in the order of the leads. Identical prompts are sent
+  once, and pack_size > 1 packs several leads into one request (app.services.prompt_batching).
 """
 
-from typing import Dict
+import logging
+from typing import Dict, List, Optional, Sequence
+from app.services.llm_cache import LLMResponseCache, get_llm_cache
 from app.services.openai_service import OpenAIService
+from app.services.prompt_batching import dedupe_prompts, pack_prompt, parse_packed_response, reduction_report
+
+logger = logging.getLogger(__name__)
+
+INSTRUCTIONS = (
+    "You are a B2B sales intelligence assistant. "
+    "Given the following lead data, write a concise, intelligent summary (3–5 sentences) "
+    "of this lead's opportunity potential for a sales team. "
+    "Highlight company size, title seniority, industry, and any other relevant factors."
+)
+# Same task, worded for a request that covers several leads
+PACKED_INSTRUCTIONS = (
+    "You are a B2B sales intelligence assistant. "
+    "For each lead below, write a concise, intelligent summary (3–5 sentences) "
+    "of that lead's opportunity potential for a sales team. "
+    "Highlight company size, title seniority, industry, and any other relevant factors."
+)
 
 class InsightSummarizationAgent:
     """
     Provides methods to generate AI-powered insights for a lead.
     """
 
-    def __init__(self, openai_service: OpenAIService):
+    def __init__(self, openai_service: OpenAIService, model: str = "gpt-4", cache: Optional[LLMResponseCache] = None):
         """
         Initialize with an OpenAIService instance.
+
+        Args:
+            openai_service: Service used for completions.
+            model: Model name, passed to the service and part of the cache key.
+            cache: Response cache (default: the process-wide cache from app.services.llm_cache).
         """
         self.openai_service = openai_service
+        self.model = model
+        self.cache = cache if cache is not None else get_llm_cache()
+        # Reduction report of the most recent generate_insights batch (see prompt_batching.reduction_report)
+        self.last_batch_report: Optional[Dict] = None
 
     def generate_insight(self, lead_data: Dict) -> str:
         """
@@ -29,17 +61,90 @@ class InsightSummarizationAgent:
             lead_data (dict): The lead data, including enrichment fields.
 
         Returns:
-            str: A clean, readable summary string.
+            str: A clean, readable summary string ("" if the service returned no completion).
         """
         # Compose a prompt for GPT-4 based on the lead data
         prompt = self._build_prompt(lead_data)
 
-        # Call the OpenAI service layer to get the summary
-        # Assumes openai_service.ask_gpt(prompt: str) -> str
-        summary = self.openai_service.ask_gpt(prompt)
+        # Call the OpenAI service layer to get the summary, unless this prompt was answered before
+        summary = self.cache.get_or_generate(
+            prompt, self.model, lambda: self.openai_service.generate_completion(prompt, model=self.model)
+        )
+
+        # Ensure the summary is a clean, readable string; nothing is cached for an empty answer
+        return (summary or "").strip()
+
+    async def agenerate_insights(self, leads: Sequence[Dict], pack_size: int = 1) -> List[str]:
+        """
+        Generates summaries for many leads. Cached prompts are answered directly; of the rest,
+        identical prompts are sent once, optionally pack_size leads per request, through
+        OpenAIService.agenerate_completions, which bounds concurrency and applies the rate limits.
+        Leads whose packed answer cannot be parsed are retried on their own. The request and
+        token reduction is logged and kept in last_batch_report.
+
+        Args:
+            leads (list): Lead dicts, as for generate_insight.
+            pack_size (int): Leads per request (1 = one prompt per request).
+
+        Returns:
+            list: One summary per lead, in the same order.
+        """
+        prompts = [self._build_prompt(lead_data) for lead_data in leads]
+        summaries = [self.cache.get(prompt, self.model) for prompt in prompts]
+        missing = [position for position, summary in enumerate(summaries) if summary is None]
+        missed_prompts = [prompts[position] for position in missing]
+        unique, index = dedupe_prompts(missed_prompts)
+        # One representative lead per distinct prompt
+        unique_leads: List[Dict] = [{}] * len(unique)
+        for position, unique_position in zip(missing, index):
+            unique_leads[unique_position] = leads[position]
+
+        answers: Dict[int, str] = {}
+        sent: List[str] = []
+        fallback: List[int] = list(range(len(unique))) if pack_size <= 1 else []
+        if pack_size > 1 and unique:
+            groups = [list(range(first, min(first + pack_size, len(unique))))
+                      for first in range(0, len(unique), pack_size)]
+            packed = [pack_prompt(PACKED_INSTRUCTIONS, [self._lead_block(unique_leads[member]) for member in group])
+                      if len(group) > 1 else unique[group[0]] for group in groups]
+            completions = await self.openai_service.agenerate_completions(
+                packed, model=self.model, max_tokens=self.openai_service.max_tokens * pack_size
+            )
+            sent.extend(packed)
+            for group, completion in zip(groups, completions):
+                parsed = parse_packed_response(completion, len(group)) if len(group) > 1 else {0: completion}
+                for offset, member in enumerate(group):
+                    if parsed.get(offset):
+                        answers[member] = parsed[offset]
+                    else:
+                        fallback.append(member)
+        if fallback:
+            completions = await self.openai_service.agenerate_completions(
+                [unique[member] for member in fallback], model=self.model
+            )
+            sent.extend(unique[member] for member in fallback)
+            answers.update(zip(fallback, completions))
 
-        # Ensure the summary is a clean, readable string
-        return summary.strip()
+        for unique_position, prompt in enumerate(unique):
+            if answers.get(unique_position):
+                self.cache.put(prompt, self.model, answers[unique_position])
+        for position, unique_position in zip(missing, index):
+            summaries[position] = answers.get(unique_position) or ""
+
+        self.last_batch_report = reduction_report(
+            len(leads), len(leads) - len(missing), missed_prompts, sent, len(unique),
+            fallbacks=len(fallback) if pack_size > 1 else 0,
+        )
+        logger.info("Insight batch: %d leads, %d requests sent instead of %d, prompt tokens %d -> %d",
+                    len(leads), len(sent), len(missed_prompts),
+                    self.last_batch_report["prompt_tokens_naive"], self.last_batch_report["prompt_tokens_sent"])
+        return [summary.strip() for summary in summaries]
+
+    def generate_insights(self, leads: Sequence[Dict], pack_size: int = 1) -> List[str]:
+        """
+        Synchronous entry point for agenerate_insights (runs its own event loop).
+        """
+        return self.openai_service.run_sync(self.agenerate_insights(leads, pack_size))
 
     def _build_prompt(self, lead_data: Dict) -> str:
         """
@@ -51,6 +156,12 @@ class InsightSummarizationAgent:
         Returns:
             str: The prompt to send to GPT-4.
         """
+        return f"{INSTRUCTIONS}\n\nLead Data:\n{self._lead_block(lead_data)}"
+
+    def _lead_block(self, lead_data: Dict) -> str:
+        """
+        The lead data lines of a prompt (shared by single and packed prompts).
+        """
         # Extract relevant fields for the summary
         name = lead_data.get("name", "Unknown")
         company = lead_data.get("company", "Unknown Company")
@@ -60,12 +171,7 @@ class InsightSummarizationAgent:
         industry = lead_data.get("industry", "N/A")
         employee_size = lead_data.get("employee_size", "N/A")
 
-        prompt = (
-            f"You are a B2B sales intelligence assistant. "
-            f"Given the following lead data, write a concise, intelligent summary (3–5 sentences) "
-            f"of this lead's opportunity potential for a sales team. "
-            f"Highlight company size, title seniority, industry, and any other relevant factors.\n\n"
-            f"Lead Data:\n"
+        return (
             f"- Name: {name}\n"
             f"- Company: {company}\n"
             f"- Company Size: {company_size}\n"
@@ -74,10 +180,9 @@ class InsightSummarizationAgent:
             f"- Industry: {industry}\n"
             f"- Employee Size: {employee_size}\n"
         )
-        return prompt
 
 # Example usage (in FastAPI route):
-# from app.services.openai_service import OpenAIService
-# openai_service = OpenAIService(api_key="YOUR_KEY")
-# agent = InsightSummarizationAgent(openai_service)
+# from app.services.openai_service import get_openai_service
+# agent = InsightSummarizationAgent(get_openai_service())  # one pooled service per process
 # summary = agent.generate_insight(lead_data)
+# summaries = agent.generate_insights(leads, pack_size=5)  # or: await agent.agenerate_insights(leads) in an async route
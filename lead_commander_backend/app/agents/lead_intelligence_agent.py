@@ -4,17 +4,43 @@ lead_intelligence_agent.py
 Implements the LeadIntelligenceAgent class for lead scoring and enrichment.
 
 - score_lead: Scores a lead from 0 to 100 based on weighted fields.
+- score_lead_batch: Scores a DataFrame of leads with the same rules, column by column.
 - enrich_lead: Simulates enrichment by adding fields like industry and employee size.
+- enrich_lead_batch: The same enrichment for a DataFrame of leads, column by column.
+- resolve_industry: Industry for an email/company, memoized per organization in the enrichment cache.
+- industry_for / employee_size_for: The enrichment rules for a single text / company size.
 - _calculate_field_weight: Helper for field-specific scoring logic.
 """
 
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.column_ops import column, labels, numeric_values, rowwise
+from app.services.enrichment_cache import EnrichmentCache, get_enrichment_cache, organization_key, organization_keys
+from app.services.matchers import KeywordClassifier
+from app.services.scoring_service import ScoringPlan, get_scoring_plan
+
+# Industry keywords matched (case-sensitively) in the organization key, in priority order
+INDUSTRY_KEYWORDS = [("Finance", ["finance"]), ("Technology", ["tech", "software"]), ("Healthcare", ["health"])]
+INDUSTRIES = [industry for industry, _ in INDUSTRY_KEYWORDS] + ["General"]
+EMPLOYEE_SIZES = ["Enterprise", "Mid-Market", "SMB", "Small Business"]
 
 class LeadIntelligenceAgent:
     """
     Provides methods to score and enrich lead data for prioritization and analysis.
     """
 
+    def __init__(self, plan: Optional[ScoringPlan] = None, cache: Optional[EnrichmentCache] = None):
+        """
+        Initialize with a compiled scoring plan (defaults to app/rules/lead_intelligence.json)
+        and an enrichment cache (defaults to the process-wide cache).
+        """
+        self.plan = plan or get_scoring_plan("lead_intelligence")
+        self.cache = cache if cache is not None else get_enrichment_cache()
+        self.industry_classifier = KeywordClassifier([keywords for _, keywords in INDUSTRY_KEYWORDS])
+
     def score_lead(self, lead_data: Dict) -> int:
         """
         Scores a lead using a simple weighted model.
@@ -24,119 +50,109 @@ class LeadIntelligenceAgent:
             - email: Business domains score higher.
             - phone: Presence adds to score.
 
+        Weights and tiers come from the scoring plan; see _calculate_field_weight.
+
         Returns:
             int: Lead score between 0 and 100.
         """
-        score = 0
-        max_score = 100
-        weights = {
-            "company_size": 40,
-            "title": 30,
-            "email": 20,
-            "phone": 10
-        }
-
-        # Company size scoring
-        score += self._calculate_field_weight("company_size", lead_data.get("company_size", None)) * weights["company_size"]
+        return self.plan.score_record(lead_data)
 
-        # Title scoring
-        score += self._calculate_field_weight("title", lead_data.get("title", None)) * weights["title"]
-
-        # Email domain scoring
-        score += self._calculate_field_weight("email", lead_data.get("email", None)) * weights["email"]
-
-        # Phone presence scoring
-        score += self._calculate_field_weight("phone", lead_data.get("phone", None)) * weights["phone"]
+    def score_lead_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        Scores a DataFrame of leads (one row per lead) with the same plan, column by column.
 
-        # Normalize to 0-100
-        score = int(min(max_score, max(0, score // 100)))
-        return score
+        Returns:
+            pd.Series: Lead scores aligned with leads.index, matching score_lead row for row.
+        """
+        return self.plan.score_frame(leads).rename("score")
 
     def enrich_lead(self, lead_data: Dict) -> Dict:
         """
         Simulates enrichment of lead data.
         Adds:
-            - industry: Based on email domain.
+            - industry: Based on the email domain (or the company name when there is no email).
             - employee_size: Category based on company_size.
 
         Returns:
             dict: Enriched lead data.
         """
         enriched = lead_data.copy()
+        enriched["industry"] = self.resolve_industry(lead_data.get("email"), lead_data.get("company"))
+        enriched["employee_size"] = self.employee_size_for(lead_data.get("company_size", 0))
+        return enriched
+
+    def enrich_lead_batch(self, leads: pd.DataFrame) -> pd.DataFrame:
+        """
+        Enriches a DataFrame of leads with the rules of enrich_lead.
+
+        Each distinct organization is resolved once per batch (and looked up in the cache once).
 
-        # Simulate industry enrichment from email domain
-        email = lead_data.get("email", "")
-        if "finance" in email:
-            enriched["industry"] = "Finance"
-        elif "tech" in email or "software" in email:
-            enriched["industry"] = "Technology"
-        elif "health" in email:
-            enriched["industry"] = "Healthcare"
+        Returns:
+            pd.DataFrame: industry and employee_size columns aligned with leads.index, identical
+            to enrich_lead on leads.to_dict(orient="records").
+        """
+        keys = organization_keys(column(leads, "email", None), column(leads, "company", None))
+        codes, uniques = pd.factorize(keys)
+        industry = labels(codes, [self._industry_for_key(key) for key in uniques] + [INDUSTRIES[-1]])
+
+        size = column(leads, "company_size", 0)
+        values = numeric_values(size)
+        if values is None:
+            employee_size = rowwise(self.employee_size_for, size)
         else:
-            enriched["industry"] = "General"
+            codes = np.select([values >= 1000, values >= 250, values >= 50], [0, 1, 2], 3)
+            employee_size = labels(codes, EMPLOYEE_SIZES)
+
+        return pd.DataFrame({"industry": industry, "employee_size": employee_size}, index=leads.index, dtype=object)
+
+    def resolve_industry(self, email, company=None) -> str:
+        """
+        Industry for a lead's organization (email domain, else company name), computed once per
+        organization and kept in the enrichment cache. Leads with neither are "General".
+        """
+        key = organization_key(email, company)
+        return self._industry_for_key(key) if key is not None else INDUSTRIES[-1]
 
-        # Employee size category
-        size = lead_data.get("company_size", 0)
+    def _industry_for_key(self, key: str) -> str:
+        enrichment = self.cache.get_or_compute(key, lambda: {"industry": self.industry_for(key.split(":", 1)[1])})
+        return enrichment["industry"]
+
+    def industry_for(self, email) -> str:
+        """
+        Simulates industry enrichment from text (an email domain or company name).
+        """
+        if isinstance(email, str):
+            return INDUSTRIES[self.industry_classifier.classify(email)]
+        # Non-text values keep the semantics (and errors) of the `in` operator
+        for industry, keywords in INDUSTRY_KEYWORDS:
+            if any(keyword in email for keyword in keywords):
+                return industry
+        return INDUSTRIES[-1]
+
+    def employee_size_for(self, size) -> str:
+        """
+        Employee size category for a company_size value. A missing size (None, e.g. a NULL
+        column) counts as 0, like a lead without the field; NaN compares False, as before.
+        """
+        if size is None:
+            size = 0
         if size >= 1000:
-            enriched["employee_size"] = "Enterprise"
+            return EMPLOYEE_SIZES[0]
         elif size >= 250:
-            enriched["employee_size"] = "Mid-Market"
+            return EMPLOYEE_SIZES[1]
         elif size >= 50:
-            enriched["employee_size"] = "SMB"
+            return EMPLOYEE_SIZES[2]
         else:
-            enriched["employee_size"] = "Small Business"
-
-        return enriched
+            return EMPLOYEE_SIZES[3]
 
     def _calculate_field_weight(self, field_name: str, field_value) -> float:
         """
         Helper to assign a normalized weight (0.0-1.0) for a given field and value.
 
-        Scoring logic:
+        Scoring logic (defaults from app/rules/lead_intelligence.json):
             - company_size: 0 (none) to 1.0 (large)
             - title: 1.0 for C-level, 0.7 for Director/VP, 0.4 for Manager, 0.1 for others
-            - email: 1.0 for business domain, 0.3 for free email (gmail, yahoo, etc.)
+            - email: 1.0 for business domain, 0.3 for free email (gmail.com, yahoo.com, etc. or a subdomain)
             - phone: 1.0 if present, 0.0 if missing
         """
-        if field_name == "company_size":
-            try:
-                size = int(field_value)
-                if size >= 1000:
-                    return 1.0
-                elif size >= 250:
-                    return 0.7
-                elif size >= 50:
-                    return 0.4
-                elif size > 0:
-                    return 0.1
-            except (TypeError, ValueError):
-                return 0.0
-            return 0.0
-
-        elif field_name == "title":
-            if not field_value:
-                return 0.0
-            title = str(field_value).lower()
-            if any(senior in title for senior in ["chief", "ceo", "cfo", "coo", "cto", "cmo"]):
-                return 1.0
-            elif any(mid in title for mid in ["vp", "vice president", "director"]):
-                return 0.7
-            elif "manager" in title:
-                return 0.4
-            else:
-                return 0.1
-
-        elif field_name == "email":
-            if not field_value or "@" not in field_value:
-                return 0.0
-            domain = field_value.split("@")[-1].lower()
-            free_domains = ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com"]
-            if any(free in domain for free in free_domains):
-                return 0.3
-            else:
-                return 1.0
-
-        elif field_name == "phone":
-            return 1.0 if field_value else 0.0
-
-        return 0.0
+        return self.plan.field_factor(field_name, field_value)
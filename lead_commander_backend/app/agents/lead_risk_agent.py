@@ -2,6 +2,11 @@
 
 # TODO: Implement risk scoring for leads
 
+import numpy as np
+import pandas as pd
+
+from app.services.column_ops import column, numeric_values, rowwise, truthy
+
 class LeadRiskAgent:
     def __init__(self):
         pass
@@ -18,3 +23,16 @@ class LeadRiskAgent:
         if lead_data.get('score', 100) < 50:
             risk_score += 0.5
         return min(risk_score, 1.0)
+
+    def run_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        Risk scores for every row of a DataFrame, identical to run() on leads.to_dict(orient="records").
+        """
+        score = column(leads, 'score', 100)
+        values = numeric_values(score)
+        if values is None:
+            return pd.Series(rowwise(lambda email, s: self.run({'email': email, 'score': s}),
+                                     column(leads, 'email', None), score),
+                             index=leads.index, name='risk_score', dtype=float)
+        risk = np.where(truthy(column(leads, 'email', None)), 0.0, 0.5) + np.where(values < 50, 0.5, 0.0)
+        return pd.Series(np.minimum(risk, 1.0), index=leads.index, name='risk_score')
@@ -2,6 +2,11 @@
 
 # TODO: Implement lifetime value (LTV) scoring for leads
 
+import numpy as np
+import pandas as pd
+
+from app.services.column_ops import column, numeric_values, rowwise
+
 class LtvAgent:
     def __init__(self):
         pass
@@ -16,3 +21,34 @@ class LtvAgent:
         score_multiplier = lead_data.get('score', 50) / 100
         projected_ltv = base_value * company_size * score_multiplier
         return round(projected_ltv, 2)
+
+    def run_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        LTV for every row of a DataFrame, identical to run() on leads.to_dict(orient="records").
+        """
+        company_size = column(leads, 'company_size', 1)
+        score = column(leads, 'score', 50)
+        sizes = numeric_values(company_size)
+        scores = numeric_values(score)
+        if sizes is None or scores is None:
+            return pd.Series(rowwise(lambda size, s: self.run({'company_size': size, 'score': s}), company_size, score),
+                             index=leads.index, name='ltv', dtype=float)
+        if company_size.dtype.kind in "biu":
+            # Integer sizes: 1000 * size is exact, as with Python ints
+            base = (company_size.to_numpy(dtype=np.int64) * 1000).astype(float)
+        else:
+            base = 1000 * sizes
+        if score.dtype.kind in "biu":
+            multiplier = score.to_numpy(dtype=np.int64) / 100
+        else:
+            multiplier = scores / 100
+        projected = base * multiplier
+        # round(x, 2) returns the double nearest to k / 100 for the correctly rounded k; rint(x * 100)
+        # finds the same k unless x * 100 lands next to a .5 tie (or x is huge or not finite),
+        # so only those values go through Python's round()
+        scaled = projected * 100
+        rounded = np.rint(scaled) / 100
+        ambiguous = ~((np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) > 1e-4) & (np.abs(projected) < 1e9))
+        if ambiguous.any():
+            rounded[ambiguous] = [round(value, 2) for value in projected[ambiguous]]
+        return pd.Series(rounded, index=leads.index, name='ltv')
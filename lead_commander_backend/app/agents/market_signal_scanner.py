@@ -3,46 +3,57 @@ market_signal_scanner.py
 ------------------------
 Defines the MarketSignalScanner class for analyzing market signals in leads.
 
-- scan_lead: Adds a market_signal field to the lead dictionary based on keyword matches in simulated news headlines.
-- fetch_news_headlines: Returns a static list of example news headlines.
+- scan_lead: Adds a market_signal field to the lead dictionary based on keyword matches in news headlines.
+- detect_signal: Returns the first headline matching a signal keyword, or None.
+- detect_signal_for: Returns the first signal headline mentioning a company or industry, or None.
+- lead_signal: The signal headline for one lead (company, then industry, then any signal headline).
+- lead_signal_batch: lead_signal for every row of a DataFrame, one lookup per distinct organization.
+- headline_index: Returns the inverted index over the current headlines (rebuilt when they change).
+- fetch_news_headlines: Returns the cached headlines from the news feed.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.services.column_ops import column, labels
+from app.services.headline_index import HeadlineIndex
+from app.services.news_service import HeadlineFeed, get_headline_feed
+
+# market_signal value when no headline matches
+NO_SIGNAL = "No significant signals detected."
 
 class MarketSignalScanner:
     """
-    Scans a lead for market signals using keyword matching in simulated news headlines.
+    Scans a lead for market signals using keyword matching in news headlines.
     """
 
-    def __init__(self):
+    def __init__(self, feed: Optional[HeadlineFeed] = None):
+        """
+        Args:
+            feed: Headline feed to scan (default: the process-wide feed from app.services.news_service).
+        """
+        self.feed = feed if feed is not None else get_headline_feed()
         # Example keywords for signal detection
         self.keywords = [
             "AI", "M&A", "layoffs", "expansion", "partnership", "fundraising"
         ]
+        self._index: Optional[HeadlineIndex] = None
+        self._indexed_headlines: Optional[List[str]] = None
 
     def fetch_news_headlines(self) -> List[str]:
         """
-        Returns a static list of simulated news headlines.
-        In a real implementation, this would fetch from a news API.
-        """
-        return [
-            "Tech company raises $50 million in Series B funding.",
-            "Major layoffs expected in retail sector.",
-            "New AI breakthrough could disrupt healthcare industry.",
-            "Global expansion plans announced by leading software firm.",
-            "Strategic partnership formed between two fintech startups.",
-            "Healthcare company completes M&A deal.",
-            "Retailer launches new product line.",
-            "Startup secures major fundraising round.",
-            "No significant market changes reported this week.",
-            "Company invests in AI-driven analytics."
-        ]
+        Returns the current headlines from the feed. The feed caches them and refreshes in the
+        background, so this never waits on the news source once the first fetch is done.
+        """
+        return self.feed.get()
 
     def scan_lead(self, lead: Dict) -> Dict:
         """
         Scans news headlines for keywords and updates the lead with a market signal.
-        If a keyword is found in any headline, sets market_signal to the matched headline.
-        Otherwise, sets market_signal to 'No significant signals detected.'
+        If a signal headline mentions the lead's company (or else its industry), market_signal
+        is that headline; otherwise it is the first headline containing a keyword, and
+        'No significant signals detected.' if there is none.
 
         Args:
             lead (dict): The lead dictionary.
@@ -51,21 +62,66 @@ class MarketSignalScanner:
             dict: The updated lead dictionary.
         """
         lead = lead.copy()
-        headlines = self.fetch_news_headlines()
-        found_signal = False
-
-        # Check each headline for any keyword match
-        for headline in headlines:
-            for keyword in self.keywords:
-                if keyword.lower() in headline.lower():
-                    lead["market_signal"] = headline
-                    found_signal = True
-                    break
-            if found_signal:
-                break
-
-        if not found_signal:
-            lead["market_signal"] = "No significant signals detected."
+        signal = self.lead_signal(lead.get("company"), lead.get("industry"))
+        lead["market_signal"] = signal if signal is not None else NO_SIGNAL
 
         # The /scan_market_signals endpoint will add market_signal_detected field
         return lead
+
+    def detect_signal(self) -> Optional[str]:
+        """
+        Returns the first headline containing any keyword (case-insensitive), or None.
+        The result does not depend on the lead, so batch callers can scan once and reuse it.
+        """
+        return self.headline_index().first_signal()
+
+    def detect_signal_for(self, company: Optional[str] = None, industry: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the first signal headline that mentions the company by name, else the first one
+        that mentions the industry, or None. Each lookup reads only the postings of the name's
+        words, so it stays cheap as the headline corpus grows.
+        """
+        index = self.headline_index()
+        for name in (company, industry):
+            if isinstance(name, str):
+                headline = index.first_signal_mentioning(name)
+                if headline is not None:
+                    return headline
+        return None
+
+    def lead_signal(self, company: Optional[str] = None, industry: Optional[str] = None) -> Optional[str]:
+        """
+        The signal headline for a lead: detect_signal_for(company, industry) when a signal headline
+        mentions either, else detect_signal(). None only when no headline has a signal keyword.
+        """
+        signal = self.detect_signal_for(company, industry)
+        return signal if signal is not None else self.detect_signal()
+
+    def lead_signal_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        lead_signal for every row of a DataFrame (its "company" and "industry" columns), looked
+        up once per distinct (company, industry) pair.
+
+        Returns:
+            pd.Series: Signal headlines (None where there is none) aligned with leads.index,
+            identical to lead_signal on leads.to_dict(orient="records").
+        """
+        pairs = pd.DataFrame({"company": column(leads, "company", None), "industry": column(leads, "industry", None)})
+        codes = pairs.groupby(["company", "industry"], dropna=False, sort=False).ngroup().to_numpy()
+        signals = [self.lead_signal(company, industry)
+                   for company, industry in pairs.drop_duplicates().itertuples(index=False)]
+        return pd.Series(labels(codes, signals), index=leads.index, name="market_signal", dtype=object)
+
+    def headline_index(self) -> HeadlineIndex:
+        """
+        Returns the inverted index over the current headlines and keywords, building it only
+        when either has changed since the last call.
+        """
+        headlines = self.fetch_news_headlines()
+        index = self._index
+        # The feed returns the same list object until a refresh brings new headlines
+        if (index is None or index.keywords != self.keywords
+                or (headlines is not self._indexed_headlines and index.headlines != headlines)):
+            index = self._index = HeadlineIndex(headlines, self.keywords)
+        self._indexed_headlines = headlines
+        return index
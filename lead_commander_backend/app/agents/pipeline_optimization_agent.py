@@ -4,10 +4,24 @@ pipeline_optimization_agent.py
 Defines the PipelineOptimizationAgent class for recommending pipeline actions.
 
 - recommend_action: Enriches a lead with a recommended_action field based on win_probability and market_signal_detected.
+- recommend_action_batch: Computes recommended_action for a whole DataFrame of leads with vectorized selects.
+- action_for: Returns the recommended action for a win probability and market signal flag.
 """
 
 from typing import Dict
 
+import numpy as np
+import pandas as pd
+
+from app.services.column_ops import column, labels, numeric_values, rowwise, truthy
+
+ACTIONS = [
+    "Move to Contract Stage",
+    "Schedule Follow-Up Call",
+    "Send Discount Offer",
+    "Nurture — Low Priority",
+]
+
 class PipelineOptimizationAgent:
     """
     Provides simple rule-based recommendations for pipeline movement.
@@ -34,16 +48,41 @@ class PipelineOptimizationAgent:
             dict: The updated lead dictionary with recommended_action.
         """
         lead = lead.copy()
-        win_prob = lead.get("win_probability", 0)
-        signal = lead.get("market_signal_detected", False)
+        lead["recommended_action"] = self.action_for(
+            lead.get("win_probability", 0), lead.get("market_signal_detected", False)
+        )
+        return lead
+
+    def recommend_action_batch(self, leads: pd.DataFrame) -> pd.Series:
+        """
+        Applies the pipeline optimization rules to every row of a DataFrame.
+
+        Returns:
+            pd.Series: recommended_action aligned with leads.index, identical to recommend_action
+            on leads.to_dict(orient="records").
+        """
+        win_prob = column(leads, "win_probability", 0)
+        signal = column(leads, "market_signal_detected", False)
+        values = numeric_values(win_prob)
+        if values is None:
+            actions = rowwise(self.action_for, win_prob, signal)
+        else:
+            codes = np.select(
+                [values >= 80, (values >= 50) & (values < 80), truthy(signal) & (values < 50)], [0, 1, 2], 3
+            )
+            actions = labels(codes, ACTIONS)
+        return pd.Series(actions, index=leads.index, name="recommended_action", dtype=object)
 
+    def action_for(self, win_prob, signal) -> str:
+        """
+        Returns the recommended action for the given win_probability and market_signal_detected values
+        (the rules of recommend_action, without copying a lead).
+        """
         if win_prob >= 80:
-            lead["recommended_action"] = "Move to Contract Stage"
+            return ACTIONS[0]
         elif 50 <= win_prob < 80:
-            lead["recommended_action"] = "Schedule Follow-Up Call"
+            return ACTIONS[1]
         elif signal and win_prob < 50:
-            lead["recommended_action"] = "Send Discount Offer"
+            return ACTIONS[2]
         else:
-            lead["recommended_action"] = "Nurture — Low Priority"
-
-        return lead
+            return ACTIONS[3]
@@ -1,25 +1,276 @@
 # relationship_mapping_agent.py
+#
+# Maps relationships between leads that share an industry or a location.
+#
+# Leads are grouped into hash buckets per field, so building the map is O(n) and the edges
+# (a lead is connected to everyone in its industry bucket and its location bucket) are only
+# expanded when a caller asks for them. This module only depends on numpy, because the
+# Streamlit frontend imports it directly from this directory.
+#
+# - RelationshipMappingAgent.run: Returns {lead_id: {"connections": [...]}} as a plain dict.
+# - RelationshipMappingAgent.run_lazy: The same mapping, expanded per key on access.
+# - RelationshipMappingAgent.build_graph: Returns the bucketed RelationshipGraph for the leads.
+# - RelationshipGraph: Bucket memberships per field, with neighbors, degrees, neighbor sums and
+#   CSR expansion.
+# - RelationshipMap: Read-only mapping view of a graph in the original run() output format.
+
+from collections.abc import Mapping
+from itertools import combinations
+
+import numpy as np
+
+# Lead fields whose equal values connect two leads
+RELATIONSHIP_FIELDS = ("industry", "location")
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _matches_itself(value):
+    # Values that are not == to themselves (NaN) never connect, as with the pairwise == test
+    try:
+        return bool(value == value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _hash_codes(values):
+    """
+    Bucket code per value: values that compare == share a code (dict hashing gives the same
+    grouping as ==), and values that do not equal themselves get -1.
+    """
+    codes = np.empty(len(values), dtype=np.int64)
+    buckets = {}
+    for position, value in enumerate(values):
+        if not _matches_itself(value):
+            codes[position] = -1
+            continue
+        codes[position] = buckets.setdefault(value, len(buckets))
+    return codes, list(buckets)
+
+
+class _Buckets:
+    """
+    CSR-style bucket memberships: members[offsets[c]:offsets[c + 1]] are the (ascending) lead
+    positions with bucket code c.
+    """
+
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.values = values
+        self.sizes = np.bincount(codes[codes >= 0], minlength=len(values))
+        self.offsets = np.concatenate(([0], np.cumsum(self.sizes)))
+        order = np.argsort(codes, kind="stable")
+        self.members = order[np.count_nonzero(codes < 0):]
+
+    def of(self, position):
+        code = self.codes[position]
+        if code < 0:
+            return _EMPTY
+        return self.members[self.offsets[code]:self.offsets[code + 1]]
+
+    def size_of(self, positions):
+        codes = self.codes[positions]
+        return np.where(codes >= 0, self.sizes[np.maximum(codes, 0)] if len(self.sizes) else 0, 0)
+
+
+class RelationshipGraph:
+    """
+    Leads connected by shared field values, stored as bucket memberships rather than edges.
+
+    Lead i is connected to lead j when they have equal values (==) in any of the fields and
+    different ids; positions are indexes into the leads list. Memory is O(n) however dense
+    the graph is: edges are produced on demand by neighbors(), to_csr() and the
+    RelationshipMap view.
+    """
+
+    def __init__(self, leads_list, fields=RELATIONSHIP_FIELDS):
+        """
+        Args:
+            leads_list (list): Lead dicts; every lead needs an "id".
+            fields (tuple): Fields whose shared values connect two leads.
+        """
+        self.ids = [lead["id"] for lead in leads_list]
+        self.fields = tuple(fields)
+        self.buckets = {field: _Buckets(*_hash_codes([lead.get(field) for lead in leads_list])) for field in self.fields}
+        # Leads with the same id are never connected to each other (nor to themselves)
+        self._id_buckets = _Buckets(*_hash_codes(self.ids))
+        self._joint_cache = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def id_codes(self):
+        """
+        Per-lead id code: leads with equal ids share a code; ids that equal nothing get -1.
+        """
+        return self._id_buckets.codes
+
+    def neighbors(self, position):
+        """
+        Ascending positions of the leads connected to the lead at position.
+        """
+        candidates = [self.buckets[field].of(position) for field in self.fields]
+        connected = candidates[0] if len(candidates) == 1 else np.unique(np.concatenate(candidates))
+        same_id = self._id_buckets.of(position)
+        if len(same_id) == 1:
+            # Common case, a unique id: drop the lead itself
+            index = np.searchsorted(connected, position)
+            if index < len(connected) and connected[index] == position:
+                connected = np.delete(connected, index)
+        elif len(same_id):
+            connected = connected[~np.isin(connected, same_id)]
+        return connected
+
+    def connections(self, position):
+        """
+        Ids of the leads connected to the lead at position, in input order.
+        """
+        ids = self.ids
+        return [ids[other] for other in self.neighbors(position)]
+
+    def degrees(self):
+        """
+        Number of connections of every lead, computed from bucket sizes without expanding edges.
+        """
+        return np.rint(self.neighbor_sum(np.ones(len(self.ids)))).astype(np.int64)
+
+    def neighbor_sum(self, values):
+        """
+        For every lead, the sum of values (one per lead position) over its connections.
+
+        Computed from per-bucket sums by inclusion-exclusion over the fields (a lead's
+        connections are the union of its buckets), so it costs O(n) whatever the number of
+        edges. This is the building block for degrees and iterative graph analytics.
+        """
+        values = np.asarray(values, dtype=float)
+        total = np.zeros(len(self.ids))
+        matched = np.zeros(len(self.ids), dtype=bool)
+        for fields, sign, codes, count in self.bucket_combinations():
+            valid = codes >= 0
+            if len(fields) == 1:
+                matched |= valid
+            sums = np.bincount(codes[valid], weights=values[valid], minlength=count)
+            total[valid] += sign * sums[codes[valid]]
+        id_sizes = self._id_buckets.size_of(np.arange(len(self.ids)))
+        # A unique id only excludes the lead itself (when it is in any bucket)
+        own = (id_sizes == 1) & matched
+        total[own] -= values[own]
+        for position in np.flatnonzero(id_sizes > 1):
+            total[position] = values[self.neighbors(position)].sum()
+        return total
+
+    def edge_count(self):
+        """
+        Number of directed connections (each undirected pair counts twice, as in run()).
+        """
+        return int(self.degrees().sum())
+
+    def to_csr(self):
+        """
+        Expands the connections into CSR arrays (indptr, indices) over lead positions:
+        the neighbors of lead i are indices[indptr[i]:indptr[i + 1]].
+        """
+        degrees = self.degrees()
+        indptr = np.concatenate(([0], np.cumsum(degrees))).astype(np.int64)
+        indices = np.empty(indptr[-1], dtype=np.int64)
+        for position in range(len(self.ids)):
+            indices[indptr[position]:indptr[position + 1]] = self.neighbors(position)
+        return indptr, indices
+
+    def to_map(self):
+        """
+        The run() view of this graph: {lead_id: {"connections": [...]}}, expanded per key on access.
+        """
+        return RelationshipMap(self)
+
+    def bucket_combinations(self):
+        """
+        The inclusion-exclusion terms over the fields: (fields, sign, codes, count) for every
+        non-empty field combination, where codes groups the leads sharing all of those
+        fields' values. A lead's connections are the sum of its single-field buckets, minus
+        its two-field buckets, plus its three-field buckets, and so on.
+        """
+        return [
+            (fields, (-1) ** (size + 1)) + self._joint_codes(fields)
+            for size in range(1, len(self.fields) + 1)
+            for fields in combinations(self.fields, size)
+        ]
+
+    def _joint_codes(self, fields):
+        """
+        Bucket codes for leads sharing all of these fields' values (-1 if any value never
+        matches), and the number of such buckets. Cached per field combination.
+        """
+        cached = self._joint_cache.get(fields)
+        if cached is None:
+            if len(fields) == 1:
+                buckets = self.buckets[fields[0]]
+                cached = (buckets.codes, len(buckets.values))
+            else:
+                field_codes = [self.buckets[field].codes for field in fields]
+                valid = np.logical_and.reduce([code >= 0 for code in field_codes])
+                codes = np.full(len(self.ids), -1, dtype=np.int64)
+                count = 0
+                if valid.any():
+                    keys = np.stack([code[valid] for code in field_codes], axis=1)
+                    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+                    codes[valid], count = inverse.ravel(), len(unique)
+                cached = (codes, count)
+            self._joint_cache[fields] = cached
+        return cached
+
+
+class RelationshipMap(Mapping):
+    """
+    Read-only {lead_id: {"connections": [...]}} view of a RelationshipGraph, equal to the dict
+    the pairwise implementation built: keys in first-seen order, and a repeated id maps to its
+    last lead. Connection lists are built when a key is read, so iterating keys or counting
+    them never expands the whole graph. Use dict(view) or to_dict() for a plain dict.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._positions = {}
+        for position, lead_id in enumerate(graph.ids):
+            self._positions[lead_id] = position
+
+    def __getitem__(self, lead_id):
+        return {"connections": self.graph.connections(self._positions[lead_id])}
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def to_dict(self):
+        return {lead_id: self[lead_id] for lead_id in self}
 
-# TODO: Implement relationship mapping and graph data extraction for leads
 
 class RelationshipMappingAgent:
-    def __init__(self):
-        pass
+    def __init__(self, fields=RELATIONSHIP_FIELDS):
+        self.fields = tuple(fields)
+
+    def build_graph(self, leads_list):
+        """
+        Groups the leads into hash buckets by the relationship fields (O(n), no edges expanded).
+        """
+        return RelationshipGraph(leads_list, self.fields)
 
     def run(self, leads_list):
         """
-        Constructs a simple relationship map between leads based on shared industries or locations.
-        """
-        # TODO: Refine relationship mapping (e.g., graph algorithms, OpenAI, etc.)
-        relationships = {}
-        for i, lead in enumerate(leads_list):
-            lead_id = lead.get('id')
-            connections = []
-            for other_lead in leads_list:
-                if other_lead['id'] != lead_id and (
-                    lead.get('industry') == other_lead.get('industry') or
-                    lead.get('location') == other_lead.get('location')
-                ):
-                    connections.append(other_lead['id'])
-            relationships[lead_id] = {"connections": connections}
-        return relationships
+        Constructs a relationship map between leads based on shared industries or locations.
+
+        Returns the former pairwise result, {lead_id: {"connections": [ids]}}, as a plain
+        (JSON-serialisable) dict. Every connection list is expanded; use run_lazy() or
+        build_graph() when only some leads or aggregate counts are needed.
+        """
+        return self.run_lazy(leads_list).to_dict()
+
+    def run_lazy(self, leads_list):
+        """
+        The run() result as a read-only RelationshipMap whose connection lists are expanded
+        from the hash buckets when each key is read.
+        """
+        return self.build_graph(leads_list).to_map()
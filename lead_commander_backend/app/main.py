@@ -4,15 +4,28 @@ main.py
 Entry point for the FastAPI application. Initializes the app and includes API routers.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 # Import routers (to be implemented in the routes package)
 from app.routes import auth_routes, lead_routes, insight_routes
+from app.services.db_service import dispose_engines, pool_metrics
+from app.utils import format_response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled database connections on shutdown
+    await dispose_engines()
+
 
 app = FastAPI(
     title="Lead Commander Backend",
     description="Backend API for Lead Commander platform.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Include routers from the routes package
@@ -27,3 +40,11 @@ async def root():
     Health check endpoint.
     """
     return {"message": "Lead Commander Backend is running."}
+
+
+@app.get("/db/pool")
+async def db_pool():
+    """
+    Database connection pool utilization (size, checked out, overflow, peak) per engine.
+    """
+    return format_response(data=pool_metrics(), message="Database pool metrics.")
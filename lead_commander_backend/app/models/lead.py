@@ -2,9 +2,14 @@
 lead.py
 -------
 Defines the Lead model for database representation.
+
+Agent outputs (score, forecast, recommended action, market signal, risk) are materialized as
+columns by the recompute job in app/services/score_materializer.py, with composite indexes for
+the dashboard's common reads: top leads by score, leads of one action by score, and estimated
+revenue per action (pipeline stage).
 """
 
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String
 try:
     from sqlalchemy import JSON
     has_json = True
@@ -25,8 +30,32 @@ class Lead(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True)
+    company = Column(String, nullable=True)
     # Add more fields as needed
 
+    # Scoring inputs (the lead_intelligence rule set reads these)
+    title = Column(String, nullable=True)
+    phone = Column(String, nullable=True)
+    company_size = Column(Integer, nullable=True, comment="Number of employees")
+
+    # Scoring outputs the dashboard filters on. score and recommended_action are indexed by the
+    # composite indexes in __table_args__ (they lead them), the others on their own
+    score = Column(Float, nullable=True, comment="Lead score (0-100)")
+    win_probability = Column(Float, nullable=True, index=True, comment="Win probability in percent (0-100)")
+    estimated_revenue = Column(Float, nullable=True, comment="Forecast deal revenue in USD")
+    market_signal = Column(String, nullable=True,
+                           comment="Signal headline naming the lead's company or industry at scoring time "
+                                   "(else the general market signal)")
+    market_signal_detected = Column(Boolean, nullable=True, index=True,
+                                    comment="True if any headline carried a market signal at scoring time "
+                                            "(the same for every lead scored then)")
+    recommended_action = Column(String, nullable=True, comment="Next best action (pipeline stage) for the lead")
+
+    # Set by the recompute job: rows are refreshed only when either no longer matches
+    scoring_version = Column(String(64), nullable=True, comment="Scoring rules version the outputs were computed with")
+    scoring_inputs_hash = Column(String(32), nullable=True, comment="Digest of the scoring inputs at scoring time")
+    scored_at = Column(DateTime(timezone=True), nullable=True, comment="When the outputs were last computed")
+
     risk_score = Column(Float, nullable=True, comment="Represents the lead’s risk level (0.0 = no risk, 1.0 = max risk)")
     projected_ltv = Column(Float, nullable=True, comment="Predicted lifetime value of the lead in USD")
     relationship_map = Column(
@@ -35,6 +64,22 @@ class Lead(Base):
         comment="JSON structure: {\"connections\": [\"lead_id1\", ...]}"
     )
 
+    # Top by score (GET /leads/?sort=score) and a recommended action's leads by score walk these
+    # in order, no sort step; PostgreSQL also carries the dashboard columns in the top-score
+    # index (INCLUDE) so the first page is an index-only scan. SQLite cannot declare NULLS LAST
+    # in an index, but DESC already puts its NULLs last.
+    __table_args__ = (
+        Index("ix_leads_score_id", score.desc().nulls_last(), id,
+              postgresql_include=["name", "company", "win_probability", "estimated_revenue",
+                                  "recommended_action"]).ddl_if(dialect="postgresql"),
+        Index("ix_leads_score_id", score.desc(), id).ddl_if(dialect="sqlite"),
+        Index("ix_leads_action_score_id", recommended_action, score.desc().nulls_last(), id)
+        .ddl_if(dialect="postgresql"),
+        Index("ix_leads_action_score_id", recommended_action, score.desc(), id).ddl_if(dialect="sqlite"),
+        # Revenue by stage: SUM/COUNT per action read from the index alone
+        Index("ix_leads_action_revenue", recommended_action, estimated_revenue),
+    )
+
     def __repr__(self):
         return (
             f"<Lead(name={self.name}, email={self.email}, "
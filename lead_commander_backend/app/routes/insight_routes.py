@@ -2,12 +2,50 @@
 insight_routes.py
 -----------------
 Defines insight generation API routes.
+
+- POST /insights/relationships: Account clusters, communities and the most connected leads.
+- POST /insights/relationships/path: Shortest warm-intro path between two leads.
+- PUT /insights/relationships/leads: Add or update leads in the stored relationship graph.
+- POST /insights/relationships/leads/remove: Remove leads from the stored relationship graph.
+- GET /insights/relationships/leads/{lead_id}: Connections of one stored lead.
+- GET /insights/llm_cache: Hit-rate metrics of the LLM response cache.
 """
 
-from fastapi import APIRouter
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from app.agents.relationship_mapping_agent import RelationshipMappingAgent
+from app.services import graph_analytics
+from app.services.llm_cache import get_llm_cache
+from app.services.relationship_store import get_relationship_store
+from app.utils import format_response
 
 router = APIRouter()
 
+
+class RelationshipInsightsRequest(BaseModel):
+    leads: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Leads with id, industry and location (default: the stored relationship graph).")
+    top: int = Field(10, ge=1, le=1000, description="Number of clusters and leads to return.")
+
+
+class IntroPathRequest(BaseModel):
+    leads: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Leads with id, industry and location (default: the stored relationship graph).")
+    source_id: Any
+    target_id: Any
+
+
+class RelationshipLeadsRequest(BaseModel):
+    leads: List[Dict[str, Any]] = Field(..., description="Leads with id, industry and location.")
+
+
+class RemoveLeadsRequest(BaseModel):
+    ids: List[Any]
+
+
 @router.get("/")
 async def get_insights():
     """
@@ -15,3 +53,124 @@ async def get_insights():
     """
     # Implement logic to generate insights here
     return {"message": "Get insights endpoint"}
+
+
+def _check_ids(leads: List[Dict[str, Any]]):
+    if any("id" not in lead for lead in leads):
+        raise HTTPException(status_code=400, detail="Every lead needs an 'id'.")
+
+
+def _build_graph(leads: Optional[List[Dict[str, Any]]]):
+    if leads is None:
+        store = get_relationship_store()
+        with store.lock:
+            return store.to_graph()
+    _check_ids(leads)
+    return RelationshipMappingAgent().build_graph(leads)
+
+
+# Plain (non-async) handlers: FastAPI runs them in its thread pool, so the NumPy work does
+# not block the event loop.
+@router.post("/relationships")
+def relationship_insights(request: RelationshipInsightsRequest):
+    """
+    Account clusters (connected components), communities (label propagation), and the most
+    connected leads by degree centrality and PageRank.
+    """
+    graph = _build_graph(request.leads)
+    components = graph_analytics.connected_components(graph)
+    communities = graph_analytics.label_propagation(graph)
+    return format_response(
+        data={
+            "leads": len(graph),
+            "connections": graph.edge_count() // 2,
+            "component_count": int(components.max()) + 1 if len(graph) else 0,
+            "components": graph_analytics.group_summary(graph, components, request.top),
+            "community_count": int(communities.max()) + 1 if len(graph) else 0,
+            "communities": graph_analytics.group_summary(graph, communities, request.top),
+            "top_degree": graph_analytics.top_leads(graph, graph_analytics.degree_centrality(graph), request.top),
+            "top_pagerank": graph_analytics.top_leads(graph, graph_analytics.pagerank(graph), request.top),
+        },
+        message="Relationship insights generated.",
+    )
+
+
+@router.post("/relationships/path")
+def intro_path(request: IntroPathRequest):
+    """
+    Shortest chain of connected leads from source_id to target_id, with the fields each hop
+    shares (e.g. the same industry).
+    """
+    graph = _build_graph(request.leads)
+    # A repeated id refers to its last lead, as in RelationshipMappingAgent.run()
+    positions = {lead_id: position for position, lead_id in enumerate(graph.ids)}
+    missing = [lead_id for lead_id in (request.source_id, request.target_id) if lead_id not in positions]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown lead id(s): {missing}")
+    path = graph_analytics.shortest_path(graph, positions[request.source_id], positions[request.target_id])
+    if path is None:
+        return format_response(data={"path": None, "hops": []}, message="No intro path between these leads.",
+                               success=False)
+    hops = [
+        {"from": graph.ids[first], "to": graph.ids[second],
+         "shared": graph_analytics.shared_fields(graph, first, second)}
+        for first, second in zip(path, path[1:])
+    ]
+    return format_response(data={"path": [graph.ids[position] for position in path], "hops": hops},
+                           message=f"Intro path found ({len(hops)} hops).")
+
+
+@router.put("/relationships/leads")
+def upsert_relationship_leads(request: RelationshipLeadsRequest):
+    """
+    Adds leads to the stored relationship graph, or updates the industry and location of
+    leads already in it. Each lead only touches the buckets of its own values.
+    """
+    _check_ids(request.leads)
+    store = get_relationship_store()
+    with store.lock:
+        store.upsert_many(request.leads)
+        # Appends the changed leads to the store's journal, not a full snapshot
+        store.flush()
+        total = len(store)
+    return format_response(data={"updated": len(request.leads), "leads": total},
+                           message="Relationship graph updated.")
+
+
+@router.post("/relationships/leads/remove")
+def remove_relationship_leads(request: RemoveLeadsRequest):
+    """
+    Removes leads from the stored relationship graph; unknown ids are ignored.
+    """
+    store = get_relationship_store()
+    with store.lock:
+        removed = sum(store.remove(lead_id) for lead_id in request.ids)
+        store.flush()
+        total = len(store)
+    return format_response(data={"removed": removed, "leads": total}, message="Relationship graph updated.")
+
+
+@router.get("/relationships/leads/{lead_id}")
+def relationship_connections(lead_id: str):
+    """
+    Connections of one lead in the stored relationship graph, in the Lead.relationship_map
+    format, and its degree. Numeric path ids match leads stored with integer ids.
+    """
+    store = get_relationship_store()
+    with store.lock:
+        key = lead_id
+        if key not in store and lead_id.lstrip("-").isdigit():
+            key = int(lead_id)
+        if key not in store:
+            raise HTTPException(status_code=404, detail=f"Unknown lead id: {lead_id}")
+        entry = store.relationship_map(key)
+    return format_response(data=dict(entry, id=key, degree=len(entry["connections"])),
+                           message="Lead connections.")
+
+
+@router.get("/llm_cache")
+def llm_cache_stats():
+    """
+    Hit/miss counters and sizes of the LLM response cache used for insight summaries.
+    """
+    return format_response(data=get_llm_cache().stats(), message="LLM response cache metrics.")
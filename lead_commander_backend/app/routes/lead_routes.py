@@ -2,16 +2,96 @@
 lead_routes.py
 --------------
 Defines lead management API routes.
+
+- GET /leads/: One page of leads from the database, with server-side filters, fields= projection
+  and keyset (cursor) pagination.
+- GET /leads/revenue_by_action: Lead count and estimated revenue per recommended action.
+- POST /leads/bulk: Upserts a batch of scored leads (JSON list, Parquet or Arrow IPC body) keyed on email.
 """
 
-from fastapi import APIRouter
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.services.columnar_io import COLUMNAR_MIMETYPES, read_frame
+from app.services.db_service import get_async_db, get_db
+from app.services.lead_ingest import DEFAULT_CHUNK_SIZE, upsert_leads
+from app.services.lead_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, alist_leads, arevenue_by_action
+from app.utils import format_response
 
 router = APIRouter()
 
+
 @router.get("/")
-async def get_leads():
+async def get_leads(
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page."),
+    sort: str = Query("id", description="'id', or 'score' for highest score first."),
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    min_win_probability: Optional[float] = None,
+    max_win_probability: Optional[float] = None,
+    market_signal_detected: Optional[bool] = None,
+    recommended_action: Optional[List[str]] = Query(None, description="Repeat to match any of several actions."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Returns one page of leads matching the filters, with only the requested fields, and the
+    cursor for the next page (null on the last page).
+    """
+    try:
+        leads, next_cursor = await alist_leads(
+            db,
+            fields=[field.strip() for field in fields.split(",") if field.strip()] if fields else None,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            min_score=min_score,
+            max_score=max_score,
+            min_win_probability=min_win_probability,
+            max_win_probability=max_win_probability,
+            market_signal_detected=market_signal_detected,
+            recommended_actions=recommended_action,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return format_response(data={"leads": leads, "count": len(leads), "next_cursor": next_cursor},
+                           message=f"{len(leads)} leads.")
+
+
+@router.get("/revenue_by_action")
+async def get_revenue_by_action(db: AsyncSession = Depends(get_async_db)):
+    """
+    Returns the number of scored leads and their total estimated revenue for each
+    recommended action, from the columns stored by the score recompute job.
+    """
+    stages = await arevenue_by_action(db)
+    return format_response(data=stages, message=f"{len(stages)} actions.")
+
+
+@router.post("/bulk")
+async def bulk_upsert_leads(request: Request, chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=100_000),
+                            db: Session = Depends(get_db)):
     """
-    Skeleton endpoint to fetch leads.
+    Inserts or updates leads by email from a JSON list of lead objects, or a Parquet / Arrow
+    IPC body (by Content-Type) for large scored files. Each chunk is one transaction.
     """
-    # Implement logic to fetch leads here
-    return {"message": "Get leads endpoint"}
+    mimetype = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = await request.body()
+    try:
+        if mimetype in COLUMNAR_MIMETYPES:
+            rows = read_frame(body, mimetype)
+        else:
+            rows = json.loads(body or b"[]")
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise ValueError("Expected a JSON list of lead objects.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # The upsert prepares chunks in pandas and uses the sync engine: run it off the event loop
+    report = await run_in_threadpool(upsert_leads, db, rows, chunk_size)
+    return format_response(data=report, message=f"Upserted {report['upserted']} leads.")
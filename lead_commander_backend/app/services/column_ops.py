@@ -0,0 +1,75 @@
+"""
+column_ops.py
+-------------
+Column helpers for the agents' batch methods. Each batch method must give exactly the result
+of its per-lead method applied to leads.to_dict(orient="records"), so these helpers reproduce
+dict semantics over whole columns:
+
+- column: The column for a lead field, or the lead.get() default when the field is absent.
+- truthy: bool(value) for every element.
+- numeric_values: A float64 view of plain numeric/bool columns, or None when Python
+  comparison semantics cannot be reproduced (text, None, pd.NA); callers then fall back to rowwise.
+- rowwise: Applies a scalar rule across one or more columns, element by element.
+- labels: Maps integer choice codes (e.g. from np.select) to their string labels.
+"""
+
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+
+def column(leads: pd.DataFrame, field: str, default: Any) -> pd.Series:
+    """
+    Returns leads[field], or a column filled with `default` when the field is absent.
+    """
+    if field in leads.columns:
+        return leads[field]
+    return pd.Series([default] * len(leads), index=leads.index, dtype=object)
+
+
+def truthy(series: pd.Series) -> np.ndarray:
+    """
+    bool(value) for every element, evaluated once per distinct value.
+    Nulls keep Python semantics: None is falsy, NaN is truthy.
+    """
+    if is_bool_dtype(series):
+        return series.fillna(False).to_numpy(dtype=bool)
+    if is_numeric_dtype(series):
+        return (series != 0).to_numpy(dtype=bool)
+    try:
+        codes, uniques = pd.factorize(series)
+    except TypeError:
+        return np.fromiter((bool(value) for value in series), dtype=bool, count=len(series))
+    truthy_uniques = np.array([bool(value) for value in uniques] + [False], dtype=bool)
+    result = truthy_uniques[codes]
+    nulls = np.flatnonzero(codes < 0)
+    if len(nulls):
+        result[nulls] = [bool(value) for value in series.iloc[nulls]]
+    return result
+
+
+def numeric_values(series: pd.Series) -> Optional[np.ndarray]:
+    """
+    The column as float64 if it is a plain NumPy bool/int/float column (NaN compares False,
+    as in Python), otherwise None.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return series.to_numpy(dtype=float)
+    return None
+
+
+def rowwise(rule: Callable, *columns: pd.Series) -> List:
+    """
+    Applies a scalar rule to the values of one or more columns, row by row.
+    """
+    return [rule(*values) for values in zip(*columns)]
+
+
+def labels(codes: np.ndarray, choices: List[str]) -> np.ndarray:
+    """
+    Maps choice codes to an object array of labels.
+    """
+    return np.array(choices, dtype=object)[codes]
@@ -0,0 +1,129 @@
+"""
+columnar_io.py
+--------------
+Reads and writes lead batches as Parquet or Arrow IPC, so bulk data keeps its dtypes and
+skips text parsing between the dashboard, the data warehouse and the API.
+
+Requires pyarrow; every function raises ValueError with a clear message when it is not installed.
+
+- read_frame: Parses a Parquet or Arrow IPC payload into a DataFrame.
+- write_frame: Serializes a DataFrame as Parquet or Arrow IPC.
+- mimetype_for_filename: Maps an uploaded file name to its columnar media type, if any.
+"""
+
+import io
+import os
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+PARQUET_MIMETYPE = "application/vnd.apache.parquet"
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_MIMETYPE = "application/vnd.apache.arrow.file"
+
+# Accepted request media types (including common aliases) -> canonical media type
+COLUMNAR_MIMETYPES = {
+    PARQUET_MIMETYPE: PARQUET_MIMETYPE,
+    "application/x-parquet": PARQUET_MIMETYPE,
+    ARROW_STREAM_MIMETYPE: ARROW_STREAM_MIMETYPE,
+    ARROW_FILE_MIMETYPE: ARROW_FILE_MIMETYPE,
+}
+
+_EXTENSIONS = {
+    ".parquet": PARQUET_MIMETYPE,
+    ".arrows": ARROW_STREAM_MIMETYPE,
+    ".arrow": ARROW_FILE_MIMETYPE,
+    ".feather": ARROW_FILE_MIMETYPE,
+}
+
+# Arrow IPC file format magic bytes; the stream format has no header magic
+_ARROW_FILE_MAGIC = b"ARROW1"
+
+
+def columnar_available() -> bool:
+    """
+    True if pyarrow is installed.
+    """
+    return pa is not None
+
+
+def mimetype_for_filename(filename: Optional[str]) -> Optional[str]:
+    """
+    Returns the columnar media type implied by a file extension, or None (e.g. for CSV).
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    return _EXTENSIONS.get(extension)
+
+
+def read_frame(data: bytes, mimetype: str) -> pd.DataFrame:
+    """
+    Parses a Parquet or Arrow IPC (stream or file) payload.
+
+    Raises:
+        ValueError: If pyarrow is missing, the media type is unsupported or the payload is invalid.
+    """
+    _require_pyarrow()
+    mimetype = COLUMNAR_MIMETYPES.get(mimetype)
+    try:
+        if mimetype == PARQUET_MIMETYPE:
+            return pq.read_table(io.BytesIO(data)).to_pandas()
+        if mimetype in (ARROW_STREAM_MIMETYPE, ARROW_FILE_MIMETYPE):
+            # Accept either IPC flavour whatever the declared type, based on the file magic
+            if data[:len(_ARROW_FILE_MAGIC)] == _ARROW_FILE_MAGIC:
+                return pa.ipc.open_file(pa.BufferReader(data)).read_pandas()
+            return pa.ipc.open_stream(pa.BufferReader(data)).read_pandas()
+    except (pa.ArrowException, OSError) as e:
+        raise ValueError(f"Invalid columnar payload: {e}")
+    raise ValueError(f"Unsupported columnar media type: {mimetype}")
+
+
+def write_frame(df: pd.DataFrame, mimetype: str) -> bytes:
+    """
+    Serializes a DataFrame (without its index) as Parquet or Arrow IPC.
+
+    Raises:
+        ValueError: If pyarrow is missing or the media type is unsupported.
+    """
+    _require_pyarrow()
+    mimetype = COLUMNAR_MIMETYPES.get(mimetype)
+    table = _to_arrow_table(df)
+    sink = io.BytesIO()
+    if mimetype == PARQUET_MIMETYPE:
+        pq.write_table(table, sink)
+    elif mimetype == ARROW_STREAM_MIMETYPE:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif mimetype == ARROW_FILE_MIMETYPE:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported columnar media type: {mimetype}")
+    return sink.getvalue()
+
+
+def _to_arrow_table(df: pd.DataFrame) -> "pa.Table":
+    """
+    Converts a DataFrame to an Arrow table. Object columns that mix value types (e.g. numbers
+    and "n/a" from a dirty CSV) have no Arrow type, so their non-null values are written as text.
+    """
+    mixed = [
+        column for column in df.columns
+        if df[column].dtype == object and pd.api.types.infer_dtype(df[column], skipna=True).startswith("mixed")
+    ]
+    if mixed:
+        df = df.copy()
+        for column in mixed:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ValueError("Parquet/Arrow support requires the pyarrow package.")
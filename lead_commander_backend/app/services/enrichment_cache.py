@@ -0,0 +1,255 @@
+"""
+enrichment_cache.py
+-------------------
+Memoizes lead enrichment per organization, so leads from the same domain or company are
+resolved once per batch and once per process lifetime.
+
+Entries are keyed by a normalized organization key ("domain:acme.com" or "company:acme"),
+bounded by an LRU policy with an optional time-to-live, and can be persisted to a JSON file
+so they survive restarts.
+
+Configuration (environment variables):
+    ENRICHMENT_CACHE_SIZE   maximum entries (default 100000)
+    ENRICHMENT_CACHE_TTL    seconds before an entry expires (default 86400; 0 = never)
+    ENRICHMENT_CACHE_PATH   JSON file to load at start-up and save at exit (default: memory only)
+
+- EnrichmentCache: Thread-safe LRU/TTL cache with hit/miss counters and optional persistence.
+- get_enrichment_cache: The process-wide cache configured from the environment.
+- organization_key: Normalized cache key for an email address and/or company name.
+- organization_keys: organization_key for whole email/company columns.
+- normalize_domain / normalize_company: Key normalization helpers.
+"""
+
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import get_env_variable
+
+# Legal-form suffixes dropped from company names ("Acme, Inc." -> "acme")
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc", "ag", "sa"}
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+class EnrichmentCache:
+    """
+    A bounded mapping from organization key to enrichment result.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: Optional[float] = None, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Least recently used entries are evicted beyond this size.
+            ttl_seconds: Entries older than this are recomputed (None or 0 = no expiry).
+            path: Optional JSON file for load()/save().
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (stored_at wall-clock seconds, value); insertion order is recency order
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the cached value (refreshing its recency), or default if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """
+        Stores a value, evicting the least recently used entries beyond max_entries.
+        stored_at (wall-clock seconds, default now) is the time its TTL counts from.
+        """
+        with self._lock:
+            self._entries[key] = (time.time() if stored_at is None else stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for key, computing and storing it on a miss.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for monitoring: hits, misses, hit_rate, evictions, expirations and size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+        }
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Loads unexpired entries from a JSON file written by save(). A missing or unreadable
+        file leaves the cache empty. Returns the number of entries loaded.
+        """
+        path = path or self.path
+        if not path or not os.path.isfile(path):
+            return 0
+        try:
+            with open(path, encoding="utf-8") as handle:
+                stored = json.load(handle)
+        except (OSError, ValueError):
+            return 0
+        loaded = 0
+        with self._lock:
+            # Oldest first, so the most recently used entries are kept if the file exceeds max_entries
+            for key, stored_at, value in sorted(stored.get("entries", []), key=lambda entry: entry[1]):
+                entry = (stored_at, value)
+                if self._expired(entry):
+                    continue
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return loaded
+
+    def save(self, path: Optional[str] = None):
+        """
+        Writes all unexpired entries to a JSON file (atomically, via a temporary file).
+        """
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            entries = [[key, stored_at, value] for key, (stored_at, value) in self._entries.items()
+                       if not self._expired((stored_at, value))]
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"version": 1, "entries": entries}, handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _expired(self, entry: tuple) -> bool:
+        return self.ttl_seconds is not None and time.time() - entry[0] > self.ttl_seconds
+
+
+@lru_cache(maxsize=None)
+def get_enrichment_cache() -> EnrichmentCache:
+    """
+    Returns the process-wide enrichment cache, loading ENRICHMENT_CACHE_PATH if set
+    (and saving it back when the process exits).
+    """
+    cache = EnrichmentCache(
+        max_entries=int(get_env_variable("ENRICHMENT_CACHE_SIZE", 100_000)),
+        ttl_seconds=float(get_env_variable("ENRICHMENT_CACHE_TTL", 86_400)),
+        path=get_env_variable("ENRICHMENT_CACHE_PATH"),
+    )
+    if cache.path:
+        cache.load()
+        atexit.register(cache.save)
+    return cache
+
+
+def normalize_domain(email: Any) -> Optional[str]:
+    """
+    Lower-cased text after the last "@" of an email address (the whole value if there is
+    no "@"), or None for empty and non-text values.
+    """
+    if not isinstance(email, str):
+        return None
+    domain = email.rsplit("@", 1)[-1].strip().lower()
+    return domain or None
+
+
+def normalize_company(company: Any) -> Optional[str]:
+    """
+    Case-folded company name with punctuation and legal-form suffixes removed
+    ("Acme Software, Inc." -> "acme software"), or None for empty and non-text values.
+    """
+    if not isinstance(company, str):
+        return None
+    words = _NON_ALNUM.sub(" ", company.casefold()).split()
+    while words and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def organization_key(email: Any = None, company: Any = None) -> Optional[str]:
+    """
+    Cache key for a lead's organization: its email domain, else its company name, else None.
+    """
+    domain = normalize_domain(email)
+    if domain is not None:
+        return f"domain:{domain}"
+    company = normalize_company(company)
+    if company is not None:
+        return f"company:{company}"
+    return None
+
+
+def organization_keys(emails: pd.Series, companies: pd.Series) -> pd.Series:
+    """
+    organization_key for every row of an email column and a company column (same index).
+    The domain is cut out of every email in one vectorized pass; normalization then runs once
+    per distinct domain and company name.
+    """
+    keys = np.full(len(emails), None, dtype=object)
+    is_text = np.fromiter((isinstance(email, str) for email in emails), dtype=bool, count=len(emails))
+    if is_text.any():
+        # Text after the last "@", like email.rsplit("@", 1)[-1]
+        raw = emails[is_text].astype(str).str.replace(r"(?s)^.*@", "", regex=True)
+        codes, uniques = pd.factorize(raw)
+        domain_keys = np.array([organization_key(domain) for domain in uniques] + [None], dtype=object)
+        keys[is_text] = domain_keys[codes]
+    unresolved = np.flatnonzero(pd.isna(keys))
+    if len(unresolved):
+        codes, uniques = pd.factorize(companies.iloc[unresolved])
+        company_keys = np.array([organization_key(company=company) for company in uniques] + [None], dtype=object)
+        keys[unresolved] = company_keys[codes]
+    return pd.Series(keys, index=emails.index, dtype=object)
@@ -0,0 +1,95 @@
+"""
+headline_index.py
+-----------------
+Inverted index over a headline corpus for market signal detection.
+
+The index is built once per headline refresh. Scanning a lead then becomes a lookup instead of
+a loop over every headline and keyword:
+
+- signal keyword -> ids of the headlines containing it (case-insensitive substring, as before)
+- word token -> ids of the headlines containing that word, used to find headlines that mention a
+  company or industry by name
+
+- HeadlineIndex: Keyword and token postings for a list of headlines.
+- tokenize: Lower-cased alphanumeric word tokens of a text.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased alphanumeric words of text ("M&A deal" -> ["m", "a", "deal"]).
+    """
+    return _TOKEN.findall(text.lower())
+
+
+class HeadlineIndex:
+    """
+    Keyword and token postings for a fixed list of headlines. Headline ids are list positions,
+    so "first matching headline" keeps the order of the source feed.
+    """
+
+    def __init__(self, headlines: Iterable[str], keywords: Iterable[str]):
+        """
+        Args:
+            headlines: The headline corpus, in feed order.
+            keywords: Signal keywords, matched case-insensitively anywhere in a headline.
+        """
+        self.headlines = list(headlines)
+        self.keywords = list(keywords)
+        lowered = [headline.lower() for headline in self.headlines]
+
+        # keyword -> sorted headline ids (substring match, one pass per keyword at build time)
+        self.keyword_postings: Dict[str, List[int]] = {}
+        for keyword in self.keywords:
+            needle = keyword.lower()
+            self.keyword_postings[keyword] = [i for i, text in enumerate(lowered) if needle in text]
+        self._signal_set = {i for ids in self.keyword_postings.values() for i in ids}
+        self.signal_ids: List[int] = sorted(self._signal_set)
+
+        # token -> sorted headline ids; " token token " strings for phrase checks
+        self.token_postings: Dict[str, List[int]] = {}
+        self._token_text: List[str] = []
+        for i, text in enumerate(lowered):
+            tokens = _TOKEN.findall(text)
+            self._token_text.append(" " + " ".join(tokens) + " ")
+            for token in dict.fromkeys(tokens):
+                self.token_postings.setdefault(token, []).append(i)
+
+    def __len__(self):
+        return len(self.headlines)
+
+    def first_signal(self) -> Optional[str]:
+        """
+        The first headline containing any signal keyword, or None.
+        """
+        return self.headlines[self.signal_ids[0]] if self.signal_ids else None
+
+    def mentions(self, name: str) -> List[int]:
+        """
+        Ids of the headlines mentioning name as a whole-word phrase ("Acme Health" matches
+        "acme health expands" but not "acmehealth"). Candidates come from the rarest token's
+        postings, so the cost depends on that token's frequency, not on the corpus size.
+        """
+        tokens = tokenize(name) if isinstance(name, str) else []
+        if not tokens:
+            return []
+        postings = [self.token_postings.get(token) for token in tokens]
+        if not all(postings):
+            return []
+        candidates = min(postings, key=len)
+        phrase = " " + " ".join(tokens) + " "
+        return [i for i in candidates if phrase in self._token_text[i]]
+
+    def first_signal_mentioning(self, name: str) -> Optional[str]:
+        """
+        The first headline that mentions name and contains a signal keyword, or None.
+        """
+        for i in self.mentions(name):
+            if i in self._signal_set:
+                return self.headlines[i]
+        return None
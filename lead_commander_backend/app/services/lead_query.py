@@ -0,0 +1,175 @@
+"""
+lead_query.py
+-------------
+Paged, filtered reads of the leads table for the /leads API.
+
+Pages use keyset (cursor) pagination: each page ends with an opaque cursor holding the sort key
+of its last row, and the next page starts strictly after it. Unlike OFFSET, this costs the same
+for page 1 and page 10,000 and never skips or repeats rows when leads are inserted meanwhile.
+
+- LEAD_FIELDS: Columns that can be requested with fields= projection.
+- SORTS: Supported orderings ("id", and "score" = highest score first).
+- list_leads / alist_leads: One page of leads matching the filters, plus the cursor of the next
+  page (sync Session or AsyncSession).
+- revenue_by_action / arevenue_by_action: Lead count and estimated revenue per recommended action.
+- encode_cursor / decode_cursor: Opaque page cursors.
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.lead import Lead
+
+LEAD_FIELDS = tuple(column.name for column in Lead.__table__.columns)
+SORTS = ("id", "score")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(sort: str, row: Dict[str, Any]) -> str:
+    """
+    Cursor for the page after row: its sort key, base64url-encoded JSON.
+    """
+    key = [row["id"]] if sort == "id" else [row[sort], row["id"]]
+    return base64.urlsafe_b64encode(json.dumps([sort] + key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """
+    Sort key stored in a cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort order.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if not isinstance(key, list) or not key or key[0] != sort or len(key) != (2 if sort == "id" else 3):
+        raise ValueError("Cursor does not match the requested sort order.")
+    return key[1:]
+
+
+def _after(sort: str, key: List[Any]):
+    # Rows strictly after key in the page order
+    if sort == "id":
+        return Lead.id > key[0]
+    value, lead_id = key
+    column = getattr(Lead, sort)
+    if value is None:
+        # Already among the trailing NULLs, which are ordered by id
+        return and_(column.is_(None), Lead.id > lead_id)
+    return or_(column < value, and_(column == value, Lead.id > lead_id), column.is_(None))
+
+
+def _order_by(sort: str):
+    if sort == "id":
+        return [Lead.id.asc()]
+    return [getattr(Lead, sort).desc().nulls_last(), Lead.id.asc()]
+
+
+def leads_page_query(fields: Optional[Sequence[str]] = None, limit: int = DEFAULT_PAGE_SIZE,
+                     cursor: Optional[str] = None, sort: str = "id", min_score: Optional[float] = None,
+                     max_score: Optional[float] = None, min_win_probability: Optional[float] = None,
+                     max_win_probability: Optional[float] = None, market_signal_detected: Optional[bool] = None,
+                     recommended_actions: Optional[Sequence[str]] = None) -> Tuple[Select, List[str], str, int]:
+    """
+    Builds the SELECT for one page: (statement, fields, sort, limit). The statement fetches
+    limit + 1 rows; pass its rows to page_result.
+
+    Raises:
+        ValueError: For unknown fields or sort orders, or an invalid cursor.
+    """
+    fields = list(fields) if fields else list(LEAD_FIELDS)
+    unknown = [field for field in fields if field not in LEAD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {unknown}")
+    if sort not in SORTS:
+        raise ValueError(f"Unknown sort {sort!r}; expected one of {list(SORTS)}.")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Select only the requested columns, plus the ones the cursor needs
+    selected = list(dict.fromkeys(fields + (["id"] if sort == "id" else [sort, "id"])))
+    query = select(*(getattr(Lead, field) for field in selected))
+    conditions = []
+    if min_score is not None:
+        conditions.append(Lead.score >= min_score)
+    if max_score is not None:
+        conditions.append(Lead.score <= max_score)
+    if min_win_probability is not None:
+        conditions.append(Lead.win_probability >= min_win_probability)
+    if max_win_probability is not None:
+        conditions.append(Lead.win_probability <= max_win_probability)
+    if market_signal_detected is not None:
+        conditions.append(Lead.market_signal_detected == market_signal_detected)
+    if recommended_actions:
+        conditions.append(Lead.recommended_action.in_(list(recommended_actions)))
+    if cursor:
+        conditions.append(_after(sort, decode_cursor(cursor, sort)))
+    if conditions:
+        query = query.where(*conditions)
+    # One extra row tells whether another page follows
+    return query.order_by(*_order_by(sort)).limit(limit + 1), fields, sort, limit
+
+
+def page_result(rows: Sequence[Dict[str, Any]], fields: List[str], sort: str,
+                limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    (leads, next_cursor) from the rows of a leads_page_query statement.
+    """
+    next_cursor = encode_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+    return [{field: row[field] for field in fields} for row in rows[:limit]], next_cursor
+
+
+def list_leads(db: Session, **filters) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns (leads, next_cursor): up to limit leads matching every given filter, in sort order,
+    with only the requested fields; next_cursor is None on the last page. Takes the keyword
+    arguments of leads_page_query.
+
+    Raises:
+        ValueError: For unknown fields or sort orders, or an invalid cursor.
+    """
+    query, fields, sort, limit = leads_page_query(**filters)
+    return page_result(db.execute(query).mappings().all(), fields, sort, limit)
+
+
+async def alist_leads(db: AsyncSession, **filters) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    list_leads for an AsyncSession (async routes).
+    """
+    query, fields, sort, limit = leads_page_query(**filters)
+    result = await db.execute(query)
+    return page_result(result.mappings().all(), fields, sort, limit)
+
+
+def revenue_by_action_query() -> Select:
+    """
+    Lead count and total estimated revenue per recommended action (pipeline stage), for
+    scored leads. Reads only the (recommended_action, estimated_revenue) index.
+    """
+    return (select(Lead.recommended_action, func.count().label("leads"),
+                   func.coalesce(func.sum(Lead.estimated_revenue), 0).label("estimated_revenue"))
+            .where(Lead.recommended_action.is_not(None))
+            .group_by(Lead.recommended_action)
+            .order_by(Lead.recommended_action))
+
+
+def revenue_by_action(db: Session) -> List[Dict[str, Any]]:
+    """
+    Returns [{"recommended_action", "leads", "estimated_revenue"}, ...], one row per action.
+    """
+    return [dict(row) for row in db.execute(revenue_by_action_query()).mappings().all()]
+
+
+async def arevenue_by_action(db: AsyncSession) -> List[Dict[str, Any]]:
+    """
+    revenue_by_action for an AsyncSession (async routes).
+    """
+    result = await db.execute(revenue_by_action_query())
+    return [dict(row) for row in result.mappings().all()]
@@ -0,0 +1,193 @@
+"""
+llm_cache.py
+------------
+Response cache for LLM completions, keyed by a content hash of the normalized prompt and model.
+
+Lookups go to an in-memory LRU first and then to a local SQLite store, so unchanged prompts
+are answered without an API call within a process and across restarts.
+
+Configuration (environment variables):
+    LLM_CACHE_SIZE   in-memory entries (default 10000)
+    LLM_CACHE_TTL    seconds before a response is regenerated (default 604800 = 7 days; 0 = never)
+    LLM_CACHE_PATH   SQLite file (default ~/.cache/lead_commander/llm_responses.sqlite3;
+                     set it to an empty value to keep responses in memory only)
+
+- LLMResponseCache: Memory LRU in front of SQLite, with TTL and hit-rate metrics.
+- get_llm_cache: The process-wide cache configured from the environment.
+- prompt_key: Content hash of a normalized prompt and model.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from app.config import get_env_variable
+from app.services.enrichment_cache import EnrichmentCache
+
+DEFAULT_LLM_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "lead_commander", "llm_responses.sqlite3")
+
+_WHITESPACE = re.compile(r"[ \t]+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Canonical form of a prompt for cache keys: Unicode NFC, trailing spaces and runs of
+    spaces/tabs collapsed, and surrounding blank lines removed. Line structure is kept.
+    """
+    text = unicodedata.normalize("NFC", prompt)
+    lines = [_WHITESPACE.sub(" ", line).strip() for line in text.splitlines()]
+    return "\n".join(lines).strip()
+
+
+def prompt_key(prompt: str, model: str) -> str:
+    """
+    SHA-256 hex digest of the model and normalized prompt.
+    """
+    payload = f"{model}\x00{normalize_prompt(prompt)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier response cache: an in-memory LRU (EnrichmentCache) in front of an optional
+    SQLite table. Both tiers honour the same TTL. Safe to share across threads.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: Optional[float] = None, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Responses kept in memory (least recently used are evicted).
+            ttl_seconds: Responses older than this are regenerated (None or 0 = never expire).
+            path: SQLite file for the persistent tier (None = memory only).
+        """
+        self.ttl_seconds = ttl_seconds or None
+        self.memory = EnrichmentCache(max_entries=max_entries, ttl_seconds=self.ttl_seconds)
+        self.path = path
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, prompt: str, model: str) -> Optional[str]:
+        """
+        Returns the cached response for prompt and model, or None.
+        """
+        key = prompt_key(prompt, model)
+        response = self.memory.get(key)
+        if response is not None:
+            return response
+        if self._db is not None:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None and not self._expired(row[1]):
+                self.disk_hits += 1
+                self.memory.put(key, row[0], stored_at=row[1])
+                return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, prompt: str, model: str, response: str):
+        """
+        Stores a response in both tiers.
+        """
+        key = prompt_key(prompt, model)
+        self.memory.put(key, response)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, model, response, created_at) VALUES (?, ?, ?, ?)",
+                    (key, model, response, time.time()),
+                )
+                self._db.commit()
+
+    def get_or_generate(self, prompt: str, model: str, generate: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Returns the cached response, or calls generate() and caches a non-empty result
+        (generate() may return None or "", which is returned as is and not cached).
+        """
+        response = self.get(prompt, model)
+        if response is None:
+            response = generate()
+            if response:
+                self.put(prompt, model, response)
+        return response
+
+    def purge_expired(self) -> int:
+        """
+        Deletes expired rows from the SQLite tier. Returns the number deleted.
+        """
+        if self._db is None or self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM llm_responses WHERE created_at < ?",
+                                      (time.time() - self.ttl_seconds,))
+            self._db.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        self.memory.clear()
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM llm_responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit-rate metrics: memory_hits, disk_hits, misses, hit_rate, evictions, expirations,
+        memory_size and disk_size.
+        """
+        memory = self.memory.stats()
+        hits = memory["hits"] + self.disk_hits
+        lookups = hits + self.misses
+        disk_size = 0
+        if self._db is not None:
+            with self._lock:
+                disk_size = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        return {
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": memory["evictions"],
+            "expirations": memory["expirations"],
+            "memory_size": memory["size"],
+            "disk_size": disk_size,
+        }
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+
+@lru_cache(maxsize=None)
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Returns the process-wide LLM response cache configured from the environment.
+    """
+    return LLMResponseCache(
+        max_entries=int(get_env_variable("LLM_CACHE_SIZE", 10_000)),
+        ttl_seconds=float(get_env_variable("LLM_CACHE_TTL", 7 * 86_400)),
+        path=get_env_variable("LLM_CACHE_PATH", DEFAULT_LLM_CACHE_PATH) or None,
+    )
@@ -0,0 +1,187 @@
+"""
+news_service.py
+---------------
+Headline sources for market signal scanning, behind an in-process cache.
+
+A HeadlineProvider fetches the current headlines (possibly with network or disk I/O). A
+HeadlineFeed caches the last result and refreshes it on a TTL in a background thread, serving
+the stale headlines while the refresh runs, so callers only ever block on the very first fetch.
+
+Configuration (environment variables):
+    NEWS_HEADLINES_PATH     JSON or text file of headlines (default: app/fixtures/news_headlines.json)
+    NEWS_REFRESH_SECONDS    seconds before the cached headlines are refreshed (default 300)
+
+- HeadlineProvider: Interface for headline sources.
+- StaticHeadlineProvider: Serves a fixed list of headlines.
+- FileHeadlineProvider: Reads headlines from a local JSON or text file.
+- HeadlineFeed: TTL cache with stale-while-revalidate background refresh.
+- get_headline_feed: The process-wide feed configured from the environment.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional
+
+from app.config import get_env_variable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADLINES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "news_headlines.json"
+)
+
+
+class HeadlineProvider(ABC):
+    """
+    A source of news headlines. Subclasses implement fetch().
+    """
+
+    @abstractmethod
+    def fetch(self) -> List[str]:
+        """
+        Returns the current headlines, newest first.
+        """
+
+
+class StaticHeadlineProvider(HeadlineProvider):
+    """
+    Serves a fixed list of headlines (tests and offline demos).
+    """
+
+    def __init__(self, headlines: Iterable[str]):
+        self.headlines = list(headlines)
+
+    def fetch(self) -> List[str]:
+        return list(self.headlines)
+
+
+class FileHeadlineProvider(HeadlineProvider):
+    """
+    Reads headlines from a local file: a JSON list of strings or of objects with a "title"
+    field, or a text file with one headline per line. The file is re-read on every fetch,
+    so editing it takes effect at the next refresh.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> List[str]:
+        with open(self.path, encoding="utf-8") as handle:
+            if not self.path.endswith(".json"):
+                return [line.strip() for line in handle if line.strip()]
+            items = json.load(handle)
+        if not isinstance(items, list):
+            raise ValueError(f"{self.path}: expected a JSON list of headlines.")
+        return [item["title"] if isinstance(item, dict) else str(item) for item in items]
+
+
+class HeadlineFeed:
+    """
+    Caches a provider's headlines for ttl_seconds.
+
+    get() returns the cached headlines. Once they are older than the TTL, the first get()
+    starts a background refresh and every get() keeps returning the stale list until the new
+    one is in place. A failed refresh is logged and the stale headlines are kept. Only the
+    initial fetch (or prime()) runs in the caller's thread.
+
+    The returned list object changes only when a refresh completes, and version is
+    incremented each time, so consumers can rebuild derived indexes cheaply.
+    """
+
+    def __init__(self, provider: HeadlineProvider, ttl_seconds: float = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            provider: The headline source.
+            ttl_seconds: Age after which the headlines are refreshed in the background.
+            clock: Time source (monotonic seconds), replaceable in tests.
+        """
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.version = 0
+        self.last_error: Optional[Exception] = None
+        self._headlines: Optional[List[str]] = None
+        self._fetched_at = 0.0
+        # _lock serializes fetches; _thread_lock only guards starting the refresh thread,
+        # so get() never waits on a fetch in progress
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def get(self) -> List[str]:
+        """
+        Returns the cached headlines, starting a background refresh if they are stale.
+        Blocks only if nothing has been fetched yet.
+        """
+        if self._headlines is None:
+            self.prime()
+        elif self.clock() - self._fetched_at > self.ttl_seconds:
+            self._start_refresh()
+        return self._headlines if self._headlines is not None else []
+
+    def prime(self):
+        """
+        Fetches the headlines synchronously if none are cached yet (e.g. at start-up).
+        """
+        with self._lock:
+            if self._headlines is None:
+                self._refresh()
+
+    def refresh(self):
+        """
+        Fetches the headlines now, in the calling thread.
+        """
+        with self._lock:
+            self._refresh()
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Waits for a running background refresh to finish.
+        """
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _start_refresh(self):
+        with self._thread_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self.refresh, name="headline-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh(self):
+        # Caller holds self._lock
+        try:
+            headlines = list(self.provider.fetch())
+        except Exception as e:
+            logger.warning("Headline refresh failed; serving cached headlines: %s", e)
+            self.last_error = e
+            if self._headlines is None:
+                self._headlines = []
+        else:
+            self.last_error = None
+            # An unchanged feed keeps the same list object and version
+            if headlines != self._headlines:
+                self._headlines = headlines
+                self.version += 1
+        # Retry a failed fetch only after another TTL, not on every call
+        self._fetched_at = self.clock()
+
+
+@lru_cache(maxsize=None)
+def get_headline_feed() -> HeadlineFeed:
+    """
+    Returns the process-wide headline feed, reading NEWS_HEADLINES_PATH (default: the bundled
+    fixture) every NEWS_REFRESH_SECONDS.
+    """
+    path = get_env_variable("NEWS_HEADLINES_PATH", DEFAULT_HEADLINES_PATH)
+    return HeadlineFeed(
+        FileHeadlineProvider(path),
+        ttl_seconds=float(get_env_variable("NEWS_REFRESH_SECONDS", 300)),
+    )
@@ -2,28 +2,280 @@
 openai_service.py
 -----------------
 Handles interactions with the OpenAI API.
+
+The service owns pooled keep-alive HTTP clients (HTTP/2 when the h2 package is installed):
+one thread-safe sync client, and one async client per event loop. Connections and TLS
+sessions are reused across calls, so share one instance per process (get_openai_service)
+across threads and requests rather than creating one per call.
+
+- generate_completion / agenerate_completion: One chat completion, retried on 429/5xx with jittered backoff.
+- generate_completions / agenerate_completions: Batch completions with bounded concurrency,
+  request/token rate limits and results in input order.
+- get_openai_service: The process-wide service configured from the environment.
+
+Configuration (environment variables):
+    OPENAI_API_KEY           API key used by get_openai_service
+    OPENAI_BASE_URL          API root (default https://api.openai.com/v1; point it at a local fake server in tests)
+    OPENAI_MAX_CONCURRENCY   requests in flight per batch (default 8)
+    OPENAI_RPM / OPENAI_TPM  requests and tokens per minute (default: unlimited)
+    OPENAI_MAX_RETRIES       retries per request on 429, 5xx and network errors (default 5)
+    OPENAI_POOL_SIZE         connections kept per client (default 16, or OPENAI_MAX_CONCURRENCY if larger)
+    OPENAI_KEEPALIVE_SECONDS idle time before a pooled connection is closed (default 30)
+    OPENAI_TIMEOUT           read/write timeout in seconds (default 60)
+    OPENAI_CONNECT_TIMEOUT   connect timeout in seconds (default 5)
+    OPENAI_HTTP2             "0" disables HTTP/2 even when h2 is installed
 """
 
-import openai
+import asyncio
+import importlib.util
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Awaitable, List, Optional, Sequence, TypeVar, Union
+
+import httpx
+
+from app.config import get_env_variable
+from app.services.rate_limit import RateLimiter, backoff_delay, estimate_tokens
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+# Status codes worth retrying: rate limited, and transient server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# httpx negotiates HTTP/2 only with the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
 
 class OpenAIService:
     """
-    Skeleton service for interacting with OpenAI's API.
+    Client for OpenAI's chat completions API with pooled keep-alive connections.
+    Safe to share across threads and async tasks.
     """
-    def __init__(self, api_key: str):
-        # Initialize with OpenAI API key
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_concurrency: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_retries: Optional[int] = None, max_tokens: int = 300, timeout: Optional[float] = None,
+                 connect_timeout: Optional[float] = None, pool_size: Optional[int] = None,
+                 keepalive_seconds: Optional[float] = None, http2: Optional[bool] = None):
+        # Initialize with OpenAI API key (sent per request; no global client state)
         self.api_key = api_key
-        openai.api_key = api_key
+        self.base_url = (base_url or get_env_variable("OPENAI_BASE_URL", DEFAULT_BASE_URL)).rstrip("/")
+        self.max_concurrency = max_concurrency or int(get_env_variable("OPENAI_MAX_CONCURRENCY", 8))
+        self.max_retries = max_retries if max_retries is not None else int(get_env_variable("OPENAI_MAX_RETRIES", 5))
+        self.max_tokens = max_tokens
+        rpm = requests_per_minute or float(get_env_variable("OPENAI_RPM", 0))
+        tpm = tokens_per_minute or float(get_env_variable("OPENAI_TPM", 0))
+        # Shared by every batch, so the per-minute budgets hold across calls
+        self.rate_limiter = RateLimiter(rpm or None, tpm or None)
+
+        # Enough connections for a full batch in flight
+        pool_size = pool_size or int(get_env_variable("OPENAI_POOL_SIZE", max(16, self.max_concurrency)))
+        keepalive_seconds = keepalive_seconds or float(get_env_variable("OPENAI_KEEPALIVE_SECONDS", 30))
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                   keepalive_expiry=keepalive_seconds)
+        self.timeout = httpx.Timeout(
+            timeout or float(get_env_variable("OPENAI_TIMEOUT", 60)),
+            connect=connect_timeout or float(get_env_variable("OPENAI_CONNECT_TIMEOUT", 5)),
+        )
+        if http2 is None:
+            http2 = get_env_variable("OPENAI_HTTP2", "1") != "0"
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._client: Optional[httpx.Client] = None
+        # Async clients are bound to the event loop that opened their connections
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        The pooled sync client (created on first use; thread-safe).
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_options())
+        return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        The pooled async client of the running event loop (created on first use).
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            with self._lock:
+                client = self._async_clients.get(loop)
+                if client is None:
+                    client = httpx.AsyncClient(**self._client_options())
+                    self._async_clients[loop] = client
+        return client
+
+    def generate_completion(self, prompt: str, model: str = "gpt-3.5-turbo", max_tokens: Optional[int] = None) -> str:
+        """
+        Generate a completion using OpenAI's API, on the pooled sync client. Blocks for the
+        shared request/token rate limits like the async path, and retries 429/5xx responses
+        and network errors with jittered exponential backoff.
+
+        Raises:
+            httpx.HTTPStatusError: For non-retryable errors, or when retries are exhausted.
+        """
+        payload = self._payload(prompt, model, max_tokens)
+        tokens = estimate_tokens(prompt, payload["max_tokens"])
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire_sync(tokens)
+            retry_after = None
+            try:
+                response = self.client.post("/chat/completions", json=payload)
+                if not self._should_retry(response, attempt):
+                    return _completion_text(response)
+                retry_after = _retry_after_seconds(response)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            time.sleep(backoff_delay(attempt, retry_after=retry_after))
+            attempt += 1
+
+    async def agenerate_completion(self, prompt: str, model: str = "gpt-3.5-turbo",
+                                   client: Optional[httpx.AsyncClient] = None, max_tokens: Optional[int] = None) -> str:
+        """
+        Returns the text of one chat completion, waiting for the rate limiter and retrying
+        429/5xx responses and network errors with jittered exponential backoff. Uses the
+        pooled async client of the running loop unless client is given.
+
+        Raises:
+            httpx.HTTPStatusError: For non-retryable errors, or when retries are exhausted.
+        """
+        client = client or self.async_client()
+        payload = self._payload(prompt, model, max_tokens)
+        tokens = estimate_tokens(prompt, payload["max_tokens"])
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(tokens)
+            retry_after = None
+            try:
+                response = await client.post("/chat/completions", json=payload)
+                if not self._should_retry(response, attempt):
+                    return _completion_text(response)
+                retry_after = _retry_after_seconds(response)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(backoff_delay(attempt, retry_after=retry_after))
+            attempt += 1
+
+    async def agenerate_completions(self, prompts: Sequence[str], model: str = "gpt-3.5-turbo",
+                                    return_exceptions: bool = False,
+                                    max_tokens: Optional[int] = None) -> List[Union[str, BaseException]]:
+        """
+        Completes every prompt with at most max_concurrency requests in flight, and returns
+        the results in the order of prompts. With return_exceptions, a failed prompt yields
+        its exception instead of failing the batch. max_tokens overrides the completion budget
+        per request (e.g. for packed multi-lead prompts).
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        client = self.async_client()
+
+        async def complete(prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate_completion(prompt, model, client, max_tokens)
 
-    def generate_completion(self, prompt: str, model: str = "gpt-3.5-turbo"):
+        return await asyncio.gather(*(complete(prompt) for prompt in prompts), return_exceptions=return_exceptions)
+
+    def generate_completions(self, prompts: Sequence[str], model: str = "gpt-3.5-turbo",
+                             return_exceptions: bool = False,
+                             max_tokens: Optional[int] = None) -> List[Union[str, BaseException]]:
+        """
+        Synchronous entry point for agenerate_completions.
+        """
+        return self.run_sync(self.agenerate_completions(prompts, model, return_exceptions, max_tokens))
+
+    def run_sync(self, coroutine: Awaitable[T]) -> T:
+        """
+        Runs a coroutine that uses this service on a new event loop (asyncio.run) and closes
+        that loop's async client afterwards. For sync callers of the async batch paths.
+        """
+        async def run():
+            try:
+                return await coroutine
+            finally:
+                await self._close_loop_client()
+
+        return asyncio.run(run())
+
+    def close(self):
+        """
+        Closes the pooled sync client. Async clients are closed with aclose() on their loop.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self):
         """
-        Generate a completion using OpenAI's API.
+        Closes the sync client and the async client of the running loop.
         """
-        # Implement OpenAI API call here
-        # Example (to be replaced with actual logic):
-        # response = openai.ChatCompletion.create(
-        #     model=model,
-        #     messages=[{"role": "user", "content": prompt}]
-        # )
-        # return response
-        pass
+        self.close()
+        await self._close_loop_client()
+
+    def __enter__(self) -> "OpenAIService":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self) -> "OpenAIService":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _close_loop_client(self):
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _client_options(self) -> dict:
+        return {
+            "base_url": self.base_url,
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "http2": self.http2,
+        }
+
+    def _payload(self, prompt: str, model: str, max_tokens: Optional[int]) -> dict:
+        return {"model": model, "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens or self.max_tokens}
+
+    def _should_retry(self, response: httpx.Response, attempt: int) -> bool:
+        # Raises for non-retryable errors and for retryable ones once retries are exhausted
+        if response.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+            return True
+        response.raise_for_status()
+        return False
+
+
+def _completion_text(response: httpx.Response) -> str:
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    # Retry-After in seconds (the HTTP-date form is ignored)
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_openai_service() -> OpenAIService:
+    """
+    Returns the process-wide OpenAIService configured from the environment, so every thread
+    and request of a worker shares its connection pools.
+    """
+    return OpenAIService(api_key=get_env_variable("OPENAI_API_KEY", ""))
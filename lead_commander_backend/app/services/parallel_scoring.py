@@ -0,0 +1,200 @@
+"""
+parallel_scoring.py
+-------------------
+Sharded lead scoring and enrichment over a process pool, for batches too large for one core.
+
+A batch is cut into shards of SCORING_CHUNK_SIZE rows. Each shard carries only the columns
+its task reads and is shipped as one compact buffer: Arrow IPC when pyarrow is installed and
+every column has an Arrow type, otherwise a protocol-5 pickle of the column arrays. Workers
+send results back the same way (text results as category codes), and the shards are
+reassembled in input order, so the output equals the single-process result row for row.
+
+Batches that fit in one shard, or SCORING_WORKERS=1 (the default), run inline without a pool.
+Each server process starts its own pool, so with several gunicorn workers keep
+SCORING_WORKERS * workers at or below the CPU count.
+
+Configuration (environment variables):
+    SCORING_WORKERS      worker processes per server process (default 1: score inline)
+    SCORING_CHUNK_SIZE   rows per shard; batches at or below this size are scored inline (default 50000)
+
+- score_parallel: Scores a DataFrame with a named rule set (ScoringPlan.score_frame).
+- enrich_parallel: Enriches a DataFrame with LeadIntelligenceAgent.enrich_lead_batch.
+- shutdown_pool: Stops the worker processes (called automatically at exit).
+"""
+
+import atexit
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import get_env_variable
+from app.services.columnar_io import ARROW_STREAM_MIMETYPE, columnar_available, read_frame, write_frame
+from app.services.scoring_service import get_scoring_plan
+
+# Worker processes for sharded scoring, per server process (default: no pool)
+SCORING_WORKERS = int(get_env_variable("SCORING_WORKERS", 1))
+# Rows per shard; batches at or below this size are scored inline
+SCORING_CHUNK_SIZE = int(get_env_variable("SCORING_CHUNK_SIZE", 50_000))
+
+# Columns LeadIntelligenceAgent.enrich_lead_batch reads
+ENRICH_FIELDS = ["email", "company", "company_size"]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def score_parallel(leads: pd.DataFrame, rules: str = "optimize", workers: Optional[int] = None,
+                   chunk_size: Optional[int] = None) -> pd.Series:
+    """
+    Scores leads with a named rule set, sharded across worker processes.
+
+    Returns:
+        pd.Series: Scores aligned with leads.index, identical to score_leads(leads, rules)
+        (the same default rule set).
+
+    Raises:
+        ValueError: If the rule set does not exist or workers/chunk_size are not positive.
+    """
+    plan = get_scoring_plan(rules)
+    fields = [rule.field for rule in plan.fields if rule.field in leads.columns]
+    parts = _map_shards(_score_task(rules), leads, fields, workers, chunk_size)
+    if not parts:
+        return plan.score_frame(leads)
+    return pd.concat([part.iloc[:, 0] for part in parts]).set_axis(leads.index)
+
+
+def enrich_parallel(leads: pd.DataFrame, workers: Optional[int] = None,
+                    chunk_size: Optional[int] = None) -> pd.DataFrame:
+    """
+    Adds industry and employee_size for every lead, sharded across worker processes.
+
+    Returns:
+        pd.DataFrame: industry and employee_size aligned with leads.index, identical to
+        LeadIntelligenceAgent().enrich_lead_batch(leads).
+    """
+    from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+
+    fields = [field for field in ENRICH_FIELDS if field in leads.columns]
+    parts = _map_shards(_enrich_task, leads, fields, workers, chunk_size)
+    if not parts:
+        return LeadIntelligenceAgent().enrich_lead_batch(leads)
+    return pd.concat(parts).set_axis(leads.index)
+
+
+def shutdown_pool():
+    """
+    Shuts down the shared worker pool, if one was started.
+    """
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+class _score_task:
+    """
+    Picklable task: scores a shard with a named rule set.
+    """
+
+    def __init__(self, rules: str):
+        self.rules = rules
+
+    def __call__(self, shard: pd.DataFrame) -> pd.DataFrame:
+        return get_scoring_plan(self.rules).score_frame(shard).to_frame()
+
+
+def _enrich_task(shard: pd.DataFrame) -> pd.DataFrame:
+    from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+
+    return LeadIntelligenceAgent().enrich_lead_batch(shard)
+
+
+def _map_shards(task: Callable, leads: pd.DataFrame, fields: List[str], workers: Optional[int],
+                chunk_size: Optional[int]) -> list:
+    """
+    Runs task over row shards of leads[fields] in the pool and returns the results in order.
+    Returns an empty list when the batch should run inline instead (one worker, one shard,
+    or none of the columns the task reads).
+    """
+    workers = SCORING_WORKERS if workers is None else workers
+    chunk_size = SCORING_CHUNK_SIZE if chunk_size is None else chunk_size
+    if workers <= 0 or chunk_size <= 0:
+        raise ValueError("workers and chunk_size must be positive integers.")
+    if workers == 1 or len(leads) <= chunk_size or not fields:
+        return []
+
+    columns = leads[fields].reset_index(drop=True)
+    payloads = (_encode(columns.iloc[start:start + chunk_size]) for start in range(0, len(columns), chunk_size))
+    pool = _get_pool(workers)
+    return [_decode(result) for result in pool.map(_run_shard, [task] * -(-len(columns) // chunk_size), payloads)]
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the shared pool, (re)starting it if the requested worker count changed.
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    return _pool
+
+
+def _run_shard(task: Callable, payload: bytes) -> bytes:
+    """
+    Worker entry point: decodes a shard, runs the task and encodes its result frame.
+    """
+    result = task(_decode(payload)).reset_index(drop=True)
+    # Text results (industry labels, etc.) travel as category codes
+    for name in result.columns:
+        if result[name].dtype == object:
+            result[name] = result[name].astype("category")
+    return _encode(result)
+
+
+def _encode(frame: pd.DataFrame) -> bytes:
+    """
+    Serializes a shard as Arrow IPC when that round-trips it exactly, else as a protocol-5 pickle.
+    """
+    if columnar_available() and _arrow_safe(frame):
+        return b"A" + write_frame(frame, ARROW_STREAM_MIMETYPE)
+    return b"P" + pickle.dumps(frame, protocol=5)
+
+
+def _decode(payload: bytes) -> pd.DataFrame:
+    if payload[:1] == b"A":
+        frame = read_frame(payload[1:], ARROW_STREAM_MIMETYPE)
+    else:
+        frame = pickle.loads(payload[1:])
+    for name in frame.columns:
+        if isinstance(frame[name].dtype, pd.CategoricalDtype):
+            frame[name] = frame[name].astype(object)
+    return frame
+
+
+def _arrow_safe(frame: pd.DataFrame) -> bool:
+    """
+    True if every column converts to Arrow and back with the same values: NumPy numeric/bool
+    columns, NaN-backed string columns, categoricals, and object columns holding only str
+    values (no None/NaN, which would come back as a different null).
+    """
+    for name in frame.columns:
+        series = frame[name]
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if isinstance(dtype, pd.StringDtype):
+            if dtype.na_value is pd.NA:
+                return False
+        elif dtype == object:
+            if pd.api.types.infer_dtype(series, skipna=False) not in ("string", "empty"):
+                return False
+        elif not (isinstance(dtype, np.dtype) and dtype.kind in "biuf"):
+            return False
+    return True
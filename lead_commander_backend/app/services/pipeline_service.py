@@ -0,0 +1,295 @@
+"""
+pipeline_service.py
+-------------------
+Runs the rule-based agents as one pipeline over a batch of leads, following the agent
+architecture (lead_commander_agent_architecture.mmd):
+
+    lead_scoring, lead_enrichment (LeadIntelligenceAgent)
+    signal_detection (MarketSignalScanner)
+    market_signal (MarketSignalScanner)             <- company, industry
+    revenue_forecast (RevenueForecastingAgent)      <- score, market_signal_detected
+    pipeline_optimization (PipelineOptimizationAgent) <- win_probability, market_signal_detected
+    automation (AutomationAgent)                    <- recommended_action
+    coaching (CoachingAgent)                        <- win_probability, market_signal_detected
+    risk (LeadRiskAgent), ltv (LtvAgent)            <- score
+
+The input leads are copied once; every stage then writes its fields into the same records
+in place, instead of each agent returning a new copy of every lead. Only the stages needed
+for the requested output fields run, and the time spent in each stage is reported.
+
+Batches can be run as lead dicts (run) or as a DataFrame (run_frame). In frame mode every
+stage uses the agents' vectorized batch methods and writes whole columns; the result equals
+run() on the frame's records (leads.to_dict(orient="records")).
+The LLM-backed InsightSummarizationAgent is not part of the pipeline.
+
+- Stage: One node of the pipeline (the fields it reads and the fields it writes).
+- PipelineExecutor: Resolves the stages for a set of output fields and runs them over a batch.
+- PipelineResult: The enriched records plus per-stage timings.
+- default_stages: Builds the stages for the agents in app/agents/.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from app.agents.automation_agent import AutomationAgent
+from app.agents.coaching_agent import CoachingAgent
+from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from app.agents.lead_risk_agent import LeadRiskAgent
+from app.agents.ltv_agent import LtvAgent
+from app.agents.market_signal_scanner import NO_SIGNAL, MarketSignalScanner
+from app.agents.pipeline_optimization_agent import PipelineOptimizationAgent
+from app.agents.revenue_forecasting_agent import RevenueForecastingAgent
+from app.services.parallel_scoring import enrich_parallel, score_parallel
+
+
+class Stage:
+    """
+    One pipeline node: reads `requires`, writes `provides` into every record in place.
+    `run` works on a list of lead dicts, `run_frame` on a DataFrame (adding or replacing columns).
+    """
+
+    def __init__(self, name: str, requires: Iterable[str], provides: Iterable[str],
+                 run: Callable[[List[Dict]], None], run_frame: Optional[Callable[[pd.DataFrame], None]] = None):
+        self.name = name
+        self.requires = tuple(requires)
+        self.provides = tuple(provides)
+        self.run = run
+        self.run_frame = run_frame
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, requires={self.requires}, provides={self.provides})"
+
+
+class PipelineResult:
+    """
+    Output of PipelineExecutor.run.
+
+    Attributes:
+        records: The enriched leads (input fields plus every field written by the stages that ran),
+            as lead dicts from run() or as a DataFrame from run_frame().
+        timings: Seconds spent in each stage that ran, in execution order.
+    """
+
+    def __init__(self, records: Union[List[Dict], pd.DataFrame], timings: Dict[str, float]):
+        self.records = records
+        self.timings = timings
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+class PipelineExecutor:
+    """
+    Runs a DAG of stages over a batch of leads, skipping stages whose outputs are not needed.
+    """
+
+    def __init__(self, stages: Optional[List[Stage]] = None):
+        """
+        Args:
+            stages: Pipeline stages in dependency order (defaults to default_stages()).
+
+        Raises:
+            ValueError: If two stages write the same field or a stage reads a field
+                written only by a later stage.
+        """
+        self.stages = stages if stages is not None else default_stages()
+        self.producers: Dict[str, Stage] = {}
+        for stage in self.stages:
+            for field in stage.requires:
+                if field not in self.producers and any(field in later.provides for later in self.stages):
+                    raise ValueError(f"Stage '{stage.name}' reads '{field}' before it is written.")
+            for field in stage.provides:
+                if field in self.producers:
+                    raise ValueError(f"Field '{field}' is written by more than one stage.")
+                self.producers[field] = stage
+
+    @property
+    def outputs(self) -> List[str]:
+        """
+        Every field the pipeline can produce.
+        """
+        return list(self.producers)
+
+    def plan(self, outputs: Optional[Iterable[str]] = None) -> List[Stage]:
+        """
+        Returns the stages needed to produce `outputs` (all stages if None), in execution order.
+
+        Raises:
+            ValueError: If an output is not produced by any stage.
+        """
+        if outputs is None:
+            return list(self.stages)
+        needed = set()
+        pending = list(outputs)
+        while pending:
+            field = pending.pop()
+            stage = self.producers.get(field)
+            if stage is None:
+                raise ValueError(f"Unknown pipeline output: '{field}'. Available: {', '.join(self.outputs)}")
+            if stage.name not in needed:
+                needed.add(stage.name)
+                pending.extend(field for field in stage.requires if field in self.producers)
+        return [stage for stage in self.stages if stage.name in needed]
+
+    def run(self, leads: Iterable[Dict], outputs: Optional[Iterable[str]] = None) -> PipelineResult:
+        """
+        Runs the stages needed for `outputs` over the leads. The input dicts are not modified.
+
+        Args:
+            leads: Lead dictionaries.
+            outputs: Fields to compute (e.g. ["coaching_tip", "ltv"]); None runs every stage.
+
+        Returns:
+            PipelineResult: Enriched records and per-stage timings.
+        """
+        stages = self.plan(outputs)
+        # The only copy of the batch; stages write into these records in place
+        records = [dict(lead) for lead in leads]
+        timings = {}
+        for stage in stages:
+            start = time.perf_counter()
+            stage.run(records)
+            timings[stage.name] = time.perf_counter() - start
+        return PipelineResult(records, timings)
+
+    def run_frame(self, leads: pd.DataFrame, outputs: Optional[Iterable[str]] = None) -> PipelineResult:
+        """
+        Runs the stages needed for `outputs` over a DataFrame of leads, column by column.
+        The input frame is not modified.
+
+        Raises:
+            ValueError: If an output is unknown or a needed stage has no frame implementation.
+        """
+        stages = self.plan(outputs)
+        missing = [stage.name for stage in stages if stage.run_frame is None]
+        if missing:
+            raise ValueError(f"Stages without a DataFrame implementation: {', '.join(missing)}")
+        # Shallow copy: stages only add or replace whole columns, never write into the input's arrays
+        frame = leads.copy(deep=False)
+        timings = {}
+        for stage in stages:
+            start = time.perf_counter()
+            stage.run_frame(frame)
+            timings[stage.name] = time.perf_counter() - start
+        return PipelineResult(frame, timings)
+
+
+def default_stages(scanner: Optional[MarketSignalScanner] = None) -> List[Stage]:
+    """
+    Builds the pipeline stages for the rule-based agents, in dependency order.
+    Field defaults match the per-lead agent methods (e.g. a missing email counts as "").
+
+    Args:
+        scanner: Market signal scanner to use (default: one over the process-wide headline feed).
+    """
+    intelligence = LeadIntelligenceAgent()
+    scanner = scanner or MarketSignalScanner()
+    forecaster = RevenueForecastingAgent()
+    optimizer = PipelineOptimizationAgent()
+    automation = AutomationAgent()
+    coaching = CoachingAgent()
+    risk = LeadRiskAgent()
+    ltv = LtvAgent()
+
+    def lead_scoring(records):
+        for lead in records:
+            lead["score"] = intelligence.score_lead(lead)
+
+    def lead_enrichment(records):
+        for lead in records:
+            lead["industry"] = intelligence.resolve_industry(lead.get("email"), lead.get("company"))
+            lead["employee_size"] = intelligence.employee_size_for(lead.get("company_size", 0))
+
+    def signal_detection(records):
+        # Whether any headline carries a signal keyword does not depend on the lead: scan once per batch
+        detected = scanner.detect_signal() is not None
+        for lead in records:
+            lead["market_signal_detected"] = detected
+
+    def market_signal(records):
+        for lead in records:
+            signal = scanner.lead_signal(lead.get("company"), lead.get("industry"))
+            lead["market_signal"] = signal if signal is not None else NO_SIGNAL
+
+    def revenue_forecast(records):
+        for lead in records:
+            lead["win_probability"], lead["estimated_revenue"] = forecaster.forecast_for(
+                lead["score"], lead["market_signal_detected"]
+            )
+
+    def pipeline_optimization(records):
+        for lead in records:
+            lead["recommended_action"] = optimizer.action_for(lead["win_probability"], lead["market_signal_detected"])
+
+    def automation_status(records):
+        for lead in records:
+            lead["automation_status"] = automation.automation_status_for(lead["recommended_action"])
+
+    def coaching_tip(records):
+        for lead in records:
+            lead["coaching_tip"] = coaching.coaching_tip_for(lead["win_probability"], lead["market_signal_detected"])
+
+    def risk_score(records):
+        for lead in records:
+            lead["risk_score"] = risk.run(lead)
+
+    def lifetime_value(records):
+        for lead in records:
+            lead["ltv"] = ltv.run(lead)
+
+    # Scoring and enrichment are the Python-heavy stages: large frames are sharded across processes
+    def lead_scoring_frame(frame):
+        frame["score"] = score_parallel(frame, rules=intelligence.plan.name)
+
+    def lead_enrichment_frame(frame):
+        enriched = enrich_parallel(frame)
+        frame["industry"] = enriched["industry"]
+        frame["employee_size"] = enriched["employee_size"]
+
+    def signal_detection_frame(frame):
+        frame["market_signal_detected"] = scanner.detect_signal() is not None
+
+    def market_signal_frame(frame):
+        frame["market_signal"] = scanner.lead_signal_batch(frame).fillna(NO_SIGNAL)
+
+    def revenue_forecast_frame(frame):
+        forecasts = forecaster.forecast_batch(frame)
+        frame["win_probability"] = forecasts["win_probability"]
+        frame["estimated_revenue"] = forecasts["estimated_revenue"]
+
+    def pipeline_optimization_frame(frame):
+        frame["recommended_action"] = optimizer.recommend_action_batch(frame)
+
+    def automation_status_frame(frame):
+        frame["automation_status"] = automation.execute_action_batch(frame)
+
+    def coaching_tip_frame(frame):
+        frame["coaching_tip"] = coaching.generate_coaching_tip_batch(frame)
+
+    def risk_score_frame(frame):
+        frame["risk_score"] = risk.run_batch(frame)
+
+    def lifetime_value_frame(frame):
+        frame["ltv"] = ltv.run_batch(frame)
+
+    return [
+        Stage("lead_scoring", ["company_size", "title", "email", "phone"], ["score"],
+              lead_scoring, lead_scoring_frame),
+        Stage("lead_enrichment", ["email", "company", "company_size"], ["industry", "employee_size"],
+              lead_enrichment, lead_enrichment_frame),
+        Stage("signal_detection", [], ["market_signal_detected"], signal_detection, signal_detection_frame),
+        Stage("market_signal", ["company", "industry"], ["market_signal"], market_signal, market_signal_frame),
+        Stage("revenue_forecast", ["score", "market_signal_detected"], ["win_probability", "estimated_revenue"],
+              revenue_forecast, revenue_forecast_frame),
+        Stage("pipeline_optimization", ["win_probability", "market_signal_detected"], ["recommended_action"],
+              pipeline_optimization, pipeline_optimization_frame),
+        Stage("automation", ["recommended_action"], ["automation_status"],
+              automation_status, automation_status_frame),
+        Stage("coaching", ["win_probability", "market_signal_detected"], ["coaching_tip"],
+              coaching_tip, coaching_tip_frame),
+        Stage("risk", ["email", "score"], ["risk_score"], risk_score, risk_score_frame),
+        Stage("ltv", ["company_size", "score"], ["ltv"], lifetime_value, lifetime_value_frame),
+    ]
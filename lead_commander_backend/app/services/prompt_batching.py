@@ -0,0 +1,108 @@
+"""
+prompt_batching.py
+------------------
+Cuts request count and token volume for large LLM runs.
+
+Lead prompts share a long instruction preamble and many leads produce the same prompt, so a
+batch is reduced in two steps: identical prompts are collapsed into one request, and,
+optionally, several leads are packed into one request that states the instructions once and
+asks for a JSON object of per-lead answers.
+
+- dedupe_prompts: Unique prompts plus the position of each original prompt among them.
+- pack_prompt: One request covering several labelled lead blocks.
+- parse_packed_response: Per-label answers from a packed response (tolerates code fences and prose).
+- reduction_report: Requests and estimated prompt tokens saved by a batch.
+"""
+
+import json
+from typing import Dict, List, Sequence, Tuple
+
+from app.services.rate_limit import estimate_tokens
+
+
+def dedupe_prompts(prompts: Sequence[str]) -> Tuple[List[str], List[int]]:
+    """
+    Returns (unique, index): unique prompts in first-seen order, and for each input prompt
+    the position of its copy in unique.
+    """
+    positions: Dict[str, int] = {}
+    index = [positions.setdefault(prompt, len(positions)) for prompt in prompts]
+    return list(positions), index
+
+
+def pack_label(position: int) -> str:
+    """
+    Label of the lead at position within a packed request ("L1", "L2", ...).
+    """
+    return f"L{position + 1}"
+
+
+def pack_prompt(instructions: str, blocks: Sequence[str]) -> str:
+    """
+    Builds one request for several leads: the instructions once, then each block under its
+    label, and a request for a JSON object mapping every label to its answer.
+    """
+    labels = [pack_label(position) for position in range(len(blocks))]
+    sections = "\n".join(f"{label}:\n{block.strip()}\n" for label, block in zip(labels, blocks))
+    return (
+        f"{instructions.strip()}\n\n"
+        f"Answer separately for each of the {len(blocks)} leads below. Respond with only a JSON object "
+        f"that maps each lead label ({', '.join(labels)}) to its answer as a string.\n\n"
+        f"{sections}"
+    )
+
+
+def parse_packed_response(text: str, count: int) -> Dict[int, str]:
+    """
+    Extracts per-lead answers from a packed response. Returns {position: answer} for the
+    labels that are present with a non-empty string; missing or malformed entries are left
+    out so the caller can retry those leads on their own.
+    """
+    if not text:
+        return {}
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return {}
+    try:
+        answers = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(answers, dict):
+        return {}
+    parsed = {}
+    for position in range(count):
+        answer = answers.get(pack_label(position))
+        if isinstance(answer, str) and answer.strip():
+            parsed[position] = answer.strip()
+    return parsed
+
+
+def reduction_report(leads: int, cache_hits: int, missed_prompts: Sequence[str], sent_prompts: Sequence[str],
+                     unique_prompts: int, fallbacks: int = 0) -> Dict[str, float]:
+    """
+    Summarizes a batch: how many requests and estimated prompt tokens were sent, against one
+    request per lead that missed the cache.
+
+    Args:
+        leads: Leads in the batch.
+        cache_hits: Leads answered from the response cache.
+        missed_prompts: Prompts of the leads that missed the cache (duplicates included).
+        sent_prompts: Prompts actually sent (deduplicated, packed and fallback requests).
+        unique_prompts: Distinct prompts among missed_prompts.
+        fallbacks: Leads re-sent on their own after a packed answer could not be parsed.
+    """
+    naive_tokens = sum(estimate_tokens(prompt) for prompt in missed_prompts)
+    sent_tokens = sum(estimate_tokens(prompt) for prompt in sent_prompts)
+    return {
+        "leads": leads,
+        "cache_hits": cache_hits,
+        "unique_prompts": unique_prompts,
+        "duplicates_collapsed": len(missed_prompts) - unique_prompts,
+        "requests_naive": len(missed_prompts),
+        "requests_sent": len(sent_prompts),
+        "request_reduction": 1 - len(sent_prompts) / len(missed_prompts) if missed_prompts else 0.0,
+        "prompt_tokens_naive": naive_tokens,
+        "prompt_tokens_sent": sent_tokens,
+        "token_reduction": 1 - sent_tokens / naive_tokens if naive_tokens else 0.0,
+        "fallbacks": fallbacks,
+    }
@@ -0,0 +1,124 @@
+"""
+rate_limit.py
+-------------
+Rate limiting and retry helpers for API calls, for asyncio and threaded callers.
+
+- TokenBucket: Refills at a fixed rate up to a capacity; acquire(n) (or acquire_sync(n) from
+  sync code) waits until n tokens are available.
+- RateLimiter: Requests-per-minute and tokens-per-minute budgets enforced together.
+- backoff_delay: Exponential backoff with full jitter, honouring a server's Retry-After.
+- estimate_tokens: Rough token count of a prompt (about four characters per token).
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket: holds up to capacity tokens and refills at rate tokens per second. Async
+    waiters on one event loop are served in arrival order; sync callers (acquire_sync, from
+    any thread) draw on the same tokens.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        # One lock per event loop, so a limiter can be shared by successive asyncio.run() batches
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Guards the token count across threads (sync callers, and loops in other threads)
+        self._thread_lock = threading.Lock()
+
+    async def acquire(self, tokens: float = 1):
+        """
+        Waits until tokens are available and takes them. Requests larger than the capacity
+        wait for a full bucket and then take it all.
+        """
+        tokens = min(tokens, self.capacity)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        async with self._lock:
+            while True:
+                wait = self._take(tokens)
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: float = 1):
+        """
+        Blocking acquire() for sync code: sleeps the calling thread until tokens are available.
+        """
+        tokens = min(tokens, self.capacity)
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def _take(self, tokens: float) -> float:
+        """
+        Refills, then takes tokens if available. Returns 0 when taken, else the seconds until
+        they will be.
+        """
+        with self._thread_lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Per-minute request and token budgets (either may be None for unlimited). Each budget is
+    a token bucket whose capacity is one minute's allowance.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+
+    async def acquire(self, tokens: int):
+        """
+        Waits for one request slot and the given number of tokens.
+        """
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(tokens)
+
+    def acquire_sync(self, tokens: int):
+        """
+        Blocking acquire() for sync callers; shares the budgets with async callers.
+        """
+        if self.requests is not None:
+            self.requests.acquire_sync(1)
+        if self.tokens is not None:
+            self.tokens.acquire_sync(tokens)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number attempt (0-based): a uniformly random delay up to
+    base * 2**attempt (capped), and never less than the server's Retry-After.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+def estimate_tokens(text: str, completion_tokens: int = 0) -> int:
+    """
+    Approximate tokens for a prompt (about four characters per token) plus the completion budget.
+    """
+    return len(text) // 4 + 1 + completion_tokens
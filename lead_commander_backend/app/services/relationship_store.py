@@ -0,0 +1,322 @@
+"""
+relationship_store.py
+---------------------
+Incrementally maintained relationship graph for a changing set of leads.
+
+Leads are connected when they share a value in any relationship field (industry, location),
+as in RelationshipMappingAgent. The store keeps the hash buckets themselves (field value ->
+lead ids), so adding, updating or removing one lead only touches the buckets of its own
+values, and connections are read from the buckets on demand instead of being rebuilt for
+every lead after every change.
+
+The graph is persisted compactly as one bucket code per lead and field plus the distinct
+values, not as per-lead connection lists. A store opened on a path also appends every change
+to a journal next to the snapshot (<path>.log), so persisting one update writes one line
+rather than the whole graph; the journal is replayed on open and folded into the snapshot
+once it holds more entries than the store has leads.
+
+Configuration (environment variables):
+    RELATIONSHIP_STORE_PATH     JSON snapshot the process-wide store is opened on (journal at
+                                <path>.log; default: unset, the store lives in memory only)
+
+- RelationshipStore: Add/update/remove leads, read connections and degrees, save/load/open.
+- get_relationship_store: The process-wide store behind the /insights/relationships routes.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.agents.relationship_mapping_agent import RELATIONSHIP_FIELDS, RelationshipGraph
+from app.config import get_env_variable
+
+_STORE_VERSION = 1
+JOURNAL_SUFFIX = ".log"
+# Journals shorter than this are never compacted, whatever the store size
+JOURNAL_COMPACT_MIN = 1000
+
+
+def _bucket_key(value: Any):
+    """
+    Returns a hashable key for a field value, or None for values that never match anything
+    (NaN and other values that are not == to themselves, and unhashable values).
+    """
+    try:
+        if not value == value:
+            return None
+        hash(value)
+    except (TypeError, ValueError):
+        return None
+    # Wrapped so that a None field value is still a bucket (None == None connects)
+    return (value,)
+
+
+def _json_value(value: Any):
+    # NumPy scalars become Python numbers; anything else is stored as text
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class RelationshipStore:
+    """
+    Relationship graph over leads keyed by id, updated one lead at a time.
+
+    Each update costs O(number of fields) bucket operations; reading a lead's connections
+    costs O(its degree). connections() returns ids in the order the leads were first added,
+    which is what RelationshipMappingAgent.run() returns for the leads in that order.
+
+    The methods themselves are not thread-safe; callers sharing a store hold its lock.
+    A store from open() journals its changes; call flush() to write them out.
+    """
+
+    def __init__(self, fields: Iterable[str] = RELATIONSHIP_FIELDS):
+        self.fields = tuple(fields)
+        self.lock = threading.RLock()
+        # lead id -> insertion sequence number (kept across updates)
+        self._sequence: Dict[Any, int] = {}
+        self._next_sequence = 0
+        # lead id -> {field: value}
+        self._values: Dict[Any, Dict[str, Any]] = {}
+        # field -> bucket key -> {lead id: None} (an insertion-ordered set)
+        self._buckets: Dict[str, Dict[Any, Dict[Any, None]]] = {field: {} for field in self.fields}
+        # Snapshot path and open change journal of a store from open()
+        self._path: Optional[str] = None
+        self._journal = None
+        self._journal_entries = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, lead_id):
+        return lead_id in self._values
+
+    def upsert(self, lead: Dict):
+        """
+        Adds a lead, or updates the relationship fields of an existing lead with the same id.
+        Only buckets whose value changed are touched.
+        """
+        lead_id = lead["id"]
+        new_values = {field: lead.get(field) for field in self.fields}
+        old_values = self._values.get(lead_id)
+        if old_values is None:
+            self._sequence[lead_id] = self._next_sequence
+            self._next_sequence += 1
+        for field in self.fields:
+            old_key = _bucket_key(old_values[field]) if old_values is not None else None
+            new_key = _bucket_key(new_values[field])
+            if old_values is not None and old_key == new_key:
+                continue
+            if old_key is not None:
+                self._leave(field, old_key, lead_id)
+            if new_key is not None:
+                self._buckets[field].setdefault(new_key, {})[lead_id] = None
+        self._values[lead_id] = new_values
+        self._log({"op": "upsert", "id": lead_id, "values": new_values})
+
+    def upsert_many(self, leads: Iterable[Dict]):
+        for lead in leads:
+            self.upsert(lead)
+
+    def remove(self, lead_id) -> bool:
+        """
+        Removes a lead from its buckets. Returns False if the id is not in the store.
+        """
+        values = self._values.pop(lead_id, None)
+        if values is None:
+            return False
+        del self._sequence[lead_id]
+        for field in self.fields:
+            key = _bucket_key(values[field])
+            if key is not None:
+                self._leave(field, key, lead_id)
+        self._log({"op": "remove", "id": lead_id})
+        return True
+
+    def connections(self, lead_id) -> List:
+        """
+        Ids of the leads sharing any relationship field value with lead_id, in insertion order.
+        """
+        members = self._members(lead_id)
+        members.discard(lead_id)
+        return sorted(members, key=self._sequence.__getitem__)
+
+    def degree(self, lead_id) -> int:
+        """
+        Number of connections of lead_id.
+        """
+        members = self._members(lead_id)
+        return len(members) - (lead_id in members)
+
+    def relationship_map(self, lead_id) -> Dict:
+        """
+        The {"connections": [...]} entry for one lead (the Lead.relationship_map format).
+        """
+        return {"connections": self.connections(lead_id)}
+
+    def bucket(self, field: str, value: Any) -> List:
+        """
+        Ids of the leads whose field equals value, in insertion order.
+        """
+        key = _bucket_key(value)
+        members = self._buckets[field].get(key, {}) if key is not None else {}
+        return sorted(members, key=self._sequence.__getitem__)
+
+    def leads(self) -> List[Dict]:
+        """
+        The stored leads (id and relationship fields) in insertion order.
+        """
+        ordered = sorted(self._values, key=self._sequence.__getitem__)
+        return [dict(self._values[lead_id], id=lead_id) for lead_id in ordered]
+
+    def to_graph(self) -> RelationshipGraph:
+        """
+        Snapshot as a RelationshipGraph (bucket arrays for bulk queries and analytics).
+        """
+        return RelationshipGraph(self.leads(), self.fields)
+
+    def save(self, path: str):
+        """
+        Writes the store as JSON: lead ids, the distinct values per field, and one value code
+        per lead and field (-1 for values that never match). Written atomically.
+        """
+        ordered = sorted(self._values, key=self._sequence.__getitem__)
+        values: Dict[str, list] = {}
+        codes: Dict[str, List[int]] = {}
+        for field in self.fields:
+            positions: Dict[Any, int] = {}
+            distinct: list = []
+            field_codes = []
+            for lead_id in ordered:
+                value = self._values[lead_id][field]
+                key = _bucket_key(value)
+                if key is None:
+                    field_codes.append(-1)
+                    continue
+                if key not in positions:
+                    positions[key] = len(distinct)
+                    distinct.append(value)
+                field_codes.append(positions[key])
+            values[field], codes[field] = distinct, field_codes
+        document = {"version": _STORE_VERSION, "fields": list(self.fields), "ids": ordered,
+                    "values": values, "codes": codes}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(document, handle, separators=(",", ":"), default=_json_value)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "RelationshipStore":
+        """
+        Reads a store written by save().
+
+        Raises:
+            ValueError: If the file is not a relationship store document.
+        """
+        with open(path, encoding="utf-8") as handle:
+            document = json.load(handle)
+        if not isinstance(document, dict) or document.get("version") != _STORE_VERSION:
+            raise ValueError(f"{path}: not a relationship store (version {_STORE_VERSION}).")
+        store = cls(document["fields"])
+        values, codes = document["values"], document["codes"]
+        for position, lead_id in enumerate(document["ids"]):
+            lead: Dict[str, Optional[Any]] = {"id": lead_id}
+            for field in store.fields:
+                code = codes[field][position]
+                lead[field] = values[field][code] if code >= 0 else float("nan")
+            store.upsert(lead)
+        return store
+
+    @classmethod
+    def open(cls, path: str, fields: Iterable[str] = RELATIONSHIP_FIELDS) -> "RelationshipStore":
+        """
+        Store persisted at path: loads the snapshot (if it exists) and replays the journal
+        (<path>.log), after which every change is appended to the journal.
+        """
+        store = cls.load(path) if os.path.exists(path) else cls(fields)
+        journal_path = path + JOURNAL_SUFFIX
+        if os.path.exists(journal_path):
+            with open(journal_path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-write
+                        break
+                    if entry["op"] == "upsert":
+                        store.upsert(dict(entry["values"], id=entry["id"]))
+                    else:
+                        store.remove(entry["id"])
+                    store._journal_entries += 1
+        store._path = path
+        store._journal = open(journal_path, "a", encoding="utf-8")
+        return store
+
+    def flush(self):
+        """
+        Writes the journaled changes out (to the OS; they survive a crash of the process) and
+        compacts the journal into the snapshot once it outgrows the store, so a change costs
+        O(1) amortized I/O. No-op for a store not from open().
+        """
+        if self._journal is None:
+            return
+        self._journal.flush()
+        if self._journal_entries > max(len(self), JOURNAL_COMPACT_MIN):
+            self.compact()
+
+    def compact(self):
+        """
+        Saves a fresh snapshot and empties the journal.
+        """
+        if self._path is None:
+            return
+        self.save(self._path)
+        self._journal.close()
+        self._journal = open(self._path + JOURNAL_SUFFIX, "w", encoding="utf-8")
+        self._journal_entries = 0
+
+    def close(self):
+        """
+        Flushes and closes the journal; the store stays usable in memory.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _log(self, entry: Dict[str, Any]):
+        if self._journal is not None:
+            self._journal.write(json.dumps(entry, separators=(",", ":"), default=_json_value) + "\n")
+            self._journal_entries += 1
+
+    def _members(self, lead_id) -> set:
+        values = self._values[lead_id]
+        members = set()
+        for field in self.fields:
+            key = _bucket_key(values[field])
+            if key is not None:
+                members.update(self._buckets[field][key])
+        return members
+
+    def _leave(self, field: str, key, lead_id):
+        bucket = self._buckets[field][key]
+        del bucket[lead_id]
+        if not bucket:
+            del self._buckets[field][key]
+
+
+@lru_cache(maxsize=None)
+def get_relationship_store() -> RelationshipStore:
+    """
+    Returns the process-wide store, opened on RELATIONSHIP_STORE_PATH when that is set.
+    """
+    path = get_env_variable("RELATIONSHIP_STORE_PATH")
+    if path:
+        return RelationshipStore.open(path)
+    return RelationshipStore()
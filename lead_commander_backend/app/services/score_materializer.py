@@ -0,0 +1,177 @@
+"""
+score_materializer.py
+---------------------
+Versioned recompute job for the agent outputs stored on the leads table.
+
+Dashboard reads use the materialized columns (score, win_probability, estimated_revenue,
+recommended_action, market_signal, risk_score) instead of running the agents per view. This
+job keeps them current: it walks the table in id order, one batch per transaction, and re-runs
+the pipeline only for rows whose stored scoring_version differs from the current one or whose
+scoring_inputs_hash no longer matches their inputs. Unchanged rows are read but never written,
+so a second run over an unchanged table writes nothing.
+
+The version combines SCORING_CODE_VERSION (bump it when agent logic changes) with a digest of
+the rule files in SCORING_RULES_DIR, so editing a rule set refreshes every row on the next run.
+The input digest covers the lead fields the pipeline reads plus the lead's current market
+signal headline, so a headline refresh only refreshes the leads whose signal it changes.
+
+Run from lead_commander_backend/ against DATABASE_URL:
+    python -m app.services.score_materializer [--batch-size 5000] [--force]
+
+- INPUT_FIELDS / OUTPUT_FIELDS: Lead columns the job reads and writes.
+- get_scoring_version: The current scoring version string.
+- inputs_digest: Input digest per lead of a DataFrame.
+- recompute_scores: Refreshes stale rows and reports what it scanned and wrote.
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from app.agents.market_signal_scanner import MarketSignalScanner
+from app.config import get_env_variable
+from app.models.lead import Lead
+from app.services.pipeline_service import PipelineExecutor, default_stages
+from app.services.scoring_service import DEFAULT_RULES_DIR
+
+# Bump when agent code changes the outputs for the same inputs and rules
+SCORING_CODE_VERSION = 1
+INPUT_FIELDS = ("email", "company", "company_size", "title", "phone")
+OUTPUT_FIELDS = ("score", "market_signal", "market_signal_detected", "win_probability",
+                 "estimated_revenue", "recommended_action", "risk_score")
+DEFAULT_BATCH_SIZE = 5000
+
+
+@lru_cache(maxsize=None)
+def get_scoring_version() -> str:
+    """
+    "<SCORING_CODE_VERSION>-<digest of the rule files>". Cached for the lifetime of the process,
+    like the compiled scoring plans; call get_scoring_version.cache_clear() after editing rules.
+    """
+    rules_dir = get_env_variable("SCORING_RULES_DIR", DEFAULT_RULES_DIR)
+    digest = hashlib.blake2b(digest_size=8)
+    for name in sorted(os.listdir(rules_dir)):
+        path = os.path.join(rules_dir, name)
+        if os.path.isfile(path):
+            digest.update(name.encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return f"{SCORING_CODE_VERSION}-{digest.hexdigest()}"
+
+
+def _canonical(value: Any) -> str:
+    # The same text whether a value came from an upload or back from the database
+    # (None/NaN -> "", 50.0 -> "50")
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def inputs_digest(leads: pd.DataFrame, signals: pd.Series) -> pd.Series:
+    """
+    Digest (32 hex characters) of each lead's INPUT_FIELDS and its market signal headline
+    (signals, aligned with leads; None for no signal). Missing columns count as empty values.
+    """
+    columns = [leads[field].astype(object).map(_canonical) if field in leads.columns
+               else pd.Series("", index=leads.index) for field in INPUT_FIELDS]
+    columns.append(signals.astype(object).map(_canonical))
+    joined = columns[0].str.cat(columns[1:], sep="\x1f")
+    return joined.map(lambda text: hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest())
+
+
+def _update_params(frame: pd.DataFrame, digests: pd.Series, version: str) -> List[Dict[str, Any]]:
+    scored_at = datetime.now(timezone.utc)
+    values = [frame[field].astype(object).where(frame[field].notna(), None).tolist() for field in OUTPUT_FIELDS]
+    return [
+        dict(zip(OUTPUT_FIELDS, row), id=lead_id, scoring_version=version, scoring_inputs_hash=digest,
+             scored_at=scored_at)
+        for lead_id, digest, *row in zip(frame["id"].tolist(), digests.tolist(), *values)
+    ]
+
+
+def recompute_scores(db: Session, batch_size: int = DEFAULT_BATCH_SIZE, force: bool = False,
+                     executor: Optional[PipelineExecutor] = None) -> Dict[str, Any]:
+    """
+    Recomputes the OUTPUT_FIELDS of every lead whose scoring version or inputs changed since
+    it was last scored (all leads with force=True). Each batch is read, scored and written in
+    its own transaction; an interrupted run keeps the finished batches and the next run picks
+    up the rest.
+
+    Args:
+        db: Session bound to the leads database.
+        batch_size: Leads read (and at most written) per transaction.
+        force: Recompute every lead regardless of version and inputs.
+        executor: Pipeline to score with (default: the rule-based default_stages()).
+
+    Returns:
+        dict: version, scanned, refreshed, unchanged, batches and seconds.
+    """
+    start = time.perf_counter()
+    version = get_scoring_version()
+    intelligence = LeadIntelligenceAgent()
+    scanner = MarketSignalScanner()
+    executor = executor or PipelineExecutor(default_stages(scanner=scanner))
+    columns = [Lead.id] + [getattr(Lead, field) for field in INPUT_FIELDS] + [Lead.scoring_version,
+                                                                              Lead.scoring_inputs_hash]
+    report = {"version": version, "scanned": 0, "refreshed": 0, "unchanged": 0, "batches": 0}
+    last_id = None
+    while True:
+        query = select(*columns).order_by(Lead.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(Lead.id > last_id)
+        batch = pd.DataFrame(db.execute(query).mappings().all(), columns=[column.key for column in columns])
+        if batch.empty:
+            break
+        last_id = int(batch["id"].iloc[-1])
+        # Each lead's signal headline depends on its company and (enriched) industry
+        industry = intelligence.enrich_lead_batch(batch)["industry"]
+        digests = inputs_digest(batch, scanner.lead_signal_batch(batch.assign(industry=industry)))
+        stale = (batch["scoring_version"] != version) | (batch["scoring_inputs_hash"] != digests)
+        if force:
+            stale[:] = True
+        report["scanned"] += len(batch)
+        report["batches"] += 1
+        if stale.any():
+            scored = executor.run_frame(batch[stale].reset_index(drop=True), outputs=OUTPUT_FIELDS).records
+            try:
+                db.execute(update(Lead), _update_params(scored, digests[stale], version))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            report["refreshed"] += int(stale.sum())
+        else:
+            # End the read transaction so a long run holds no snapshot between batches
+            db.commit()
+    report["unchanged"] = report["scanned"] - report["refreshed"]
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def main():
+    from app.services.db_service import SessionLocal, get_engine
+
+    parser = argparse.ArgumentParser(description="Recompute stale lead scores in DATABASE_URL.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--force", action="store_true", help="Recompute every lead.")
+    args = parser.parse_args()
+    with SessionLocal(bind=get_engine()) as db:
+        report = recompute_scores(db, args.batch_size, args.force)
+    print(f"Scoring version {report['version']}: {report['refreshed']:,} of {report['scanned']:,} leads "
+          f"refreshed in {report['batches']} batches ({report['seconds']:.2f}s).")
+
+
+if __name__ == "__main__":
+    main()
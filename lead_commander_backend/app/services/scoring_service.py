@@ -0,0 +1,580 @@
+"""
+scoring_service.py
+------------------
+Declarative, compiled lead scoring shared by the /optimize endpoint and LeadIntelligenceAgent.
+
+Rule sets are JSON documents (see app/rules/) loaded once and compiled into a ScoringPlan.
+A plan evaluates the same rules either over whole DataFrame columns (score_frame) or over
+a single lead dict (score_record), so every rule set gets the columnar path for free.
+
+Rule set format:
+    {
+      "name": "optimize",
+      "version": 1,
+      "normalize": {"divisor": 100, "min": 0, "max": 100},   # optional
+      "fields": [
+        {
+          "field": "title",           # lead field / DataFrame column
+          "weight": 30,               # multiplier for the tier score (default 1)
+          "coerce": "float",          # "float" or "int" for threshold operators (default "float")
+          "missing": 0.0,             # optional score for null or falsy values
+          "nan_is_value": false,      # score NaN like Python's float nan (truthy, text "nan")
+                                      # instead of as null (default false)
+          "tiers": [                  # checked in order, first match wins
+            {"op": "contains_any", "value": ["chief", "ceo"], "score": 1.0},
+            {"op": "domain_suffix_in", "value_file": "free_domains.txt", "score": 0.3}
+          ],
+          "default": 0.1              # score when no tier matches (default 0)
+        }
+      ]
+    }
+
+Operators:
+    eq            value == target
+    gt, gte,
+    lt, lte       numeric threshold after coercion; unconvertible values never match
+    contains_any  lower-cased text contains any of the targets
+    not_contains  text does not contain the target
+    domain_in     lower-cased email domain (after the last "@") contains any of the targets
+    domain_suffix_in
+                  lower-cased email domain is one of the targets or a subdomain of one
+                  (hashed lookup, so lists of thousands of domains cost nothing extra)
+
+List operators take either "value" (a list) or "value_file" (one term per line, resolved
+relative to the rule set's directory). Consecutive contains_any tiers of a field are fused
+into one precompiled KeywordClassifier (see app/services/matchers.py).
+
+A field's score is weight * tier score; the lead score is the sum over fields, optionally
+floor-divided by normalize.divisor and clipped to [normalize.min, normalize.max].
+Null values (None/NaN) never match an operator. With "nan_is_value", a field treats NaN
+(but not None) as the value float("nan") instead, the way plain Python checks such as
+`if value:` or `str(value)` see it.
+
+- get_scoring_plan: Loads and compiles a named rule set (cached per process).
+- score_leads: Scores a DataFrame with a named rule set (the /optimize rules by default).
+- select_top: Returns the top-K rows by score in O(n) using partial selection instead of a full sort.
+- score_lead_row: Reference per-row implementation of the original /optimize rules.
+"""
+
+import json
+import math
+import operator
+import os
+import re
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from app.config import get_env_variable
+from app.services.column_ops import truthy
+from app.services.matchers import DomainSet, KeywordClassifier, load_terms
+
+DEFAULT_RULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules")
+_RULE_SET_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+_COMPARISONS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+_TEXT_LIST_OPERATORS = ("contains_any", "domain_in", "domain_suffix_in")
+OPERATORS = ("eq", "not_contains") + tuple(_COMPARISONS) + _TEXT_LIST_OPERATORS
+
+
+class ScoringPlan:
+    """
+    A rule set compiled for both columnar and single-record evaluation.
+    """
+
+    def __init__(self, rule_set: Dict, base_dir: Optional[str] = None):
+        """
+        Compiles a rule set dictionary. Raises ValueError if the definition is invalid.
+        base_dir resolves "value_file" paths (default: the rules directory).
+        """
+        fields = rule_set.get("fields")
+        if not isinstance(fields, list) or not fields:
+            raise ValueError("Rule set must define a non-empty 'fields' list.")
+        self.name = rule_set.get("name", "custom")
+        self.version = rule_set.get("version", 1)
+        base_dir = base_dir or get_env_variable("SCORING_RULES_DIR", DEFAULT_RULES_DIR)
+        self.fields = [_FieldRule(definition, base_dir) for definition in fields]
+        self._fields_by_name = {rule.field: rule for rule in self.fields}
+
+        normalize = rule_set.get("normalize")
+        if normalize is not None:
+            if not normalize.get("divisor"):
+                raise ValueError("normalize.divisor must be a non-zero number.")
+            self._normalize = (normalize["divisor"], normalize.get("min", 0), normalize.get("max", 100))
+        else:
+            self._normalize = None
+        self.integral = self._normalize is not None or all(rule.integral for rule in self.fields)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScoringPlan":
+        """
+        Loads and compiles a rule set from a JSON file.
+        """
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle), base_dir=os.path.dirname(os.path.abspath(path)))
+
+    def score_record(self, record: Dict):
+        """
+        Scores a single lead dict (or pandas Series).
+
+        Returns:
+            int when the rule set is integral or normalized, otherwise float.
+        """
+        score = 0
+        for rule in self.fields:
+            score += rule.factor(record.get(rule.field)) * rule.weight
+        if self._normalize is not None:
+            divisor, low, high = self._normalize
+            return int(min(high, max(low, score // divisor)))
+        return score
+
+    def score_frame(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Scores every row of a DataFrame with whole-column operations.
+        Produces the same values as calling score_record on each row.
+
+        Returns:
+            pd.Series: Scores aligned with df.index.
+        """
+        total = np.zeros(len(df), dtype=np.int64 if self.integral and self._normalize is None else float)
+        for rule in self.fields:
+            total += rule.factors(df) * rule.weight
+        if self._normalize is not None:
+            divisor, low, high = self._normalize
+            total = np.clip(np.floor_divide(total, divisor), low, high).astype(np.int64)
+        return pd.Series(total, index=df.index)
+
+    def field_factor(self, field_name: str, field_value) -> float:
+        """
+        Returns the (unweighted) tier score a single field value earns, or 0.0 for unknown fields.
+        """
+        rule = self._fields_by_name.get(field_name)
+        return rule.factor(field_value) if rule is not None else 0.0
+
+
+@lru_cache(maxsize=None)
+def get_scoring_plan(name: str = "optimize") -> ScoringPlan:
+    """
+    Loads the named rule set from SCORING_RULES_DIR (default: app/rules/) and compiles it.
+    Plans are cached for the lifetime of the process; call get_scoring_plan.cache_clear() to reload.
+
+    Raises:
+        ValueError: If the name is invalid or no such rule set exists.
+    """
+    if not _RULE_SET_NAME.match(name or ""):
+        raise ValueError(f"Invalid scoring rule set name: {name!r}")
+    path = os.path.join(get_env_variable("SCORING_RULES_DIR", DEFAULT_RULES_DIR), f"{name}.json")
+    if not os.path.isfile(path):
+        raise ValueError(f"Unknown scoring rule set: {name}")
+    return ScoringPlan.from_file(path)
+
+
+def score_leads(df: pd.DataFrame, rules: str = "optimize") -> pd.Series:
+    """
+    Scores every lead in a DataFrame without iterating over rows.
+
+    Args:
+        df (pd.DataFrame): Leads, one row per lead.
+        rules (str): Name of the rule set to apply.
+
+    Returns:
+        pd.Series: Scores aligned with df.index, named "Score".
+    """
+    return get_scoring_plan(rules).score_frame(df).rename("Score")
+
+
+def select_top(df: pd.DataFrame, limit: Optional[int] = None, min_score: Optional[float] = None,
+               column: str = "Score") -> pd.DataFrame:
+    """
+    Returns the rows with the highest scores, sorted by score descending.
+
+    Uses np.partition to find the K-th largest score in linear time, so only the K selected
+    rows are sorted. Ties keep their input order, including at the cut-off, so the result is
+    the same as the first K rows of a stable descending sort.
+
+    Args:
+        df (pd.DataFrame): Scored leads.
+        limit (int, optional): Maximum number of rows to return (None = no limit).
+        min_score (float, optional): Drop rows scoring below this value.
+        column (str): Score column.
+
+    Returns:
+        pd.DataFrame: At most limit rows of df, best first.
+    """
+    scores = df[column].to_numpy()
+    positions = np.arange(len(df))
+    if min_score is not None:
+        keep = scores >= min_score
+        positions, scores = positions[keep], scores[keep]
+
+    if limit is not None and limit < len(positions):
+        if limit <= 0:
+            return df.iloc[:0]
+        kth = len(scores) - limit
+        threshold = np.partition(scores, kth)[kth]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:limit - len(above)]
+        chosen = np.sort(np.concatenate([above, ties]))
+        positions, scores = positions[chosen], scores[chosen]
+
+    order = np.argsort(-scores, kind="stable")
+    return df.iloc[positions[order]]
+
+
+def score_lead_row(row) -> int:
+    """
+    Scores a single lead row (dict or pandas Series) one field at a time.
+    This is the original /optimize rule set and the reference for app/rules/optimize.json.
+    """
+    score = 0
+    # Field: Lead Source
+    if row.get("Lead Source") == "Organic Search":
+        score += 20
+    if row.get("Lead Source") == "Direct Traffic":
+        score += 15
+    if row.get("Lead Source") == "Olark Chat":
+        score += 10
+    # Field: TotalVisits
+    try:
+        if float(row.get("TotalVisits", 0)) > 3:
+            score += 10
+    except Exception:
+        pass
+    # Field: Total Time Spent on Website
+    try:
+        if float(row.get("Total Time Spent on Website", 0)) > 300:
+            score += 15
+    except Exception:
+        pass
+    # Field: Lead Profile
+    if row.get("Lead Profile") == "Potential Lead":
+        score += 25
+    # Field: Asymmetrique Activity Score
+    try:
+        if float(row.get("Asymmetrique Activity Score", 0)) > 15:
+            score += 10
+    except Exception:
+        pass
+    # Field: Asymmetrique Profile Score
+    try:
+        if float(row.get("Asymmetrique Profile Score", 0)) > 15:
+            score += 10
+    except Exception:
+        pass
+    # Field: Last Notable Activity
+    if row.get("Last Notable Activity") == "Email Opened":
+        score += 15
+    return score
+
+
+class _FieldRule:
+    """
+    Compiled rule for one field: ordered tiers plus missing/default scores.
+    """
+
+    def __init__(self, definition: Dict, base_dir: str):
+        if "field" not in definition:
+            raise ValueError("Every field rule needs a 'field' name.")
+        self.field = definition["field"]
+        self.weight = definition.get("weight", 1)
+        self.coerce = definition.get("coerce", "float")
+        if self.coerce not in ("float", "int"):
+            raise ValueError(f"{self.field}: coerce must be 'float' or 'int'.")
+        self.missing = definition.get("missing")
+        self.nan_is_value = bool(definition.get("nan_is_value", False))
+        self.default = definition.get("default", 0)
+        self.tiers = [_Tier(self.field, tier, base_dir) for tier in definition.get("tiers", [])]
+        self.steps = _fuse_keyword_tiers(self.tiers)
+        scores = [self.weight, self.default] + [tier.score for tier in self.tiers]
+        if self.missing is not None:
+            scores.append(self.missing)
+        self.integral = all(isinstance(value, int) for value in scores)
+
+    def factor(self, value):
+        """
+        Tier score for a single value.
+        """
+        if _is_absent(value, self.missing is not None) and not (self.nan_is_value and _is_nan(value)):
+            return self.missing if self.missing is not None else self.default
+        view = _ValueView(value, self.coerce)
+        for step in self.steps:
+            score = step.score_for(view)
+            if score is not None:
+                return score
+        return self.default
+
+    def factors(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Tier scores for a whole column; missing columns behave like absent values.
+        """
+        absent_score = self.missing if self.missing is not None else self.default
+        dtype = np.int64 if self.integral else float
+        if self.field not in df.columns:
+            return np.full(len(df), absent_score, dtype=dtype)
+
+        view = _ColumnView(df[self.field], self.coerce)
+        present = view.present(falsy_is_missing=self.missing is not None)
+        if self.nan_is_value:
+            present |= view.nans()
+        result = np.where(present, self.default, absent_score).astype(dtype)
+        unassigned = present.copy()
+        for step in self.steps:
+            matched, scores = step.scores_column(view)
+            hit = unassigned & matched
+            result[hit] = scores[hit] if isinstance(scores, np.ndarray) else scores
+            unassigned &= ~hit
+        return result
+
+
+class _Tier:
+    """
+    One predicate and the score it awards.
+    """
+
+    def __init__(self, field: str, definition: Dict, base_dir: str):
+        self.op = definition.get("op")
+        if self.op not in OPERATORS:
+            raise ValueError(f"{field}: unknown operator {self.op!r} (expected one of {', '.join(OPERATORS)}).")
+        if self.op in _TEXT_LIST_OPERATORS and "value_file" in definition:
+            try:
+                definition = dict(definition, value=load_terms(os.path.join(base_dir, definition["value_file"])))
+            except OSError as e:
+                raise ValueError(f"{field}: cannot read value_file: {e}")
+        if "value" not in definition or "score" not in definition:
+            raise ValueError(f"{field}: every tier needs a 'value' and a 'score'.")
+        self.score = definition["score"]
+        target = definition["value"]
+        if self.op in _COMPARISONS:
+            self.target = float(target)
+        elif self.op in _TEXT_LIST_OPERATORS:
+            if isinstance(target, str) or not isinstance(target, list):
+                raise ValueError(f"{field}: {self.op} expects a list of strings.")
+            self.target = tuple(str(item).lower() for item in target)
+            self.pattern = "|".join(re.escape(item) for item in self.target) if self.target else None
+            if self.op == "domain_suffix_in":
+                self.domains = DomainSet(self.target)
+        elif self.op == "not_contains":
+            self.target = str(target)
+        else:
+            self.target = target
+
+    def score_for(self, view: "_ValueView"):
+        return self.score if self.matches(view) else None
+
+    def scores_column(self, view: "_ColumnView"):
+        return self.matches_column(view), self.score
+
+    def matches(self, view: "_ValueView") -> bool:
+        if self.op == "eq":
+            return view.value == self.target
+        if self.op in _COMPARISONS:
+            return _COMPARISONS[self.op](view.number, self.target)
+        if self.op == "contains_any":
+            return any(item in view.lowered for item in self.target)
+        if self.op == "domain_in":
+            return any(item in view.domain for item in self.target)
+        if self.op == "domain_suffix_in":
+            return self.domains.matches(view.domain)
+        return self.target not in view.text
+
+    def matches_column(self, view: "_ColumnView") -> np.ndarray:
+        if self.op == "eq":
+            return _mask(view.series.eq(self.target))
+        if self.op in _COMPARISONS:
+            return _COMPARISONS[self.op](view.numbers, self.target)
+        if self.op == "domain_suffix_in":
+            return self.domains.matches_column(view.domain)
+        if self.op in _TEXT_LIST_OPERATORS:
+            if self.pattern is None:
+                return np.zeros(len(view.series), dtype=bool)
+            text = view.lowered if self.op == "contains_any" else view.domain
+            return _mask(text.str.contains(self.pattern, regex=True))
+        return ~_mask(view.text.str.contains(self.target, regex=False), fill=True)
+
+
+class _KeywordTiers:
+    """
+    Consecutive contains_any tiers of a field, evaluated together by one KeywordClassifier.
+    """
+
+    def __init__(self, tiers):
+        self.classifier = KeywordClassifier([tier.target for tier in tiers])
+        self.scores = [tier.score for tier in tiers]
+        self._score_array = np.array(self.scores + [0])
+
+    def score_for(self, view: "_ValueView"):
+        code = self.classifier.classify(view.lowered)
+        return self.scores[code] if code >= 0 else None
+
+    def scores_column(self, view: "_ColumnView"):
+        codes = self.classifier.classify_column(view.lowered)
+        return codes >= 0, self._score_array[codes]
+
+
+def _fuse_keyword_tiers(tiers):
+    """
+    Replaces every run of two or more consecutive contains_any tiers with one _KeywordTiers.
+    """
+    steps, run = [], []
+    for tier in tiers + [None]:
+        if tier is not None and tier.op == "contains_any":
+            run.append(tier)
+            continue
+        steps.extend([_KeywordTiers(run)] if len(run) > 1 else run)
+        run = []
+        if tier is not None:
+            steps.append(tier)
+    return steps
+
+
+class _ValueView:
+    """
+    Lazily derived representations of a single field value.
+    """
+
+    def __init__(self, value: Any, coerce: str):
+        self.value = value
+        self.coerce = coerce
+
+    @cached_property
+    def number(self) -> float:
+        return _to_int(self.value) if self.coerce == "int" else _to_float(self.value)
+
+    @cached_property
+    def text(self) -> str:
+        return str(self.value)
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def domain(self) -> str:
+        return self.text.split("@")[-1].lower()
+
+
+class _ColumnView:
+    """
+    Lazily derived representations of a DataFrame column, shared by all tiers of a field.
+    """
+
+    def __init__(self, series: pd.Series, coerce: str):
+        self.series = series
+        self.coerce = coerce
+
+    def present(self, falsy_is_missing: bool) -> np.ndarray:
+        present = self.series.notna().to_numpy(dtype=bool)
+        if falsy_is_missing:
+            present = present & truthy(self.series)
+        return present
+
+    def nans(self) -> np.ndarray:
+        # Float NaN elements (float columns, or NaN mixed into object columns); None and pd.NA excluded
+        nans = np.zeros(len(self.series), dtype=bool)
+        nulls = np.flatnonzero(self.series.isna().to_numpy(dtype=bool))
+        if len(nulls):
+            nans[nulls] = [_is_nan(value) for value in self.series.iloc[nulls]]
+        return nans
+
+    @cached_property
+    def numbers(self) -> np.ndarray:
+        return _as_int(self.series) if self.coerce == "int" else _as_float(self.series)
+
+    @cached_property
+    def text(self) -> pd.Series:
+        return self.series.astype(str)
+
+    @cached_property
+    def lowered(self) -> pd.Series:
+        return self.text.str.lower()
+
+    @cached_property
+    def domain(self) -> pd.Series:
+        # Text after the last "@" (the whole value if there is none), like str.split("@")[-1]
+        return self.text.str.replace(r"(?s)^.*@", "", regex=True).str.lower()
+
+
+def _mask(result: pd.Series, fill: bool = False) -> np.ndarray:
+    """
+    Converts a (possibly nullable) boolean Series into a plain NumPy mask.
+    """
+    return result.fillna(fill).to_numpy(dtype=bool)
+
+
+def _is_absent(value: Any, falsy_is_missing: bool) -> bool:
+    """
+    True for None/NaN/pd.NA, and for falsy values ("", 0, False) when falsy_is_missing is set.
+    """
+    if value is None or value is pd.NA:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    if falsy_is_missing:
+        try:
+            return not value
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _is_nan(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    """
+    Converts a column to float64 with float() semantics.
+
+    Numeric columns are converted directly. Text columns go through pd.to_numeric first,
+    and only the values it rejects are retried with Python's float(), so inputs such as
+    "1_000" or "Infinity" behave exactly as in the per-row rules. Anything float() cannot
+    parse becomes NaN, which fails every threshold comparison.
+    """
+    if is_numeric_dtype(series) or is_bool_dtype(series):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+
+    values = np.array(pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan))
+    retry = np.isnan(values) & series.notna().to_numpy(dtype=bool)
+    if retry.any():
+        values[retry] = [_to_float(v) for v in series.to_numpy(dtype=object)[retry]]
+    return values
+
+
+def _as_int(series: pd.Series) -> np.ndarray:
+    """
+    Converts a column with int() semantics (truncation; "5.5" is rejected), as float64 with NaN for failures.
+    Text columns are converted once per distinct value.
+    """
+    if is_numeric_dtype(series) or is_bool_dtype(series):
+        values = np.trunc(series.to_numpy(dtype=float, na_value=np.nan))
+        values[~np.isfinite(values)] = np.nan
+        return values
+    try:
+        codes, uniques = pd.factorize(series)
+    except TypeError:
+        return np.array([_to_int(value) for value in series], dtype=float)
+    converted = np.array([_to_int(value) for value in uniques] + [np.nan], dtype=float)
+    return converted[codes]
+
+
+def _to_float(value) -> float:
+    """
+    float(value), or NaN when the value cannot be converted.
+    """
+    try:
+        return float(value)
+    except Exception:
+        return np.nan
+
+
+def _to_int(value) -> float:
+    """
+    int(value) as a float, or NaN when the value cannot be converted.
+    """
+    try:
+        return float(int(value))
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
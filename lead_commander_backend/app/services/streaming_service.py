@@ -0,0 +1,155 @@
+"""
+streaming_service.py
+--------------------
+Bounded-memory scoring for large CSV uploads.
+
+The CSV is read in fixed-size chunks; each chunk is scored, sorted by Score and spilled to a
+temporary file as a sorted run. The runs are then merged lazily, at most MAX_MERGE_FAN_IN at a
+time (larger uploads first merge groups of runs into longer runs on disk), so only one chunk plus a
+small read buffer per merged run is ever held in memory, regardless of the size of the upload.
+
+- iter_scored_chunks: Reads and scores a CSV one chunk at a time.
+- spill_sorted_runs: Scores a CSV and writes each chunk to disk as a run sorted by Score (descending).
+- merge_sorted_runs: Lazily merges spilled runs into a single stream of lead dicts.
+- top_scored_rows: Keeps only the top-K rows by Score across chunks (O(chunk + K) memory).
+"""
+
+import heapq
+import pickle
+import tempfile
+from typing import IO, Iterator, List, Optional
+
+import pandas as pd
+
+from app.config import get_env_variable
+from app.services.scoring_service import score_leads, select_top
+
+# Rows read from the CSV per chunk (the dominant term in peak memory)
+DEFAULT_CHUNK_SIZE = int(get_env_variable("OPTIMIZE_CHUNK_SIZE", 100_000))
+# Rows pickled per batch inside a spilled run (and buffered per run while merging)
+SPILL_BATCH_ROWS = 1_000
+# Runs merged at once; more runs are first merged in groups, so merge buffers stay bounded
+MAX_MERGE_FAN_IN = 16
+
+
+def iter_scored_chunks(source, chunksize: int = DEFAULT_CHUNK_SIZE, rules: str = "optimize",
+                       min_score: Optional[float] = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV (path or file object) in chunks and yields each chunk with a Score column.
+    Column dtypes are inferred per chunk, so a column that is numeric in one chunk may be
+    text in another; scoring coerces values the same way in both cases.
+    If min_score is given, rows scoring below it are dropped from each chunk.
+
+    Raises:
+        ValueError: If chunksize is not positive or the rule set does not exist.
+        pandas.errors.ParserError / EmptyDataError: If the CSV cannot be parsed.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    with pd.read_csv(source, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk["Score"] = score_leads(chunk, rules=rules)
+            if min_score is not None:
+                chunk = chunk[chunk["Score"] >= min_score]
+            yield chunk
+
+
+def spill_sorted_runs(source, chunksize: int = DEFAULT_CHUNK_SIZE, rules: str = "optimize",
+                      min_score: Optional[float] = None) -> List[IO[bytes]]:
+    """
+    Scores a CSV chunk by chunk and spills every chunk to a temporary file, sorted by Score descending.
+    Ties keep their upload order. The returned files are rewound and ready for merge_sorted_runs.
+    """
+    runs = []
+    try:
+        for chunk in iter_scored_chunks(source, chunksize=chunksize, rules=rules, min_score=min_score):
+            chunk = chunk.sort_values("Score", ascending=False, kind="stable")
+            run = tempfile.TemporaryFile()
+            runs.append(run)
+            for start in range(0, len(chunk), SPILL_BATCH_ROWS):
+                batch = chunk.iloc[start:start + SPILL_BATCH_ROWS].to_dict(orient="records")
+                pickle.dump(batch, run, protocol=pickle.HIGHEST_PROTOCOL)
+            run.seek(0)
+    except Exception:
+        for run in runs:
+            run.close()
+        raise
+    return runs
+
+
+def merge_sorted_runs(runs: List[IO[bytes]]) -> Iterator[dict]:
+    """
+    Merges spilled runs into one stream of lead dicts sorted by Score descending.
+    Ties are emitted in upload order. The run files are closed once the stream ends or is closed.
+    """
+    runs = list(runs)
+    try:
+        while len(runs) > MAX_MERGE_FAN_IN:
+            # Consecutive groups, so ties still come out in upload order
+            merged = []
+            try:
+                for start in range(0, len(runs), MAX_MERGE_FAN_IN):
+                    merged.append(_merge_to_run(runs[start:start + MAX_MERGE_FAN_IN]))
+            except Exception:
+                for run in merged:
+                    run.close()
+                raise
+            for run in runs:
+                run.close()
+            runs = merged
+        yield from _merge_runs(runs)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def top_scored_rows(source, limit: int, min_score: Optional[float] = None,
+                    chunksize: int = DEFAULT_CHUNK_SIZE, rules: str = "optimize") -> pd.DataFrame:
+    """
+    Scores a CSV chunk by chunk and returns only the best `limit` rows, sorted by Score descending.
+
+    Each chunk is reduced with select_top and merged into the running top-K, so time is linear
+    in the number of rows and memory is bounded by one chunk plus K rows. Ties keep upload order.
+    """
+    top = None
+    for chunk in iter_scored_chunks(source, chunksize=chunksize, rules=rules, min_score=min_score):
+        candidates = select_top(chunk, limit=limit)
+        top = candidates if top is None else select_top(pd.concat([top, candidates]), limit=limit)
+    return top if top is not None else pd.DataFrame()
+
+
+def _merge_runs(runs: List[IO[bytes]]) -> Iterator[dict]:
+    return heapq.merge(*(_read_run(run) for run in runs), key=lambda row: -row["Score"])
+
+
+def _merge_to_run(runs: List[IO[bytes]]) -> IO[bytes]:
+    """
+    Merges runs into one new spilled run, rewound for reading.
+    """
+    merged = tempfile.TemporaryFile()
+    try:
+        batch = []
+        for row in _merge_runs(runs):
+            batch.append(row)
+            if len(batch) == SPILL_BATCH_ROWS:
+                pickle.dump(batch, merged, protocol=pickle.HIGHEST_PROTOCOL)
+                batch = []
+        if batch:
+            pickle.dump(batch, merged, protocol=pickle.HIGHEST_PROTOCOL)
+        merged.seek(0)
+    except Exception:
+        merged.close()
+        raise
+    return merged
+
+
+def _read_run(run: IO[bytes]) -> Iterator[dict]:
+    """
+    Yields the rows of one spilled run, one pickled batch at a time.
+    """
+    while True:
+        try:
+            batch = pickle.load(run)
+        except EOFError:
+            return
+        yield from batch
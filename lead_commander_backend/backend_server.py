@@ -1,11 +1,49 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import pandas as pd
 import io
+import os
+from itertools import chain
+
+from app.services.columnar_io import (
+    ARROW_FILE_MIMETYPE,
+    ARROW_STREAM_MIMETYPE,
+    COLUMNAR_MIMETYPES,
+    PARQUET_MIMETYPE,
+    mimetype_for_filename,
+    read_frame,
+    write_frame,
+)
+from app.services.pipeline_service import PipelineExecutor
+from app.services.parallel_scoring import score_parallel
+from app.services.scoring_service import select_top
+from app.services.streaming_service import (
+    DEFAULT_CHUNK_SIZE,
+    iter_scored_chunks,
+    merge_sorted_runs,
+    spill_sorted_runs,
+    top_scored_rows,
+)
 
 app = Flask(__name__)
 CORS(app)
 
+# Agent pipeline shared by all requests (agents are stateless)
+pipeline = PipelineExecutor()
+
+# Opt-in streaming response format: one JSON document per line, sent with chunked transfer
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Response formats negotiated from the Accept header (JSON first, so */* keeps returning JSON)
+RESPONSE_MIMETYPES = ["application/json", NDJSON_MIMETYPE, PARQUET_MIMETYPE, ARROW_STREAM_MIMETYPE, ARROW_FILE_MIMETYPE]
+# ?format= shortcuts for clients that cannot set Accept
+FORMAT_ALIASES = {
+    "json": "application/json",
+    "ndjson": NDJSON_MIMETYPE,
+    "parquet": PARQUET_MIMETYPE,
+    "arrow": ARROW_STREAM_MIMETYPE,
+    "arrow_file": ARROW_FILE_MIMETYPE,
+}
+
 # Dummy data for leads
 DUMMY_LEADS = [
     {
@@ -46,72 +84,279 @@ DUMMY_LEADS = [
     }
 ]
 
+def _query_flag(name: str) -> bool:
+    """
+    True if a query parameter is set to 1/true/yes.
+    """
+    return request.args.get(name, "").lower() in ("1", "true", "yes")
+
+def _json_array(rows, buffer_size=64 * 1024):
+    """
+    Serializes an iterable of rows as a single JSON array, yielding it in ~64KB pieces
+    so the full response body is never held in memory.
+    """
+    buffer, size = ["["], 1
+    for i, row in enumerate(rows):
+        item = ("," if i else "") + app.json.dumps(row)
+        buffer.append(item)
+        size += len(item)
+        if size >= buffer_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    buffer.append("]")
+    yield "".join(buffer)
+
+def _response_format() -> str:
+    """
+    Media type for the response: ?format= if given, otherwise the best match for the Accept header.
+    """
+    alias = request.args.get("format")
+    if alias in FORMAT_ALIASES:
+        return FORMAT_ALIASES[alias]
+    return request.accept_mimetypes.best_match(RESPONSE_MIMETYPES) or "application/json"
+
+def _wants_ndjson() -> bool:
+    """
+    True if the client asked for NDJSON (Accept: application/x-ndjson or ?format=ndjson).
+    """
+    return _response_format() == NDJSON_MIMETYPE
+
+def _ndjson(rows, buffer_size=64 * 1024):
+    """
+    Serializes an iterable of rows as newline-delimited JSON, yielding ~64KB pieces.
+    """
+    buffer, size = [], 0
+    for row in rows:
+        line = app.json.dumps(row) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+def _ndjson_response(rows):
+    """
+    Streams rows as an NDJSON response. No Content-Length is set, so the body is sent chunked.
+    """
+    return Response(_ndjson(rows), mimetype=NDJSON_MIMETYPE)
+
+def _frame_rows(frames, batch_rows=1000):
+    """
+    Yields lead dicts from one or more DataFrames, converting a small slice at a time
+    instead of building the full list of records.
+    """
+    for df in frames:
+        for start in range(0, len(df), batch_rows):
+            yield from df.iloc[start:start + batch_rows].to_dict(orient="records")
+
+def _detach_upload(file):
+    """
+    Returns a binary stream for an uploaded file that stays readable after the request ends
+    (Werkzeug closes request.files before a streamed response body is generated).
+    Spooled uploads get a duplicated file descriptor; in-memory ones are copied.
+    The caller owns the returned stream and must close it.
+    """
+    stream = file.stream
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return io.BytesIO(stream.read())
+    return os.fdopen(os.dup(fd), "rb")
+
+def _selection_args():
+    """
+    Parses the optional ?limit= (top-K) and ?min_score= query parameters.
+    Raises ValueError for malformed values.
+    """
+    limit = request.args.get("limit")
+    min_score = request.args.get("min_score")
+    try:
+        limit = int(limit) if limit is not None else None
+        min_score = float(min_score) if min_score is not None else None
+    except ValueError:
+        raise ValueError("limit must be an integer and min_score a number.")
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be zero or a positive integer.")
+    return limit, min_score
+
+def _rows_response(df):
+    """
+    Returns rows as a JSON array, NDJSON, Parquet or Arrow IPC, depending on what the client asked for.
+    """
+    mimetype = _response_format()
+    if mimetype in COLUMNAR_MIMETYPES:
+        try:
+            return Response(write_frame(df, mimetype), mimetype=mimetype)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 406
+    if mimetype == NDJSON_MIMETYPE:
+        return _ndjson_response(_frame_rows([df]))
+    return jsonify(df.to_dict(orient="records"))
+
+def _read_leads():
+    """
+    Reads a batch of leads from the request body: a JSON list, a CSV/Parquet/Arrow file upload,
+    or a raw Parquet/Arrow IPC body. Returns (DataFrame, None) or (None, error response).
+    """
+    try:
+        if request.mimetype == "application/json":
+            return pd.DataFrame(request.get_json()), None
+        if request.mimetype in COLUMNAR_MIMETYPES:
+            return read_frame(request.get_data(), request.mimetype), None
+        if request.mimetype == "multipart/form-data":
+            if "file" not in request.files:
+                return None, (jsonify({"error": "No file uploaded"}), 400)
+            file = request.files["file"]
+            columnar_type = mimetype_for_filename(file.filename)
+            if columnar_type is not None:
+                return read_frame(file.read(), columnar_type), None
+            return pd.read_csv(file), None
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+    return None, (jsonify({"error": "Unsupported content type"}), 400)
+
+def _optimize_top(file, limit, min_score):
+    """
+    Top-K mode for /optimize CSV uploads: scores the file in chunks and keeps only the best
+    `limit` rows, so time is O(n) and memory is one chunk plus K rows.
+    """
+    try:
+        chunksize = int(request.args.get("chunksize", DEFAULT_CHUNK_SIZE))
+        top = top_scored_rows(file, limit, min_score=min_score, chunksize=chunksize,
+                              rules=request.args.get("rules", "optimize"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _rows_response(top)
+
+def _optimize_ndjson(file, min_score):
+    """
+    NDJSON mode for /optimize CSV uploads: rows are emitted in upload order as each chunk is scored.
+    The first chunk is read before responding so parse errors still return a 400.
+    """
+    upload = _detach_upload(file)
+    try:
+        chunksize = int(request.args.get("chunksize", DEFAULT_CHUNK_SIZE))
+        chunks = iter_scored_chunks(upload, chunksize=chunksize,
+                                    rules=request.args.get("rules", "optimize"), min_score=min_score)
+        first = next(chunks, None)
+    except ValueError as e:
+        upload.close()
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        upload.close()
+        raise
+    frames = chain([first], chunks) if first is not None else []
+    response = _ndjson_response(_frame_rows(frames))
+    # The detached upload outlives the request: close it once the body is sent or the client goes away
+    response.call_on_close(upload.close)
+    return response
+
+def _optimize_stream(file, min_score):
+    """
+    Streaming mode for /optimize CSV uploads: scores the file in bounded chunks, spills sorted
+    runs to disk and streams the merged result, so memory stays flat regardless of file size.
+    """
+    try:
+        chunksize = int(request.args.get("chunksize", DEFAULT_CHUNK_SIZE))
+        runs = spill_sorted_runs(file, chunksize=chunksize, rules=request.args.get("rules", "optimize"),
+                                 min_score=min_score)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(_json_array(merge_sorted_runs(runs)), mimetype="application/json")
+
 @app.route('/get_leads', methods=['GET'])
 def get_leads():
+    if _wants_ndjson():
+        return _ndjson_response(DUMMY_LEADS)
     return jsonify(DUMMY_LEADS)
 
+@app.route('/export_leads', methods=['GET', 'POST'])
+def export_leads():
+    # Batch export: GET returns the lead book, POST converts a posted batch (JSON, CSV, Parquet or Arrow).
+    # The output format follows the Accept header or ?format=json|ndjson|parquet|arrow|arrow_file.
+    if request.method == "GET":
+        return _rows_response(pd.DataFrame(DUMMY_LEADS))
+    df, error = _read_leads()
+    if error is not None:
+        return error
+    return _rows_response(df)
+
 @app.route('/optimize_pipeline', methods=['POST'])
 def optimize_pipeline():
-    return jsonify({"message": "Pipeline optimized successfully"})
+    # Run the agent pipeline over posted leads; ?outputs=a,b limits it to the stages those fields need
+    outputs = request.args.get("outputs")
+    outputs = [field.strip() for field in outputs.split(",") if field.strip()] if outputs else None
+
+    # File uploads and Parquet/Arrow bodies run column by column; timings go in the Server-Timing header
+    if request.mimetype == "multipart/form-data" or request.mimetype in COLUMNAR_MIMETYPES:
+        df, error = _read_leads()
+        if error is not None:
+            return error
+        try:
+            result = pipeline.run_frame(df, outputs=outputs)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except TypeError:
+            return jsonify({"error": "Leads must have valid field types."}), 400
+        response = _rows_response(result.records)
+        if isinstance(response, Response):
+            response.headers["Server-Timing"] = ", ".join(
+                f"{name};dur={seconds * 1000:.3f}" for name, seconds in result.timings.items()
+            )
+        return response
+
+    leads = request.get_json(silent=True)
+    if not isinstance(leads, list):
+        return jsonify({"message": "Pipeline optimized successfully"})
+    try:
+        result = pipeline.run(leads, outputs=outputs)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except (TypeError, AttributeError):
+        return jsonify({"error": "Leads must be objects with valid field types."}), 400
+    return jsonify({
+        "message": "Pipeline optimized successfully",
+        "leads": result.records,
+        "timings_ms": {name: round(seconds * 1000, 3) for name, seconds in result.timings.items()},
+    })
 
 @app.route('/optimize', methods=['POST'])
 def optimize():
-    # Accept JSON (list of leads) or CSV file upload
-    if request.content_type and "application/json" in request.content_type:
-        leads = request.get_json()
-        df = pd.DataFrame(leads)
-    elif request.content_type and "multipart/form-data" in request.content_type:
-        if "file" not in request.files:
-            return jsonify({"error": "No file uploaded"}), 400
-        file = request.files["file"]
-        df = pd.read_csv(file)
-    else:
-        return jsonify({"error": "Unsupported content type"}), 400
-
-    # Scoring rules
-    def score_lead(row):
-        score = 0
-        # Field: Lead Source
-        if row.get("Lead Source") == "Organic Search":
-            score += 20
-        if row.get("Lead Source") == "Direct Traffic":
-            score += 15
-        if row.get("Lead Source") == "Olark Chat":
-            score += 10
-        # Field: TotalVisits
-        try:
-            if float(row.get("TotalVisits", 0)) > 3:
-                score += 10
-        except Exception:
-            pass
-        # Field: Total Time Spent on Website
-        try:
-            if float(row.get("Total Time Spent on Website", 0)) > 300:
-                score += 15
-        except Exception:
-            pass
-        # Field: Lead Profile
-        if row.get("Lead Profile") == "Potential Lead":
-            score += 25
-        # Field: Asymmetrique Activity Score
-        try:
-            if float(row.get("Asymmetrique Activity Score", 0)) > 15:
-                score += 10
-        except Exception:
-            pass
-        # Field: Asymmetrique Profile Score
-        try:
-            if float(row.get("Asymmetrique Profile Score", 0)) > 15:
-                score += 10
-        except Exception:
-            pass
-        # Field: Last Notable Activity
-        if row.get("Last Notable Activity") == "Email Opened":
-            score += 15
-        return score
-
-    df["Score"] = df.apply(score_lead, axis=1)
-    # Return as JSON, sorted by Score descending
+    # Optional top-K selection: ?limit=K returns only the best K leads, ?min_score=S drops the rest
+    try:
+        limit, min_score = _selection_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Large CSV uploads are scored chunk by chunk: top-K, NDJSON responses and ?stream=1 (optionally ?chunksize=N)
+    file = request.files.get("file") if request.mimetype == "multipart/form-data" else None
+    if file is not None and mimetype_for_filename(file.filename) is None:
+        if limit is not None:
+            return _optimize_top(file, limit, min_score)
+        if _wants_ndjson():
+            return _optimize_ndjson(file, min_score)
+        if _query_flag("stream") and _response_format() == "application/json":
+            return _optimize_stream(file, min_score)
+
+    # Accept JSON (list of leads), a CSV/Parquet/Arrow file upload or a Parquet/Arrow IPC body
+    df, error = _read_leads()
+    if error is not None:
+        return error
+
+    # Scoring rules come from app/rules/<rules>.json (tunable per customer via SCORING_RULES_DIR)
+    try:
+        df["Score"] = score_parallel(df, rules=request.args.get("rules", "optimize"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if limit is not None or min_score is not None:
+        return _rows_response(select_top(df, limit=limit, min_score=min_score))
+    # NDJSON rows are emitted in input order; the JSON array is sorted by Score descending
+    if _wants_ndjson():
+        return _ndjson_response(_frame_rows([df]))
+    if _response_format() in COLUMNAR_MIMETYPES:
+        return _rows_response(df.sort_values("Score", ascending=False))
     result = df.sort_values("Score", ascending=False).to_dict(orient="records")
     return jsonify(result)
 
@@ -124,6 +369,8 @@ def generate_coaching():
     # Return dummy coaching tips for each lead in the posted data, or a generic message if no data
     leads = request.get_json(silent=True)
     if isinstance(leads, list):
+        if _wants_ndjson():
+            return _ndjson_response(dict(lead, coaching_tip="Keep momentum high") for lead in leads)
         for lead in leads:
             lead["coaching_tip"] = "Keep momentum high"
         return jsonify(leads)
@@ -0,0 +1,133 @@
+"""
+bench_agents.py
+---------------
+Benchmarks the per-lead agent methods against their DataFrame batch methods and checks that
+both give identical results (the per-lead methods run on leads.to_dict(orient="records")).
+tests/test_agent_batches.py checks the same parity on edge-case frames.
+Also compares the fused pipeline in dict mode (run) and column mode (run_frame).
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_agents.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.automation_agent import AutomationAgent  # noqa: E402
+from app.agents.coaching_agent import CoachingAgent  # noqa: E402
+from app.agents.lead_risk_agent import LeadRiskAgent  # noqa: E402
+from app.agents.ltv_agent import LtvAgent  # noqa: E402
+from app.agents.pipeline_optimization_agent import ACTIONS, PipelineOptimizationAgent  # noqa: E402
+from app.agents.revenue_forecasting_agent import RevenueForecastingAgent  # noqa: E402
+from app.services.pipeline_service import PipelineExecutor  # noqa: E402
+
+
+def make_leads(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic leads with the fields the agents read, including NaN probabilities,
+    missing emails and fractional scores so the boundary cases are exercised.
+    """
+    rng = np.random.default_rng(seed)
+    win_probability = rng.integers(0, 100, rows).astype(float)
+    win_probability[::53] = np.nan
+    score = rng.integers(0, 101, rows).astype(float)
+    score[::7] += 0.5
+    score[::61] = np.nan
+    email = rng.choice(["a@acme.com", "b@gmail.com", "", None], rows)
+    return pd.DataFrame({
+        "email": email,
+        "title": rng.choice(["CEO", "VP Sales", "Manager", "Analyst"], rows),
+        "phone": rng.choice(["555-0100", None], rows),
+        "company_size": rng.integers(1, 5000, rows),
+        "score": score,
+        "win_probability": win_probability,
+        "market_signal_detected": rng.choice([True, False], rows),
+        "recommended_action": rng.choice(ACTIONS + ["Unknown"], rows),
+    })
+
+
+def scalar_column(records, method, field):
+    return [method(lead)[field] for lead in records]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def check(name, expected, actual):
+    expected = pd.Series(expected)
+    actual = pd.Series(list(actual))
+    if not expected.equals(actual):
+        raise SystemExit(f"{name}: batch results differ from the per-lead method.")
+
+
+def bench(rows: int):
+    leads = make_leads(rows)
+    records, to_dict_seconds = timed(lambda: leads.to_dict(orient="records"))
+    coaching, optimizer, automation = CoachingAgent(), PipelineOptimizationAgent(), AutomationAgent()
+    forecaster, risk, ltv = RevenueForecastingAgent(), LeadRiskAgent(), LtvAgent()
+
+    cases = [
+        ("coaching_tip",
+         lambda: scalar_column(records, coaching.generate_coaching_tip, "coaching_tip"),
+         lambda: coaching.generate_coaching_tip_batch(leads)),
+        ("recommended_action",
+         lambda: scalar_column(records, optimizer.recommend_action, "recommended_action"),
+         lambda: optimizer.recommend_action_batch(leads)),
+        ("automation_status",
+         lambda: scalar_column(records, automation.execute_action, "automation_status"),
+         lambda: automation.execute_action_batch(leads)),
+        ("win_probability",
+         lambda: scalar_column(records, forecaster.forecast, "win_probability"),
+         lambda: forecaster.forecast_batch(leads)["win_probability"]),
+        ("estimated_revenue",
+         lambda: scalar_column(records, forecaster.forecast, "estimated_revenue"),
+         lambda: forecaster.forecast_batch(leads)["estimated_revenue"]),
+        ("risk_score",
+         lambda: [risk.run(lead) for lead in records],
+         lambda: risk.run_batch(leads)),
+        ("ltv",
+         lambda: [ltv.run(lead) for lead in records],
+         lambda: ltv.run_batch(leads)),
+    ]
+    print(f"{rows:,} leads (to_dict: {to_dict_seconds:.3f}s)")
+    for name, scalar, batch in cases:
+        expected, scalar_seconds = timed(scalar)
+        actual, batch_seconds = timed(batch)
+        check(name, expected, actual)
+        print(f"  {name:<20} per-lead {scalar_seconds:8.3f}s  batch {batch_seconds:8.4f}s  "
+              f"{scalar_seconds / max(batch_seconds, 1e-9):8.1f}x")
+
+    executor = PipelineExecutor()
+    inputs = leads[["email", "title", "phone", "company_size"]]
+    input_records = inputs.to_dict(orient="records")
+    by_dict, dict_seconds = timed(lambda: executor.run(input_records))
+    by_frame, frame_seconds = timed(lambda: executor.run_frame(inputs))
+    expected = pd.DataFrame(by_dict.records)
+    try:
+        pd.testing.assert_frame_equal(expected, by_frame.records[expected.columns], check_dtype=False)
+    except AssertionError:
+        raise SystemExit("Pipeline run_frame differs from run.")
+    print(f"  {'pipeline':<20} run      {dict_seconds:8.3f}s  run_frame {frame_seconds:8.4f}s  "
+          f"{dict_seconds / max(frame_seconds, 1e-9):8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    for rows in args.sizes:
+        bench(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_batch_insights.py
+-----------------------
+Compares one-at-a-time insight generation with the concurrent, rate-limited batch path
+(InsightSummarizationAgent.agenerate_insights) against the local fake completion server,
+which adds latency and answers a share of requests with 429. Checks that every summary comes
+back for the right lead despite retries, and that concurrency never exceeds the configured bound.
+The batch is then repeated with --pack-size leads per request, and the request and token
+reduction of each batch is printed.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_batch_insights.py --leads 500 --unique 200 --latency 0.05 --concurrency 32 \
+        --rate-limit-ratio 0.1 --pack-size 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.insight_agent import InsightSummarizationAgent  # noqa: E402
+from app.services.llm_cache import LLMResponseCache  # noqa: E402
+from app.services.openai_service import OpenAIService  # noqa: E402
+from fake_completion_server import FakeCompletionServer, expected_content  # noqa: E402
+
+
+def make_leads(rows: int, unique: int) -> list:
+    titles = ["CEO", "VP Sales", "Director of IT", "Manager", "Analyst"]
+    return [
+        {"name": f"Lead {i % unique}", "company": f"Company {i % unique}", "company_size": 50 + i % unique,
+         "title": titles[i % unique % len(titles)], "email": f"lead{i % unique}@company{i % unique}.com",
+         "industry": "Technology"}
+        for i in range(rows)
+    ]
+
+
+def print_report(report: dict):
+    print(f"             {report['requests_sent']:,} of {report['requests_naive']:,} requests "
+          f"({report['duplicates_collapsed']:,} duplicates collapsed, {report['fallbacks']} fallbacks), "
+          f"prompt tokens {report['prompt_tokens_naive']:,} -> {report['prompt_tokens_sent']:,} "
+          f"(-{report['token_reduction']:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=500)
+    parser.add_argument("--unique", type=int, default=200, help="Distinct leads in the book.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake server latency per request (seconds).")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.1, help="Share of requests answered with 429.")
+    parser.add_argument("--rpm", type=float, default=0, help="Requests-per-minute budget (0 = unlimited).")
+    parser.add_argument("--tpm", type=float, default=0, help="Tokens-per-minute budget (0 = unlimited).")
+    parser.add_argument("--sequential", type=int, default=50, help="Leads for the one-at-a-time baseline.")
+    parser.add_argument("--pack-size", type=int, default=8, help="Leads per request in the packed run.")
+    args = parser.parse_args()
+    leads = make_leads(args.leads, args.unique)
+    server = FakeCompletionServer(latency=args.latency, rate_limit_ratio=args.rate_limit_ratio, seed=0).start()
+    try:
+        service = OpenAIService(api_key="test-key", base_url=server.base_url, max_concurrency=args.concurrency,
+                                requests_per_minute=args.rpm or None, tokens_per_minute=args.tpm or None)
+
+        # Baseline: one awaited request at a time, extrapolated to the full book
+        agent = InsightSummarizationAgent(service, cache=LLMResponseCache())
+        subset = leads[:args.sequential]
+        start = time.perf_counter()
+        for lead in subset:
+            service.run_sync(agent.agenerate_insights([lead]))
+        per_lead = (time.perf_counter() - start) / max(len(subset), 1)
+        print(f"sequential   {per_lead * len(leads):8.2f}s (estimated from {len(subset)} leads)")
+
+        agent = InsightSummarizationAgent(service, cache=LLMResponseCache())
+        server.requests = server.rate_limited = server.max_in_flight = 0
+        start = time.perf_counter()
+        summaries = agent.generate_insights(leads)
+        seconds = time.perf_counter() - start
+        print(f"batch        {seconds:8.2f}s  {server.requests:,} requests, {server.rate_limited:,} answered 429, "
+              f"peak {server.max_in_flight} in flight")
+        print_report(agent.last_batch_report)
+
+        expected = [expected_content(agent._build_prompt(lead)) for lead in leads]
+        if summaries != expected:
+            raise SystemExit("Batch summaries are missing or out of order.")
+        if server.max_in_flight > args.concurrency:
+            raise SystemExit("More requests in flight than max_concurrency.")
+        start = time.perf_counter()
+        agent.generate_insights(leads)
+        print(f"cached rerun {time.perf_counter() - start:8.2f}s")
+
+        agent = InsightSummarizationAgent(service, cache=LLMResponseCache())
+        server.requests = server.rate_limited = 0
+        start = time.perf_counter()
+        summaries = agent.generate_insights(leads, pack_size=args.pack_size)
+        print(f"packed x{args.pack_size:<3} {time.perf_counter() - start:8.2f}s  {server.requests:,} requests, "
+              f"{server.rate_limited:,} answered 429")
+        print_report(agent.last_batch_report)
+        if summaries != expected:
+            raise SystemExit("Packed summaries are missing or out of order.")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
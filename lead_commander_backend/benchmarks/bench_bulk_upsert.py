@@ -0,0 +1,97 @@
+"""
+bench_bulk_upsert.py
+--------------------
+Loads a synthetic scored lead file into a local SQLite database with the bulk upsert path
+(app/services/lead_ingest.py), then re-loads it with changed scores and new leads, and checks
+the table against the input. A one-ORM-add-per-row load of a small sample is timed for comparison.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_bulk_upsert.py --rows 1000000 --chunk-size 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models.lead import Base, Lead  # noqa: E402
+from app.services.lead_ingest import upsert_leads  # noqa: E402
+
+ACTIONS = np.array(["Move to Contract Stage", "Schedule Follow-Up Call", "Send Discount Offer",
+                    "Nurture — Low Priority"], dtype=object)
+
+
+def make_scored(rows: int, offset: int = 0, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ids = np.arange(offset, offset + rows)
+    return pd.DataFrame({
+        "name": [f"Lead {i}" for i in ids],
+        "email": [f"lead{i}@company{i % 5000}.com" for i in ids],
+        "company": [f"Company {i % 5000}" for i in ids],
+        "score": rng.integers(0, 101, rows).astype(float),
+        "win_probability": rng.uniform(0, 100, rows).round(1),
+        "market_signal_detected": rng.random(rows) < 0.2,
+        "recommended_action": ACTIONS[rng.integers(0, len(ACTIONS), rows)],
+        "risk_score": rng.random(rows).round(3),
+        # Fields that are not Lead columns are ignored by the upsert
+        "summary": "Scored lead",
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--orm-sample", type=int, default=5_000, help="Rows for the per-row ORM baseline.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'leads.sqlite3')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        scored = make_scored(args.rows)
+        with Session() as db:
+            report = upsert_leads(db, scored, args.chunk_size)
+        print(f"initial load  {report['seconds']:7.2f}s  {report['upserted']:,} rows in {report['chunks']} chunks "
+              f"({report['upserted'] / report['seconds']:,.0f} rows/s)")
+
+        # Re-score half of the book and add 10% new leads
+        half = args.rows // 2
+        changed = make_scored(half, seed=1)
+        new = make_scored(args.rows // 10, offset=args.rows, seed=2)
+        with Session() as db:
+            report = upsert_leads(db, pd.concat([changed, new], ignore_index=True), args.chunk_size)
+            print(f"upsert        {report['seconds']:7.2f}s  {report['upserted']:,} rows "
+                  f"({len(changed):,} updated, {len(new):,} new)")
+            total = db.scalar(select(func.count()).select_from(Lead))
+            if total != args.rows + len(new):
+                raise SystemExit(f"Expected {args.rows + len(new):,} leads, found {total:,}.")
+            sample = [0, half - 1, half, args.rows - 1]
+            stored = dict(db.execute(select(Lead.email, Lead.score)
+                                     .where(Lead.email.in_(scored["email"].iloc[sample].tolist()))).all())
+            expected = pd.concat([changed, scored.iloc[half:]], ignore_index=True).set_index("email")["score"]
+            if any(stored[email] != expected[email] for email in stored):
+                raise SystemExit("Upserted scores do not match the input.")
+
+        orm_rows = make_scored(args.orm_sample, offset=10 * args.rows).to_dict(orient="records")
+        with Session() as db:
+            start = time.perf_counter()
+            for row in orm_rows:
+                db.add(Lead(**{key: value for key, value in row.items() if key != "summary"}))
+                db.commit()
+            seconds = time.perf_counter() - start
+        print(f"ORM per row   {seconds:7.2f}s  {args.orm_sample:,} rows "
+              f"(~{seconds / args.orm_sample * args.rows / 60:,.1f} min for {args.rows:,})")
+
+
+if __name__ == "__main__":
+    main()
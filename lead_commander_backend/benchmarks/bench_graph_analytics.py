@@ -0,0 +1,92 @@
+"""
+bench_graph_analytics.py
+------------------------
+Times the relationship graph analytics (app/services/graph_analytics.py) on a large synthetic
+lead set, and checks components and intro paths against a plain edge-by-edge BFS on a sample.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_graph_analytics.py --leads 100000 --sample 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.relationship_mapping_agent import RelationshipMappingAgent  # noqa: E402
+from app.services import graph_analytics  # noqa: E402
+
+
+def make_leads(rows: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    # Many small industries and locations, so the graph has several components
+    industries = rng.integers(0, max(rows // 40, 1), rows)
+    locations = rng.integers(0, max(rows // 20, 1), rows)
+    return [{"id": position, "industry": f"Industry {industry}", "location": f"City {location}"}
+            for position, (industry, location) in enumerate(zip(industries, locations))]
+
+
+def edge_bfs(graph, source):
+    # Reference BFS over expanded edges: hop distance per reachable lead
+    distance = {source: 0}
+    queue = deque([source])
+    while queue:
+        lead = queue.popleft()
+        for other in graph.neighbors(lead).tolist():
+            if other not in distance:
+                distance[other] = distance[lead] + 1
+                queue.append(other)
+    return distance
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=2_000, help="Leads for the reference check.")
+    args = parser.parse_args()
+    agent = RelationshipMappingAgent()
+
+    sample = agent.build_graph(make_leads(args.sample, seed=1))
+    components = graph_analytics.connected_components(sample)
+    for source in range(0, args.sample, max(args.sample // 20, 1)):
+        distance = edge_bfs(sample, source)
+        if set(np.flatnonzero(components == components[source]).tolist()) != set(distance):
+            raise SystemExit("connected_components differs from the reference BFS.")
+        target = args.sample - 1 - source
+        path = graph_analytics.shortest_path(sample, source, target)
+        if (path is None) != (target not in distance) or (path is not None and len(path) - 1 != distance[target]):
+            raise SystemExit("shortest_path differs from the reference BFS.")
+
+    graph, build_seconds = timed(lambda: agent.build_graph(make_leads(args.leads)))
+    print(f"{args.leads:,} leads, {graph.edge_count() // 2:,} connections (build {build_seconds:.3f}s)")
+    steps = [
+        ("connected_components", lambda: graph_analytics.connected_components(graph)),
+        ("label_propagation", lambda: graph_analytics.label_propagation(graph)),
+        ("degree_centrality", lambda: graph_analytics.degree_centrality(graph)),
+        ("pagerank", lambda: graph_analytics.pagerank(graph)),
+        ("shortest_path", lambda: graph_analytics.shortest_path(graph, 0, args.leads - 1)),
+    ]
+    for name, step in steps:
+        result, seconds = timed(step)
+        if name in ("connected_components", "label_propagation"):
+            detail = f"{int(result.max()) + 1:,} groups"
+        elif name == "shortest_path":
+            detail = f"{len(result) - 1} hops" if result is not None else "not connected"
+        else:
+            detail = ""
+        print(f"  {name:<22} {seconds:8.3f}s  {detail}")
+
+
+if __name__ == "__main__":
+    main()
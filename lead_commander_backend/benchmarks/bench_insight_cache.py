@@ -0,0 +1,81 @@
+"""
+bench_insight_cache.py
+----------------------
+Measures InsightSummarizationAgent over a synthetic lead book twice against a stub completion
+service with a fixed per-call latency: the first run fills the LLM response cache, the second
+(unchanged book) should make no calls. A third run with a fresh process-like cache reads the
+SQLite tier only.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_insight_cache.py --leads 20000 --unique 2000 --latency 0.002
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.insight_agent import InsightSummarizationAgent  # noqa: E402
+from app.services.llm_cache import LLMResponseCache  # noqa: E402
+
+
+class StubCompletionService:
+    """
+    Stands in for OpenAIService: sleeps for the given latency and counts calls.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_completion(self, prompt: str, model: str = "gpt-4") -> str:
+        self.calls += 1
+        time.sleep(self.latency)
+        return f"Summary #{self.calls} for a {len(prompt)}-character prompt."
+
+
+def make_leads(rows: int, unique: int) -> list:
+    titles = ["CEO", "VP Sales", "Director of IT", "Manager", "Analyst"]
+    return [
+        {
+            "name": f"Lead {i % unique}", "company": f"Company {i % unique}", "company_size": 50 + i % unique,
+            "title": titles[i % len(titles)], "email": f"lead{i % unique}@company{i % unique}.com",
+            "industry": "Technology", "employee_size": "Medium",
+        }
+        for i in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=20_000)
+    parser.add_argument("--unique", type=int, default=2_000, help="Distinct leads in the book.")
+    parser.add_argument("--latency", type=float, default=0.002, help="Stub completion latency (seconds).")
+    args = parser.parse_args()
+    leads = make_leads(args.leads, args.unique)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "llm_responses.sqlite3")
+        runs = [("cold", LLMResponseCache(path=path)), ("warm", None), ("restart", LLMResponseCache(path=path))]
+        service = StubCompletionService(args.latency)
+        cache = None
+        for name, fresh_cache in runs:
+            cache = fresh_cache or cache
+            agent = InsightSummarizationAgent(service, cache=cache)
+            calls_before = service.calls
+            start = time.perf_counter()
+            for lead in leads:
+                agent.generate_insight(lead)
+            seconds = time.perf_counter() - start
+            print(f"{name:<8} {seconds:8.3f}s  {service.calls - calls_before:>7,} API calls  "
+                  f"hit rate {cache.stats()['hit_rate']:.3f}")
+        cache.close()
+        runs[0][1].close()
+    print(f"uncached estimate: {args.leads * args.latency:.1f}s of API latency per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+bench_market_signals.py
+-----------------------
+Benchmarks market signal detection on a synthetic headline corpus:
+
+- general signal: the nested headline x keyword loop vs HeadlineIndex.first_signal
+- company signals: scanning every headline per lead vs HeadlineIndex.first_signal_mentioning
+
+and checks that both give the same headlines.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_market_signals.py --headlines 20000 --leads 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.market_signal_scanner import MarketSignalScanner  # noqa: E402
+from app.services.headline_index import HeadlineIndex, tokenize  # noqa: E402
+
+TEMPLATES = [
+    "{company} announces global expansion into {region}.",
+    "{company} shares flat after quarterly results.",
+    "{company} forms strategic partnership with {other}.",
+    "Analysts weigh {company} outlook for {region}.",
+    "{company} completes M&A deal with {other}.",
+    "{company} hires new leadership team.",
+]
+
+
+def make_corpus(headlines: int, companies: list, rng) -> list:
+    regions = ["Europe", "Asia", "Latin America", "the Midwest"]
+    picks = rng.integers(0, len(companies), (headlines, 2))
+    templates = rng.integers(0, len(TEMPLATES), headlines)
+    return [
+        TEMPLATES[t].format(company=companies[a], other=companies[b], region=regions[(a + b) % len(regions)])
+        for t, (a, b) in zip(templates, picks)
+    ]
+
+
+def nested_first_signal(headlines, keywords):
+    # The original per-lead scan
+    for headline in headlines:
+        for keyword in keywords:
+            if keyword.lower() in headline.lower():
+                return headline
+    return None
+
+
+def linear_company_signal(headlines, keywords, company):
+    phrase = " " + " ".join(tokenize(company)) + " "
+    for headline in headlines:
+        if phrase in " " + " ".join(tokenize(headline)) + " " and any(k.lower() in headline.lower() for k in keywords):
+            return headline
+    return None
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--headlines", type=int, default=20_000)
+    parser.add_argument("--leads", type=int, default=5_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    companies = [f"Company{i} Systems" for i in range(2_000)]
+    corpus = make_corpus(args.headlines, companies, rng)
+    keywords = MarketSignalScanner().keywords
+    lead_companies = [companies[i] for i in rng.integers(0, len(companies), args.leads)]
+
+    index, build_seconds = timed(lambda: HeadlineIndex(corpus, keywords))
+    print(f"{args.headlines:,} headlines, {args.leads:,} leads (index build {build_seconds:.3f}s, once per refresh)")
+
+    expected, loop_seconds = timed(lambda: [nested_first_signal(corpus, keywords) for _ in range(args.leads)])
+    actual, index_seconds = timed(lambda: [index.first_signal() for _ in range(args.leads)])
+    if actual != expected:
+        raise SystemExit("HeadlineIndex.first_signal differs from the nested loop.")
+    print(f"  general signal      loop {loop_seconds:8.3f}s  index {index_seconds:8.4f}s  "
+          f"{loop_seconds / max(index_seconds, 1e-9):10.1f}x")
+
+    sample = lead_companies[:min(args.leads, 200)]
+    expected, loop_seconds = timed(lambda: [linear_company_signal(corpus, keywords, c) for c in sample])
+    actual, index_seconds = timed(lambda: [index.first_signal_mentioning(c) for c in sample])
+    if actual != expected:
+        raise SystemExit("HeadlineIndex.first_signal_mentioning differs from the linear scan.")
+    print(f"  company signal      scan {loop_seconds / len(sample) * 1e3:8.3f}ms/lead  "
+          f"index {index_seconds / len(sample) * 1e3:8.4f}ms/lead  {loop_seconds / max(index_seconds, 1e-9):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+bench_optimize_scoring.py
+-------------------------
+Benchmarks /optimize scoring: the per-row df.apply rules against the columnar score_leads,
+and a full sort against select_top for ?limit= requests.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_optimize_scoring.py --rows 500000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.scoring_service import score_lead_row, score_leads, select_top  # noqa: E402
+
+
+def make_leads(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a synthetic CRM export with the columns the /optimize rules look at.
+    A few numeric cells are dirty strings so the float() fallback path is exercised.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Lead Source": rng.choice(["Organic Search", "Direct Traffic", "Olark Chat", "Google", None], rows),
+        "TotalVisits": rng.integers(0, 10, rows).astype(float),
+        "Total Time Spent on Website": rng.integers(0, 2000, rows),
+        "Lead Profile": rng.choice(["Potential Lead", "Select", "Other Leads", None], rows),
+        "Asymmetrique Activity Score": rng.integers(10, 20, rows).astype(float),
+        "Asymmetrique Profile Score": rng.integers(10, 20, rows).astype(object),
+        "Last Notable Activity": rng.choice(["Email Opened", "Modified", "SMS Sent"], rows),
+    })
+    df.loc[df.index[::97], "TotalVisits"] = np.nan
+    df.loc[df.index[::89], "Asymmetrique Profile Score"] = "n/a"
+    df.loc[df.index[::83], "Asymmetrique Profile Score"] = " 18 "
+    return df
+
+
+def rows_per_second(rows: int, seconds: float) -> float:
+    return rows / seconds if seconds > 0 else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows scored by the columnar engine.")
+    parser.add_argument("--apply-rows", type=int, default=50_000,
+                        help="Rows scored by df.apply (it is too slow to run on the full set).")
+    parser.add_argument("--limit", type=int, default=500, help="K for the top-K comparison.")
+    args = parser.parse_args()
+
+    df = make_leads(args.rows)
+    sample = df.iloc[:args.apply_rows]
+
+    start = time.perf_counter()
+    expected = sample.apply(score_lead_row, axis=1)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_leads(df)
+    columnar_seconds = time.perf_counter() - start
+
+    if not np.array_equal(scores.iloc[:args.apply_rows].to_numpy(), expected.to_numpy()):
+        raise SystemExit("Columnar scores differ from the per-row rules.")
+
+    before = rows_per_second(len(sample), apply_seconds)
+    after = rows_per_second(len(df), columnar_seconds)
+    print(f"df.apply(score_lead_row): {len(sample):>9,} rows in {apply_seconds:8.3f}s  {before:>14,.0f} rows/sec")
+    print(f"score_leads:              {len(df):>9,} rows in {columnar_seconds:8.3f}s  {after:>14,.0f} rows/sec")
+    print(f"speedup: {after / before:,.1f}x")
+
+    df["Score"] = scores
+    start = time.perf_counter()
+    expected_top = df.sort_values("Score", ascending=False, kind="stable").head(args.limit)
+    sort_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    top = select_top(df, limit=args.limit)
+    select_seconds = time.perf_counter() - start
+    if not top.index.equals(expected_top.index):
+        raise SystemExit("select_top differs from a stable full sort.")
+    print(f"top {args.limit}: full sort {sort_seconds * 1000:8.1f} ms, select_top {select_seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+bench_optimize_streaming.py
+---------------------------
+Pushes a synthetic multi-million-row CSV through the streaming /optimize path
+(chunked scoring, spilled sorted runs, merged JSON output) and checks peak memory.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_optimize_streaming.py --rows 3000000 --max-rss-mb 600
+
+Exits non-zero if the process peak RSS exceeds the ceiling.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_optimize_scoring import make_leads  # noqa: E402
+from backend_server import _json_array  # noqa: E402
+from app.services.streaming_service import merge_sorted_runs, spill_sorted_runs  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def write_csv(path: str, rows: int, batch_rows: int = 200_000):
+    """
+    Writes the synthetic CSV in batches so generating it does not dominate peak memory.
+    """
+    written = 0
+    while written < rows:
+        batch = make_leads(min(batch_rows, rows - written), seed=written)
+        batch.to_csv(path, mode="a", header=(written == 0), index=False)
+        written += len(batch)
+
+
+class CheckedRows:
+    """
+    Passes rows through while verifying they arrive in descending Score order and counting them.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        previous = float("inf")
+        for row in self.rows:
+            if row["Score"] > previous:
+                raise SystemExit("Streamed rows are not sorted by Score.")
+            previous = row["Score"]
+            self.count += 1
+            yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--max-rss-mb", type=float, default=600.0, help="Peak RSS ceiling for the whole process.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "leads.csv")
+        write_csv(path, args.rows)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"input: {args.rows:,} rows, {size_mb:,.0f} MB CSV; peak RSS after generation {peak_rss_mb():,.0f} MB")
+
+        start = time.perf_counter()
+        runs = spill_sorted_runs(path, chunksize=args.chunksize)
+        checked = CheckedRows(merge_sorted_runs(runs))
+        body_bytes = 0
+        with open(os.devnull, "w") as sink:
+            for piece in _json_array(checked):
+                body_bytes += len(piece)
+                sink.write(piece)
+        elapsed = time.perf_counter() - start
+
+    if checked.count != args.rows:
+        raise SystemExit(f"Expected {args.rows:,} rows, streamed {checked.count:,}.")
+    peak = peak_rss_mb()
+    print(f"streamed {body_bytes / (1024 * 1024):,.0f} MB of JSON in {elapsed:,.1f}s "
+          f"({args.rows / elapsed:,.0f} rows/sec); peak RSS {peak:,.0f} MB (ceiling {args.max_rss_mb:,.0f} MB)")
+    if peak > args.max_rss_mb:
+        raise SystemExit(f"Peak RSS {peak:,.0f} MB exceeded the {args.max_rss_mb:,.0f} MB ceiling.")
+
+
+if __name__ == "__main__":
+    main()
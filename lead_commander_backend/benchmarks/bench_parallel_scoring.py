@@ -0,0 +1,75 @@
+"""
+bench_parallel_scoring.py
+-------------------------
+Measures how sharded scoring and enrichment (app/services/parallel_scoring.py) scale with the
+number of worker processes, and checks that every run matches the single-process result.
+
+Run from lead_commander_backend/ (scaling is bounded by the cores on the machine):
+    python benchmarks/bench_parallel_scoring.py --rows 2000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.lead_intelligence_agent import LeadIntelligenceAgent  # noqa: E402
+from app.services import parallel_scoring  # noqa: E402
+from app.services.parallel_scoring import enrich_parallel, score_parallel, shutdown_pool  # noqa: E402
+from app.services.scoring_service import get_scoring_plan  # noqa: E402
+
+
+def make_leads(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic CRM leads with the fields LeadIntelligenceAgent reads.
+    """
+    rng = np.random.default_rng(seed)
+    titles = ["Chief Executive Officer", "VP of Sales", "Director, IT", "Sales Manager", "Analyst", None]
+    domains = ["gmail.com", "yahoo.com", "acmefinance.com", "techsoft.io", "healthplus.org", "example.com"]
+    return pd.DataFrame({
+        "title": rng.choice(titles, rows),
+        "email": [f"user{i}@{domain}" for i, domain in enumerate(rng.choice(domains, rows))],
+        "phone": rng.choice(["555-0100", ""], rows),
+        "company_size": rng.integers(1, 5000, rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    leads = make_leads(args.rows)
+    expected_scores = get_scoring_plan("lead_intelligence").score_frame(leads)
+    expected_enriched = LeadIntelligenceAgent().enrich_lead_batch(leads)
+    print(f"{args.rows:,} leads, {args.chunk_size:,} rows per shard, {os.cpu_count()} CPUs")
+
+    baseline = None
+    for workers in sorted(set(args.workers)):
+        # Warm the pool so process start-up is not counted
+        score_parallel(leads.iloc[:args.chunk_size * 2], rules="lead_intelligence", workers=workers,
+                       chunk_size=args.chunk_size)
+        start = time.perf_counter()
+        scores = score_parallel(leads, rules="lead_intelligence", workers=workers, chunk_size=args.chunk_size)
+        enriched = enrich_parallel(leads, workers=workers, chunk_size=args.chunk_size)
+        seconds = time.perf_counter() - start
+        if not scores.equals(expected_scores) or not enriched.equals(expected_enriched):
+            raise SystemExit(f"{workers} workers: results differ from the single-process run.")
+        # More than one worker must have gone through the pool, not the inline fallback
+        if workers > 1 and args.rows > args.chunk_size and parallel_scoring._pool_workers != workers:
+            raise SystemExit(f"{workers} workers: the batch was scored inline, not sharded.")
+        baseline = baseline or seconds
+        print(f"  {workers:>3} workers: {seconds:8.3f}s  {args.rows / seconds:>12,.0f} rows/sec  "
+              f"speedup {baseline / seconds:5.2f}x")
+    shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
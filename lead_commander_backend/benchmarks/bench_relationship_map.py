@@ -0,0 +1,126 @@
+"""
+bench_relationship_map.py
+-------------------------
+Benchmarks the hash-bucketed RelationshipMappingAgent against the former pairwise scan:
+
+- equivalence with the pairwise result on a small sample (including missing values and repeated ids)
+- build time, degree computation and edge count for a large upload, without expanding edges
+- time to expand the connection lists of a few leads on demand
+- streaming single-lead updates through RelationshipStore vs rebuilding the graph per change
+- persisting each update to the store's journal vs rewriting the whole snapshot
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_relationship_map.py --leads 50000 --sample 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agents.relationship_mapping_agent import RelationshipMappingAgent  # noqa: E402
+from app.services.relationship_store import RelationshipStore  # noqa: E402
+
+
+def pairwise_run(leads_list):
+    # The former O(n^2) implementation
+    relationships = {}
+    for lead in leads_list:
+        lead_id = lead.get("id")
+        connections = []
+        for other_lead in leads_list:
+            if other_lead["id"] != lead_id and (
+                lead.get("industry") == other_lead.get("industry") or
+                lead.get("location") == other_lead.get("location")
+            ):
+                connections.append(other_lead["id"])
+        relationships[lead_id] = {"connections": connections}
+    return relationships
+
+
+def make_leads(rows: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    industries = [f"Industry {i}" for i in range(40)] + [None]
+    locations = [f"City {i}" for i in range(400)] + [None, float("nan")]
+    leads = []
+    for position, (industry, location) in enumerate(zip(rng.integers(0, len(industries), rows),
+                                                        rng.integers(0, len(locations), rows))):
+        leads.append({
+            "id": position if position % 97 else position // 2,  # some repeated ids
+            "industry": industries[industry],
+            "location": locations[location],
+        })
+    return leads
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=50_000)
+    parser.add_argument("--sample", type=int, default=2_000, help="Leads for the pairwise comparison.")
+    args = parser.parse_args()
+    agent = RelationshipMappingAgent()
+
+    sample = make_leads(args.sample, seed=1)
+    expected, pairwise_seconds = timed(lambda: pairwise_run(sample))
+    actual, bucket_seconds = timed(lambda: agent.run(sample))
+    if list(expected) != list(actual) or expected != actual:
+        raise SystemExit("Bucketed relationship map differs from the pairwise scan.")
+    print(f"{args.sample:,} leads: pairwise {pairwise_seconds:.3f}s, bucketed (fully expanded) {bucket_seconds:.3f}s")
+
+    leads = make_leads(args.leads)
+    graph, build_seconds = timed(lambda: agent.build_graph(leads))
+    degrees, degree_seconds = timed(graph.degrees)
+    neighbors, expand_seconds = timed(lambda: [graph.connections(position) for position in range(100)])
+    print(f"{args.leads:,} leads: build {build_seconds:.3f}s, degrees {degree_seconds:.3f}s, "
+          f"{int(degrees.sum()):,} connections (not materialized)")
+    print(f"  expand 100 leads' connections: {expand_seconds:.3f}s "
+          f"({sum(map(len, neighbors)) / 100:,.0f} connections per lead)")
+    print(f"  pairwise estimate: {pairwise_seconds * (args.leads / args.sample) ** 2:,.0f}s")
+
+    store = RelationshipStore()
+    _, load_seconds = timed(lambda: store.upsert_many(leads))
+    rng = np.random.default_rng(2)
+    updates = [{"id": leads[position]["id"], "industry": f"Industry {industry}", "location": leads[position]["location"]}
+               for position, industry in zip(rng.integers(0, len(leads), 10_000), rng.integers(0, 40, 10_000))]
+    _, update_seconds = timed(lambda: store.upsert_many(updates))
+    check_ids = [update["id"] for update in updates[-20:]]
+    expected = agent.run_lazy(store.leads())
+    if any(store.connections(lead_id) != expected[lead_id]["connections"] for lead_id in check_ids):
+        raise SystemExit("RelationshipStore differs from a full rebuild.")
+    print(f"  store: load {load_seconds:.3f}s, {len(updates):,} streaming updates "
+          f"{update_seconds / len(updates) * 1e6:.1f}us each (full rebuild {build_seconds:.3f}s per change)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "relationships.json")
+        _, save_seconds = timed(lambda: store.save(path))
+        persisted = RelationshipStore.open(path)
+
+        def journaled_updates():
+            # One flush per update, as the PUT route does per request
+            for update in updates:
+                persisted.upsert(update)
+                persisted.flush()
+
+        _, journal_seconds = timed(journaled_updates)
+        persisted.close()
+        reopened = RelationshipStore.open(path)
+        if any(reopened.connections(lead_id) != persisted.connections(lead_id) for lead_id in check_ids):
+            raise SystemExit("Reopened store differs from the journaled one.")
+        reopened.close()
+    print(f"  persisted: {journal_seconds / len(updates) * 1e6:.1f}us per journaled update "
+          f"(snapshot rewrite {save_seconds:.3f}s per change)")
+
+
+if __name__ == "__main__":
+    main()
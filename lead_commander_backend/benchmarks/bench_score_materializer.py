@@ -0,0 +1,129 @@
+"""
+bench_score_materializer.py
+---------------------------
+Loads synthetic leads into a local SQLite database, materializes their scores with the recompute
+job (app/services/score_materializer.py), re-runs it unchanged, then changes the inputs of a few
+leads and checks that only those are refreshed. The dashboard reads (top by score, one action
+by score, revenue per action) are timed against one full pipeline run over the table, and their
+query plans are checked to walk the composite indexes without a sort step.
+
+Run from lead_commander_backend/:
+    python benchmarks/bench_score_materializer.py --rows 200000 --changed 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models.lead import Base, Lead  # noqa: E402
+from app.services.lead_ingest import upsert_leads  # noqa: E402
+from app.services.lead_query import (  # noqa: E402
+    leads_page_query, list_leads, revenue_by_action, revenue_by_action_query,
+)
+from app.services.pipeline_service import PipelineExecutor, default_stages  # noqa: E402
+from app.services.score_materializer import INPUT_FIELDS, OUTPUT_FIELDS, recompute_scores  # noqa: E402
+
+TITLES = np.array(["CEO", "VP Sales", "Director of Marketing", "Manager", "Engineer", "Intern"], dtype=object)
+
+
+def make_leads(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    return pd.DataFrame({
+        "name": [f"Lead {i}" for i in ids],
+        "email": [f"lead{i}@company{i % 5000}.com" for i in ids],
+        "company": [f"Company {i % 5000}" for i in ids],
+        "company_size": rng.integers(1, 5000, rows),
+        "title": TITLES[rng.integers(0, len(TITLES), rows)],
+        "phone": np.where(rng.random(rows) < 0.7, "555-0100", None),
+    })
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def query_plan(db, statement) -> str:
+    compiled = statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    return " | ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all())
+
+
+def report_line(label: str, report) -> str:
+    return (f"{label:<14}{report['seconds']:7.2f}s  {report['refreshed']:,} of {report['scanned']:,} leads "
+            f"refreshed in {report['batches']} batches")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--changed", type=int, default=2_000, help="Leads whose inputs change before the last run.")
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'leads.sqlite3')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        leads = make_leads(args.rows)
+
+        with Session() as db:
+            upsert_leads(db, leads)
+            report = recompute_scores(db, args.batch_size)
+            print(report_line("first run", report))
+            if report["refreshed"] != args.rows:
+                raise SystemExit(f"Expected all {args.rows:,} leads scored, got {report['refreshed']:,}.")
+
+            report = recompute_scores(db, args.batch_size)
+            print(report_line("unchanged", report))
+            if report["refreshed"]:
+                raise SystemExit(f"Expected no refresh of an unchanged table, got {report['refreshed']:,}.")
+
+            # New titles for some leads; a re-upload of the same values for others changes nothing
+            changed = leads.sample(args.changed, random_state=1).assign(title="Chief Revenue Officer")
+            unchanged = leads.drop(changed.index).iloc[:args.changed]
+            upsert_leads(db, pd.concat([changed, unchanged], ignore_index=True))
+            report = recompute_scores(db, args.batch_size)
+            print(report_line("changed", report))
+            if report["refreshed"] != args.changed:
+                raise SystemExit(f"Expected {args.changed:,} leads refreshed, got {report['refreshed']:,}.")
+
+            # Stored outputs match a fresh pipeline run over the stored inputs
+            stored = pd.DataFrame(db.execute(
+                select(*(getattr(Lead, field) for field in ("id",) + INPUT_FIELDS + OUTPUT_FIELDS))
+            ).mappings().all())
+            pipeline = PipelineExecutor(default_stages())
+            fresh, seconds = timed(pipeline.run_frame, stored[["id", *INPUT_FIELDS]], OUTPUT_FIELDS)
+            for field in OUTPUT_FIELDS:
+                if not (fresh.records[field].to_numpy() == stored[field].to_numpy()).all():
+                    raise SystemExit(f"Stored {field} does not match a fresh pipeline run.")
+            print(f"\nfull agent run    {seconds * 1000:9.1f} ms  ({args.rows:,} leads, the per-view cost before)")
+
+            action = stored["recommended_action"].mode().iloc[0]
+            reads = [
+                ("top by score", leads_page_query(sort="score", limit=100)[0],
+                 lambda: list_leads(db, sort="score", limit=100)),
+                ("action by score", leads_page_query(sort="score", limit=100, recommended_actions=[action])[0],
+                 lambda: list_leads(db, sort="score", limit=100, recommended_actions=[action])),
+                ("revenue by action", revenue_by_action_query(), lambda: revenue_by_action(db)),
+            ]
+            for label, statement, read in reads:
+                _, seconds = timed(read)
+                plan = query_plan(db, statement)
+                print(f"{label:<18}{seconds * 1000:9.1f} ms  {plan}")
+                if "USING" not in plan or "TEMP B-TREE" in plan:
+                    raise SystemExit(f"{label}: expected an index walk without a sort step.")
+
+
+if __name__ == "__main__":
+    main()
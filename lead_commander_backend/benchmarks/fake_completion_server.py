@@ -0,0 +1,153 @@
+"""
+fake_completion_server.py
+-------------------------
+Local stand-in for the OpenAI chat completions endpoint, for exercising OpenAIService's batch
+path without network access or an API key.
+
+Each POST /chat/completions sleeps for the configured latency and then, with probability
+rate_limit_ratio, answers 429 with a Retry-After header; otherwise it answers with an
+OpenAI-shaped completion whose content is a digest of the prompt's "- " data lines, so callers
+can check that results come back in order. A packed prompt (labelled sections "L1:", "L2:", ...
+as built by app.services.prompt_batching.pack_prompt) is answered with a JSON object holding
+the digest of each section.
+
+Run standalone (from lead_commander_backend/):
+    python benchmarks/fake_completion_server.py --port 8089 --latency 0.2 --rate-limit-ratio 0.1
+and set OPENAI_BASE_URL=http://127.0.0.1:8089.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+_SECTION = re.compile(r"^(L\d+):\n((?:- .*\n?)+)", re.MULTILINE)
+
+
+def expected_content(prompt: str) -> str:
+    """
+    The completion text the fake server returns for a single-lead prompt (or one packed section).
+    """
+    data = "\n".join(line for line in prompt.splitlines() if line.startswith("- "))
+    return "summary:" + hashlib.sha1(data.encode("utf-8")).hexdigest()[:12]
+
+
+def completion_for(prompt: str) -> str:
+    sections = _SECTION.findall(prompt)
+    if sections:
+        return json.dumps({label: expected_content(block) for label, block in sections})
+    return expected_content(prompt)
+
+
+class FakeCompletionServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server with injected latency and 429s. Counts connections, requests and
+    rate-limit responses.
+    """
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.1, rate_limit_ratio: float = 0.0,
+                 retry_after: float = 0.05, seed: Optional[int] = None):
+        super().__init__(("127.0.0.1", port), _CompletionHandler)
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.counter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "FakeCompletionServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.counter_lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with server.counter_lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            limited = server.random.random() < server.rate_limit_ratio
+            if limited:
+                server.rate_limited += 1
+        try:
+            time.sleep(server.latency)
+            if limited:
+                self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                           {"Retry-After": str(server.retry_after)})
+                return
+            prompt = body["messages"][-1]["content"]
+            content = completion_for(prompt)
+            self._send(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+            })
+        finally:
+            with server.counter_lock:
+                server.in_flight -= 1
+
+    def _send(self, status: int, payload: dict, headers: Optional[dict] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.1)
+    parser.add_argument("--retry-after", type=float, default=0.05)
+    args = parser.parse_args()
+    server = FakeCompletionServer(args.port, args.latency, args.rate_limit_ratio, args.retry_after)
+    print(f"Fake completion server on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+conftest.py
+-----------
+Makes the app package importable when pytest runs from lead_commander_backend/ or the repo root.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,124 @@
+"""
+test_agent_batches.py
+---------------------
+Every agent *_batch method against its per-lead method on the same frame (the per-lead method
+runs on leads.to_dict(orient="records")), including NaN/None values, integer and object columns,
+and frames that lack an input column.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.agents.automation_agent import AutomationAgent
+from app.agents.coaching_agent import CoachingAgent
+from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from app.agents.lead_risk_agent import LeadRiskAgent
+from app.agents.ltv_agent import LtvAgent
+from app.agents.pipeline_optimization_agent import ACTIONS, PipelineOptimizationAgent
+from app.agents.revenue_forecasting_agent import RevenueForecastingAgent
+
+intelligence = LeadIntelligenceAgent()
+forecaster = RevenueForecastingAgent()
+optimizer = PipelineOptimizationAgent()
+automation = AutomationAgent()
+coaching = CoachingAgent()
+risk = LeadRiskAgent()
+ltv = LtvAgent()
+
+# (output, per-lead, batch)
+CASES = [
+    ("score", intelligence.score_lead, lambda leads: intelligence.score_lead_batch(leads)),
+    ("industry", lambda lead: intelligence.enrich_lead(lead)["industry"],
+     lambda leads: intelligence.enrich_lead_batch(leads)["industry"]),
+    ("employee_size", lambda lead: intelligence.enrich_lead(lead)["employee_size"],
+     lambda leads: intelligence.enrich_lead_batch(leads)["employee_size"]),
+    ("win_probability", lambda lead: forecaster.forecast(lead)["win_probability"],
+     lambda leads: forecaster.forecast_batch(leads)["win_probability"]),
+    ("estimated_revenue", lambda lead: forecaster.forecast(lead)["estimated_revenue"],
+     lambda leads: forecaster.forecast_batch(leads)["estimated_revenue"]),
+    ("recommended_action", lambda lead: optimizer.recommend_action(lead)["recommended_action"],
+     optimizer.recommend_action_batch),
+    ("automation_status", lambda lead: automation.execute_action(lead)["automation_status"],
+     automation.execute_action_batch),
+    ("coaching_tip", lambda lead: coaching.generate_coaching_tip(lead)["coaching_tip"],
+     coaching.generate_coaching_tip_batch),
+    ("risk_score", risk.run, risk.run_batch),
+    ("ltv", ltv.run, ltv.run_batch),
+]
+INPUTS = ["email", "company", "title", "phone", "company_size", "score", "win_probability",
+          "market_signal_detected", "recommended_action"]
+
+
+def make_leads(rows: int = 600, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    score = rng.integers(0, 101, rows).astype(float)
+    score[::7] += 0.5
+    score[::11] = 80.0
+    score[::13] = np.nan
+    win_probability = rng.integers(0, 100, rows).astype(float)
+    win_probability[::5] = 70.0
+    win_probability[::17] = np.nan
+    company_size = rng.integers(0, 5000, rows).astype(float)
+    company_size[::19] = np.nan
+    return pd.DataFrame({
+        "email": rng.choice(np.array(["a@acme.com", "b@gmail.com", "c@fintech.io", "", None, math.nan],
+                                     dtype=object), rows),
+        "company": rng.choice(np.array(["Acme Health", "Globex", None], dtype=object), rows),
+        "title": rng.choice(np.array(["CEO", "VP Sales", "Manager", "Analyst", None, math.nan],
+                                     dtype=object), rows),
+        "phone": rng.choice(np.array(["555-0100", "", None, math.nan], dtype=object), rows),
+        "company_size": company_size,
+        "score": score,
+        "win_probability": win_probability,
+        "market_signal_detected": rng.choice(np.array([True, False, None, math.nan, 1, 0], dtype=object), rows),
+        "recommended_action": rng.choice(np.array(ACTIONS + ["Unknown", None], dtype=object), rows),
+    })
+
+
+def integer_leads() -> pd.DataFrame:
+    # No gaps: numeric columns stay int64 and the signal column bool
+    leads = make_leads().dropna(subset=["score", "win_probability", "company_size"])
+    return leads.astype({"score": "int64", "win_probability": "int64", "company_size": "int64"}).assign(
+        market_signal_detected=lambda frame: frame.index % 3 == 0)
+
+
+def assert_batch_matches(leads: pd.DataFrame, per_lead, batch):
+    expected = [per_lead(lead) for lead in leads.to_dict(orient="records")]
+    actual = batch(leads)
+    assert list(actual.index) == list(leads.index)
+    assert len(actual) == len(expected)
+    for position, (want, got) in enumerate(zip(expected, actual.tolist())):
+        same = (want == got) or (isinstance(want, float) and isinstance(got, float)
+                                 and math.isnan(want) and math.isnan(got))
+        assert same, f"row {position}: per-lead {want!r}, batch {got!r}"
+
+
+@pytest.mark.parametrize("output,per_lead,batch", CASES, ids=[case[0] for case in CASES])
+def test_batch_matches_per_lead(output, per_lead, batch):
+    assert_batch_matches(make_leads(), per_lead, batch)
+
+
+@pytest.mark.parametrize("output,per_lead,batch", CASES, ids=[case[0] for case in CASES])
+def test_batch_matches_per_lead_on_integer_columns(output, per_lead, batch):
+    assert_batch_matches(integer_leads(), per_lead, batch)
+
+
+@pytest.mark.parametrize("missing", INPUTS)
+@pytest.mark.parametrize("output,per_lead,batch", CASES, ids=[case[0] for case in CASES])
+def test_batch_matches_per_lead_without_column(output, per_lead, batch, missing):
+    assert_batch_matches(make_leads(200).drop(columns=missing), per_lead, batch)
+
+
+@pytest.mark.parametrize("output,per_lead,batch", CASES, ids=[case[0] for case in CASES])
+def test_batch_of_no_leads(output, per_lead, batch):
+    assert len(batch(make_leads().iloc[:0])) == 0
+
+
+def test_batch_keeps_the_frame_index():
+    leads = make_leads(50)
+    leads.index = leads.index * 10 + 7
+    for output, per_lead, batch in CASES:
+        assert_batch_matches(leads, per_lead, batch)
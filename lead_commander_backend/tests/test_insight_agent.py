@@ -0,0 +1,40 @@
+"""
+test_insight_agent.py
+---------------------
+InsightSummarizationAgent with a stub completion service and an in-memory response cache.
+"""
+
+from app.agents.insight_agent import InsightSummarizationAgent
+from app.services.llm_cache import LLMResponseCache
+
+LEAD = {"name": "Ada", "company": "Globex", "company_size": 500, "title": "CEO", "email": "ada@globex.com"}
+
+
+class StubService:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def generate_completion(self, prompt, model="gpt-4", max_tokens=None):
+        self.calls += 1
+        return self.answer
+
+
+def test_generate_insight_caches_the_summary():
+    service = StubService("  Strong fit.  ")
+    agent = InsightSummarizationAgent(service, cache=LLMResponseCache())
+    assert agent.generate_insight(LEAD) == "Strong fit."
+    assert agent.generate_insight(dict(LEAD)) == "Strong fit."
+    assert service.calls == 1
+
+
+def test_missing_completion_is_an_empty_summary():
+    for answer in (None, ""):
+        service = StubService(answer)
+        cache = LLMResponseCache()
+        agent = InsightSummarizationAgent(service, cache=cache)
+        assert agent.generate_insight(LEAD) == ""
+        # Nothing cached: the next call asks the service again
+        assert agent.generate_insight(LEAD) == ""
+        assert service.calls == 2
+        assert cache.stats()["memory_size"] == 0
@@ -0,0 +1,63 @@
+"""
+test_lead_ingest.py
+-------------------
+upsert_leads on SQLite: inserts, updates keyed on email, and which columns an update touches.
+"""
+
+import math
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.lead import Base, Lead
+from app.services.lead_ingest import upsert_leads
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'leads.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def stored(db, email):
+    return db.execute(select(Lead.name, Lead.company, Lead.title, Lead.score).where(Lead.email == email)).one()
+
+
+def test_missing_keys_keep_stored_values(db):
+    upsert_leads(db, [{"name": "L5", "email": "l5@x5.com", "company": "Five", "title": "CEO", "score": 80.0}])
+    report = upsert_leads(db, [
+        {"name": "L5", "email": "l5@x5.com"},
+        {"name": "N", "email": "n@n.com", "company": "Acme"},
+        {"name": "L5b", "email": "l5@x5.com", "score": 60.0},
+    ])
+    assert report == dict(report, rows=3, upserted=2, skipped=1, chunks=1)
+    assert tuple(stored(db, "l5@x5.com")) == ("L5b", "Five", "CEO", 60.0)
+    assert tuple(stored(db, "n@n.com")) == ("N", "Acme", None, None)
+
+
+def test_present_missing_values_write_null(db):
+    upsert_leads(db, [{"name": "A", "email": "a@a.com", "company": "Alpha", "title": "VP"}])
+    upsert_leads(db, [{"name": "A", "email": "a@a.com", "company": None, "title": math.nan}])
+    assert tuple(stored(db, "a@a.com")) == ("A", None, None, None)
+
+
+def test_frame_updates_only_its_columns(db):
+    upsert_leads(db, [{"name": "A", "email": "a@a.com", "company": "Alpha", "score": 10.0}])
+    frame = pd.DataFrame({"name": ["A", "B", None], "email": ["a@a.com", "b@b.com", "c@c.com"],
+                          "score": [90.0, math.nan, 50.0], "extra": [1, 2, 3]})
+    report = upsert_leads(db, frame, chunk_size=2)
+    assert report == dict(report, rows=3, upserted=2, skipped=1, chunks=1)
+    assert tuple(stored(db, "a@a.com")) == ("A", "Alpha", None, 90.0)
+    assert tuple(stored(db, "b@b.com")) == ("B", None, None, None)
+
+
+def test_chunks_are_committed_separately(db):
+    rows = [{"name": f"L{i}", "email": f"l{i}@x.com", **({"company": "C"} if i % 2 else {})} for i in range(5)]
+    report = upsert_leads(db, iter(rows), chunk_size=2)
+    assert report == dict(report, rows=5, upserted=5, skipped=0, chunks=3)
+    assert db.execute(select(Lead.company).order_by(Lead.id)).scalars().all() == [None, "C", None, "C", None]
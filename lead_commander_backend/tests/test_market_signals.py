@@ -0,0 +1,98 @@
+"""
+test_market_signals.py
+----------------------
+Per-lead market signals: MarketSignalScanner.lead_signal / lead_signal_batch and the pipeline's
+market_signal stage, which prefer a signal headline naming the lead's company, then its industry.
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from app.agents.market_signal_scanner import NO_SIGNAL, MarketSignalScanner
+from app.services.news_service import HeadlineFeed, HeadlineProvider, StaticHeadlineProvider
+from app.services.pipeline_service import PipelineExecutor, default_stages
+
+HEADLINES = [
+    "Markets rally on AI optimism",
+    "Globex announces expansion into Europe",
+    "Healthcare startups see record fundraising",
+    "Initech reports quarterly results",
+]
+
+
+def scanner_for(headlines):
+    return MarketSignalScanner(feed=HeadlineFeed(StaticHeadlineProvider(headlines)))
+
+
+@pytest.fixture
+def scanner():
+    return scanner_for(HEADLINES)
+
+
+def test_lead_signal_prefers_company_then_industry(scanner):
+    assert scanner.lead_signal("Globex", "Healthcare") == HEADLINES[1]
+    assert scanner.lead_signal("Acme", "Healthcare") == HEADLINES[2]
+    # Initech is mentioned, but not in a signal headline: fall back to the first signal headline
+    assert scanner.lead_signal("Initech", "General") == HEADLINES[0]
+    assert scanner.lead_signal(None, None) == HEADLINES[0]
+    assert scanner.lead_signal(math.nan, math.nan) == HEADLINES[0]
+
+
+def test_no_signal_headlines():
+    scanner = scanner_for(["Initech reports quarterly results"])
+    assert scanner.lead_signal("Initech", "Finance") is None
+    assert scanner.scan_lead({"company": "Initech"})["market_signal"] == NO_SIGNAL
+
+
+def test_scan_lead_uses_the_company(scanner):
+    lead = {"name": "A", "company": "Globex"}
+    assert scanner.scan_lead(lead) == {"name": "A", "company": "Globex", "market_signal": HEADLINES[1]}
+
+
+def test_lead_signal_batch_matches_lead_signal(scanner):
+    leads = pd.DataFrame({
+        "company": ["Globex", "Acme", None, "Globex", math.nan, "Initech", "Acme"],
+        "industry": ["General", "Healthcare", "Healthcare", None, None, "Finance", "Healthcare"],
+    }, index=[10, 11, 12, 13, 14, 15, 16])
+    expected = [scanner.lead_signal(lead["company"], lead["industry"]) for lead in leads.to_dict(orient="records")]
+    signals = scanner.lead_signal_batch(leads)
+    assert signals.tolist() == expected
+    assert list(signals.index) == list(leads.index)
+    assert scanner.lead_signal_batch(leads.drop(columns="company")).tolist() == [
+        scanner.lead_signal(None, industry) for industry in leads["industry"]]
+    assert len(scanner.lead_signal_batch(leads.iloc[:0])) == 0
+
+
+def test_pipeline_market_signal_per_lead(scanner):
+    executor = PipelineExecutor(default_stages(scanner=scanner))
+    leads = pd.DataFrame({
+        "email": ["a@globex.com", "b@healthplus.org", "c@example.com", None],
+        "company": ["Globex", "Acme Health", None, "Initech"],
+        "company_size": [500, 20, 5, 100],
+    })
+    outputs = ["market_signal", "market_signal_detected", "win_probability"]
+    by_frame = executor.run_frame(leads, outputs).records
+    by_dict = executor.run(leads.to_dict(orient="records"), outputs).records
+    assert by_frame["market_signal"].tolist() == [record["market_signal"] for record in by_dict]
+    assert by_frame["market_signal"].tolist()[:2] == [HEADLINES[1], HEADLINES[2]]
+    # Detection stays batch-wide: every lead sees that some headline carries a signal
+    assert by_frame["market_signal_detected"].tolist() == [True] * 4
+    assert [record["market_signal_detected"] for record in by_dict] == [True] * 4
+
+
+def test_forecasts_do_not_need_enrichment(scanner):
+    stages = [stage.name for stage in PipelineExecutor(default_stages(scanner=scanner)).plan(["win_probability"])]
+    assert "lead_enrichment" not in stages and "market_signal" not in stages
+
+
+def test_headline_provider_is_abstract():
+    with pytest.raises(TypeError):
+        HeadlineProvider()
+
+    class Incomplete(HeadlineProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
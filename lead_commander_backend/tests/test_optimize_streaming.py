@@ -0,0 +1,123 @@
+"""
+test_optimize_streaming.py
+--------------------------
+The bounded-memory /optimize paths (app/services/streaming_service.py) against scoring the whole
+upload in memory: same rows in the same order, and a peak-memory ceiling that does not grow with
+the size of the file.
+"""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import streaming_service
+from app.services.scoring_service import score_leads, select_top
+from app.services.streaming_service import iter_scored_chunks, merge_sorted_runs, spill_sorted_runs, top_scored_rows
+
+CHUNK_SIZE = 4_000
+# Peak traced allocations (MB) allowed while streaming, whatever the file size
+STREAM_CEILING_MB = 8
+TOP_K_CEILING_MB = 4
+
+
+def make_leads(rows: int, seed: int = 0) -> pd.DataFrame:
+    # The columns the /optimize rules read, with dirty cells that take the float() fallback
+    rng = np.random.default_rng(seed)
+    leads = pd.DataFrame({
+        "Lead Number": np.arange(rows),
+        "Lead Source": rng.choice(["Organic Search", "Direct Traffic", "Olark Chat", "Google", None], rows),
+        "TotalVisits": rng.integers(0, 10, rows).astype(float),
+        "Total Time Spent on Website": rng.integers(0, 2000, rows),
+        "Lead Profile": rng.choice(["Potential Lead", "Select", "Other Leads", None], rows),
+        "Asymmetrique Activity Score": rng.integers(10, 20, rows).astype(float),
+        "Asymmetrique Profile Score": rng.integers(10, 20, rows).astype(object),
+        "Last Notable Activity": rng.choice(["Email Opened", "Modified", "SMS Sent"], rows),
+    })
+    leads.loc[leads.index[::97], "TotalVisits"] = np.nan
+    leads.loc[leads.index[::89], "Asymmetrique Profile Score"] = "n/a"
+    return leads
+
+
+def write_csv(path, rows: int) -> str:
+    make_leads(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def in_memory(path) -> pd.DataFrame:
+    # The non-streaming /optimize path: whole file, scored, stable sort by Score descending
+    leads = pd.read_csv(path)
+    leads["Score"] = score_leads(leads)
+    return leads.sort_values("Score", ascending=False, kind="stable")
+
+
+def peak_mb(consume) -> float:
+    tracemalloc.start()
+    try:
+        consume()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def drain(rows) -> int:
+    count = 0
+    for _ in rows:
+        count += 1
+    return count
+
+
+@pytest.fixture(scope="module")
+def leads_csv(tmp_path_factory):
+    return write_csv(tmp_path_factory.mktemp("optimize") / "leads.csv", 30_000)
+
+
+@pytest.mark.parametrize("fan_in", [16, 3])
+@pytest.mark.parametrize("min_score", [None, 40])
+def test_stream_matches_in_memory_sort(leads_csv, min_score, fan_in, monkeypatch):
+    # fan_in=3 merges the 8 runs in two passes
+    monkeypatch.setattr(streaming_service, "MAX_MERGE_FAN_IN", fan_in)
+    expected = in_memory(leads_csv)
+    if min_score is not None:
+        expected = expected[expected["Score"] >= min_score]
+    streamed = list(merge_sorted_runs(spill_sorted_runs(leads_csv, chunksize=CHUNK_SIZE, min_score=min_score)))
+    assert [row["Lead Number"] for row in streamed] == expected["Lead Number"].tolist()
+    assert [row["Score"] for row in streamed] == expected["Score"].tolist()
+
+
+@pytest.mark.parametrize("limit,min_score", [(1, None), (500, None), (500, 40), (100_000, None)])
+def test_top_k_matches_select_top(leads_csv, limit, min_score):
+    scored = pd.read_csv(leads_csv)
+    scored["Score"] = score_leads(scored)
+    expected = select_top(scored, limit=limit, min_score=min_score)
+    top = top_scored_rows(leads_csv, limit, min_score=min_score, chunksize=CHUNK_SIZE)
+    assert top["Lead Number"].tolist() == expected["Lead Number"].tolist()
+    assert top["Lead Number"].tolist() == in_memory(leads_csv).query(
+        "Score >= @min_score" if min_score is not None else "Score == Score")["Lead Number"].tolist()[:limit]
+
+
+def test_chunks_keep_upload_order(leads_csv):
+    chunks = list(iter_scored_chunks(leads_csv, chunksize=CHUNK_SIZE))
+    assert max(len(chunk) for chunk in chunks) == CHUNK_SIZE
+    assert pd.concat(chunks)["Lead Number"].tolist() == list(range(30_000))
+
+
+def test_stream_peak_memory_is_bounded(tmp_path, monkeypatch):
+    # Both files have more runs (10 and 20) than the fan-in, so both merge in several passes
+    monkeypatch.setattr(streaming_service, "MAX_MERGE_FAN_IN", 4)
+    small = write_csv(tmp_path / "small.csv", 40_000)
+    large = write_csv(tmp_path / "large.csv", 80_000)
+    whole_file = peak_mb(lambda: in_memory(large).to_dict(orient="records"))
+    peaks = {path: peak_mb(lambda: drain(merge_sorted_runs(spill_sorted_runs(path, chunksize=CHUNK_SIZE))))
+             for path in (small, large)}
+    assert peaks[large] < STREAM_CEILING_MB, peaks
+    # Doubling the file adds passes over disk, not memory
+    assert peaks[large] < 1.25 * peaks[small], peaks
+    assert peaks[large] < whole_file / 4, (peaks, whole_file)
+
+
+def test_top_k_peak_memory_is_bounded(tmp_path):
+    large = write_csv(tmp_path / "large.csv", 80_000)
+    peak = peak_mb(lambda: top_scored_rows(large, 500, chunksize=CHUNK_SIZE))
+    assert peak < TOP_K_CEILING_MB
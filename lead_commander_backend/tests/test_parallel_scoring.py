@@ -0,0 +1,84 @@
+"""
+test_parallel_scoring.py
+------------------------
+Sharded scoring and enrichment (app/services/parallel_scoring.py) against the single-process
+results, and that batches larger than one shard really go through the worker pool.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from app.services import parallel_scoring
+from app.services.parallel_scoring import enrich_parallel, score_parallel, shutdown_pool
+from app.services.scoring_service import get_scoring_plan, score_leads
+
+
+def make_leads(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "title": rng.choice(np.array(["Chief Executive Officer", "VP of Sales", "Sales Manager", "Analyst", None],
+                                     dtype=object), rows),
+        "email": rng.choice(["a@gmail.com", "b@acmefinance.com", "c@techsoft.io", ""], rows),
+        "phone": rng.choice(["555-0100", ""], rows),
+        "company_size": rng.integers(1, 5000, rows),
+        "company": rng.choice(["Acme Health", "Globex"], rows),
+    })
+
+
+@pytest.fixture
+def pool_calls(monkeypatch):
+    # Counts shards handed to the pool
+    calls = []
+    get_pool = parallel_scoring._get_pool
+
+    def counting_get_pool(workers):
+        calls.append(workers)
+        return get_pool(workers)
+
+    monkeypatch.setattr(parallel_scoring, "_get_pool", counting_get_pool)
+    yield calls
+    shutdown_pool()
+
+
+def test_score_parallel_shards_across_the_pool(pool_calls):
+    leads = make_leads(5_000)
+    scores = score_parallel(leads, "lead_intelligence", workers=2, chunk_size=1_000)
+    assert pool_calls == [2]
+    assert parallel_scoring._pool is not None
+    assert scores.equals(get_scoring_plan("lead_intelligence").score_frame(leads))
+
+
+def test_enrich_parallel_shards_across_the_pool(pool_calls):
+    leads = make_leads(5_000)
+    enriched = enrich_parallel(leads, workers=2, chunk_size=1_000)
+    assert pool_calls == [2]
+    assert enriched.equals(LeadIntelligenceAgent().enrich_lead_batch(leads))
+
+
+def test_small_batches_run_inline(pool_calls):
+    leads = make_leads(500)
+    assert score_parallel(leads, "lead_intelligence", workers=2, chunk_size=1_000).equals(
+        get_scoring_plan("lead_intelligence").score_frame(leads))
+    assert pool_calls == []
+
+
+def test_results_keep_the_frame_index(pool_calls):
+    leads = make_leads(3_000)
+    leads.index = leads.index * 3 + 1
+    scores = score_parallel(leads, "lead_intelligence", workers=2, chunk_size=1_000)
+    assert list(scores.index) == list(leads.index)
+    assert scores.equals(get_scoring_plan("lead_intelligence").score_frame(leads))
+
+
+def test_defaults_match_score_leads(pool_calls):
+    leads = make_leads(3_000)
+    # Same default rule set as score_leads, and no pool unless SCORING_WORKERS asks for one
+    assert score_parallel(leads, chunk_size=1_000).equals(score_leads(leads))
+    assert parallel_scoring.SCORING_WORKERS == 1 and pool_calls == []
+
+
+def test_invalid_worker_counts():
+    with pytest.raises(ValueError):
+        score_parallel(make_leads(10), workers=0)
@@ -0,0 +1,57 @@
+"""
+test_rate_limit.py
+------------------
+Token buckets shared by sync and async callers, and the sync completion path's rate limiting.
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from app.services.openai_service import OpenAIService
+from app.services.rate_limit import RateLimiter, TokenBucket
+
+
+def test_acquire_sync_waits_for_tokens():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire_sync()
+    # One token up front, then three refills at 50 per second
+    assert time.monotonic() - start >= 0.05
+
+
+def test_sync_and_async_callers_share_the_budget():
+    bucket = TokenBucket(rate=50, capacity=2)
+    bucket.acquire_sync(2)
+    start = time.monotonic()
+    asyncio.run(bucket.acquire(1))
+    assert time.monotonic() - start >= 0.015
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__()
+        self.acquired = []
+
+    def acquire_sync(self, tokens: int):
+        self.acquired.append(tokens)
+
+
+def test_generate_completion_acquires_per_attempt(monkeypatch):
+    statuses = iter([429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        body = {"choices": [{"message": {"content": "ok"}}]} if status == 200 else {}
+        return httpx.Response(status, json=body, headers={"retry-after": "0"})
+
+    monkeypatch.setattr("app.services.openai_service.backoff_delay", lambda attempt, retry_after=None: 0)
+    service = OpenAIService("key", base_url="http://fake", max_tokens=10)
+    service.rate_limiter = RecordingLimiter()
+    service._client = httpx.Client(base_url="http://fake", transport=httpx.MockTransport(handler))
+    with service:
+        assert service.generate_completion("x" * 40) == "ok"
+    # Two attempts, each charged one request and 40 // 4 + 1 + 10 tokens
+    assert service.rate_limiter.acquired == [21, 21]
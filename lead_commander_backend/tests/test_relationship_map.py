@@ -0,0 +1,67 @@
+"""
+test_relationship_map.py
+------------------------
+RelationshipMappingAgent against the former pairwise scan, and the shape of its results.
+"""
+
+import json
+import math
+
+import pytest
+
+from app.agents.relationship_mapping_agent import RelationshipMap, RelationshipMappingAgent
+
+LEADS = [
+    {"id": 1, "industry": "Finance", "location": "Austin"},
+    {"id": 2, "industry": "Finance", "location": "Boston"},
+    {"id": 3, "industry": "Technology", "location": "Boston"},
+    {"id": 4, "industry": None, "location": math.nan},
+    {"id": 5, "industry": None, "location": "Denver"},
+    {"id": 2, "industry": "Healthcare", "location": "Austin"},
+    {"id": 6, "location": math.nan},
+]
+
+
+def pairwise_run(leads_list):
+    # The original O(n^2) implementation
+    relationships = {}
+    for lead in leads_list:
+        lead_id = lead.get("id")
+        connections = []
+        for other_lead in leads_list:
+            if other_lead["id"] != lead_id and (
+                lead.get("industry") == other_lead.get("industry") or
+                lead.get("location") == other_lead.get("location")
+            ):
+                connections.append(other_lead["id"])
+        relationships[lead_id] = {"connections": connections}
+    return relationships
+
+
+@pytest.fixture
+def agent():
+    return RelationshipMappingAgent()
+
+
+def test_run_matches_pairwise_scan(agent):
+    expected = pairwise_run(LEADS)
+    result = agent.run(LEADS)
+    assert type(result) is dict
+    assert list(result) == list(expected) and result == expected
+
+
+def test_run_is_json_serialisable(agent):
+    result = agent.run(LEADS)
+    assert json.loads(json.dumps(result)) == {str(lead_id): entry for lead_id, entry in result.items()}
+
+
+def test_run_lazy_is_the_same_mapping(agent):
+    lazy = agent.run_lazy(LEADS)
+    assert isinstance(lazy, RelationshipMap)
+    assert len(lazy) == len(pairwise_run(LEADS))
+    assert lazy.to_dict() == agent.run(LEADS)
+    assert lazy[1] == pairwise_run(LEADS)[1] == {"connections": [2, 2]}
+
+
+def test_empty_leads(agent):
+    assert agent.run([]) == {}
@@ -0,0 +1,150 @@
+"""
+test_relationship_store.py
+--------------------------
+RelationshipStore against a full RelationshipMappingAgent rebuild, and the stored-graph
+/insights/relationships routes.
+"""
+
+import math
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.agents.relationship_mapping_agent import RelationshipMappingAgent
+from app.routes import insight_routes
+from app.services import relationship_store
+from app.services.relationship_store import JOURNAL_SUFFIX, RelationshipStore, get_relationship_store
+
+LEADS = [
+    {"id": 1, "industry": "Finance", "location": "Austin"},
+    {"id": 2, "industry": "Finance", "location": "Boston"},
+    {"id": 3, "industry": "Technology", "location": "Boston"},
+    {"id": 4, "industry": None, "location": math.nan},
+    {"id": 5, "industry": None, "location": "Denver"},
+    {"id": 6, "industry": "Healthcare", "location": "Austin"},
+]
+
+
+def assert_matches_rebuild(store):
+    expected = RelationshipMappingAgent().run(store.leads())
+    assert {lead_id: store.relationship_map(lead_id) for lead_id in expected} == expected
+    assert [store.degree(lead_id) for lead_id in expected] == [len(entry["connections"]) for entry in expected.values()]
+
+
+def test_updates_match_a_rebuild():
+    store = RelationshipStore()
+    store.upsert_many(LEADS)
+    assert_matches_rebuild(store)
+    store.upsert({"id": 3, "industry": "Finance", "location": "Denver"})
+    store.upsert({"id": 7, "industry": "Technology", "location": "Austin"})
+    assert store.remove(1) and not store.remove(1)
+    assert_matches_rebuild(store)
+    assert store.bucket("industry", "Finance") == [2, 3]
+
+
+def test_save_and_load(tmp_path):
+    store = RelationshipStore()
+    store.upsert_many(LEADS)
+    path = str(tmp_path / "relationships.json")
+    store.save(path)
+    loaded = RelationshipStore.load(path)
+    assert [lead["id"] for lead in loaded.leads()] == [lead["id"] for lead in LEADS]
+    assert [loaded.connections(lead["id"]) for lead in LEADS] == [store.connections(lead["id"]) for lead in LEADS]
+
+
+def test_an_upsert_appends_to_the_journal_only(tmp_path):
+    path = str(tmp_path / "relationships.json")
+    seeded = RelationshipStore()
+    seeded.upsert_many(LEADS)
+    seeded.save(path)
+    snapshot = open(path, "rb").read()
+
+    store = RelationshipStore.open(path)
+    store.upsert({"id": 3, "industry": "Finance", "location": "Denver"})
+    store.remove(6)
+    store.flush()
+    assert open(path, "rb").read() == snapshot
+    assert len(open(path + JOURNAL_SUFFIX).readlines()) == 2
+    store.close()
+
+    reopened = RelationshipStore.open(path)
+    assert [lead["id"] for lead in reopened.leads()] == [lead["id"] for lead in store.leads()] == [1, 2, 3, 4, 5]
+    assert [reopened.connections(lead_id) for lead_id in (1, 2, 3, 5)] == \
+        [store.connections(lead_id) for lead_id in (1, 2, 3, 5)]
+    assert_matches_rebuild(reopened)
+    reopened.close()
+
+
+def test_journal_is_compacted_once_it_outgrows_the_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(relationship_store, "JOURNAL_COMPACT_MIN", 4)
+    path = str(tmp_path / "relationships.json")
+    store = RelationshipStore.open(path)
+    store.upsert_many(LEADS[:3])
+    store.flush()
+    assert not (tmp_path / "relationships.json").exists()
+    store.upsert_many(LEADS[3:])
+    store.upsert({"id": 1, "industry": "Retail", "location": "Austin"})
+    store.flush()
+    # 7 journaled changes > 6 leads: folded into a snapshot, journal emptied
+    assert (tmp_path / "relationships.json").exists()
+    assert open(path + JOURNAL_SUFFIX).read() == ""
+    store.close()
+    assert RelationshipStore.open(path).connections(1) == store.connections(1) == [6]
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    path = str(tmp_path / "relationships.json")
+    store = RelationshipStore.open(path)
+    store.upsert_many(LEADS[:2])
+    store.close()
+    with open(path + JOURNAL_SUFFIX, "a") as journal:
+        journal.write('{"op":"upsert","id":9,"val')
+    reopened = RelationshipStore.open(path)
+    assert len(reopened) == 2 and reopened.connections(1) == [2]
+    reopened.close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("RELATIONSHIP_STORE_PATH", str(tmp_path / "relationships.json"))
+    get_relationship_store.cache_clear()
+    app = FastAPI()
+    app.include_router(insight_routes.router, prefix="/insights")
+    yield TestClient(app)
+    get_relationship_store().close()
+    get_relationship_store.cache_clear()
+
+
+def test_routes_maintain_the_stored_graph(client, tmp_path):
+    leads = [dict(lead, location=lead["location"] if lead["location"] == lead["location"] else None)
+             for lead in LEADS]
+    response = client.put("/insights/relationships/leads", json={"leads": leads})
+    assert response.json()["data"] == {"updated": 6, "leads": 6}
+    # Persisted as journal lines, not as a snapshot
+    assert not (tmp_path / "relationships.json").exists()
+    assert len((tmp_path / ("relationships.json" + JOURNAL_SUFFIX)).read_text().splitlines()) == 6
+
+    data = client.get("/insights/relationships/leads/2").json()["data"]
+    assert data == {"id": 2, "connections": [1, 3], "degree": 2}
+    assert client.get("/insights/relationships/leads/99").status_code == 404
+
+    client.put("/insights/relationships/leads", json={"leads": [{"id": 2, "industry": "Retail", "location": "Boston"}]})
+    assert client.get("/insights/relationships/leads/1").json()["data"]["connections"] == [6]
+    assert client.post("/insights/relationships/leads/remove", json={"ids": [3, 99]}).json()["data"] == {
+        "removed": 1, "leads": 5}
+
+    # Analytics without a leads list run over the stored graph
+    insights = client.post("/insights/relationships", json={}).json()["data"]
+    assert insights["leads"] == 5
+    path = client.post("/insights/relationships/path", json={"source_id": 1, "target_id": 6}).json()["data"]
+    assert path["path"] == [1, 6]
+
+    # A new process loads the persisted graph
+    get_relationship_store().close()
+    get_relationship_store.cache_clear()
+    assert client.get("/insights/relationships/leads/5").json()["data"]["connections"] == [4]
+
+
+def test_leads_need_ids(client):
+    assert client.put("/insights/relationships/leads", json={"leads": [{"industry": "Finance"}]}).status_code == 400
@@ -0,0 +1,72 @@
+"""
+test_score_materializer.py
+--------------------------
+recompute_scores on SQLite: leads with optional inputs missing, and refreshing only what changed.
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.agents.lead_intelligence_agent import LeadIntelligenceAgent
+from app.models.lead import Base, Lead
+from app.services.lead_ingest import upsert_leads
+from app.services.pipeline_service import PipelineExecutor, default_stages
+from app.services.score_materializer import INPUT_FIELDS, OUTPUT_FIELDS, recompute_scores
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def stored_frame(db) -> pd.DataFrame:
+    fields = ("id",) + INPUT_FIELDS + OUTPUT_FIELDS
+    return pd.DataFrame(db.execute(select(*(getattr(Lead, field) for field in fields)).order_by(Lead.id))
+                        .mappings().all())
+
+
+def assert_matches_pipeline(db):
+    stored = stored_frame(db)
+    fresh = PipelineExecutor(default_stages()).run(stored[["id", *INPUT_FIELDS]].to_dict(orient="records"),
+                                                   OUTPUT_FIELDS).records
+    for field in OUTPUT_FIELDS:
+        assert stored[field].tolist() == [record[field] for record in fresh], field
+
+
+def test_leads_without_company_size(db):
+    # Every company_size in the batch is NULL: the column loads as an object column of None
+    upsert_leads(db, [{"name": "a", "email": "a@x.com"}, {"name": "b", "email": "b@tech.com", "title": "CEO"}])
+    report = recompute_scores(db)
+    assert (report["scanned"], report["refreshed"]) == (2, 2)
+    assert_matches_pipeline(db)
+    assert recompute_scores(db)["refreshed"] == 0
+
+
+def test_some_leads_without_company_size(db):
+    upsert_leads(db, [{"name": "a", "email": "a@x.com", "company_size": 1200},
+                      {"name": "b", "email": "b@tech.com", "title": "CEO"},
+                      {"name": "c", "email": "c@health.org", "company_size": 60, "phone": "555-0100"}])
+    assert recompute_scores(db, batch_size=2)["refreshed"] == 3
+    assert_matches_pipeline(db)
+
+
+def test_only_changed_leads_are_refreshed(db):
+    upsert_leads(db, [{"name": f"L{i}", "email": f"l{i}@co{i}.com", "company_size": 10 * i} for i in range(6)])
+    recompute_scores(db, batch_size=4)
+    upsert_leads(db, [{"name": "L2", "email": "l2@co2.com", "title": "VP of Sales"}])
+    assert recompute_scores(db, batch_size=4)["refreshed"] == 1
+    assert recompute_scores(db, force=True)["refreshed"] == 6
+    assert_matches_pipeline(db)
+
+
+def test_missing_company_size_is_the_smallest_category():
+    agent = LeadIntelligenceAgent()
+    assert agent.employee_size_for(None) == agent.employee_size_for(0)
+    sizes = pd.DataFrame({"company_size": pd.Series([None, None], dtype=object)})
+    assert agent.enrich_lead_batch(sizes)["employee_size"].tolist() == [agent.employee_size_for(0)] * 2
@@ -0,0 +1,108 @@
+"""
+test_scoring_rules.py
+---------------------
+The compiled lead_intelligence rule set against the original LeadIntelligenceAgent if-chains,
+including None, NaN and falsy inputs, for single records and whole DataFrames.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.scoring_service import get_scoring_plan
+
+
+def original_field_weight(field_name, field_value):
+    # LeadIntelligenceAgent._calculate_field_weight before the rules were compiled
+    if field_name == "company_size":
+        try:
+            size = int(field_value)
+            if size >= 1000:
+                return 1.0
+            elif size >= 250:
+                return 0.7
+            elif size >= 50:
+                return 0.4
+            elif size > 0:
+                return 0.1
+        except (TypeError, ValueError):
+            return 0.0
+        return 0.0
+    if field_name == "title":
+        if not field_value:
+            return 0.0
+        title = str(field_value).lower()
+        if any(senior in title for senior in ["chief", "ceo", "cfo", "coo", "cto", "cmo"]):
+            return 1.0
+        elif any(mid in title for mid in ["vp", "vice president", "director"]):
+            return 0.7
+        elif "manager" in title:
+            return 0.4
+        return 0.1
+    if field_name == "email":
+        if not field_value or "@" not in field_value:
+            return 0.0
+        domain = field_value.split("@")[-1].lower()
+        if any(free in domain for free in ["gmail.com", "yahoo.com", "hotmail.com", "outlook.com"]):
+            return 0.3
+        return 1.0
+    if field_name == "phone":
+        return 1.0 if field_value else 0.0
+
+
+def original_score(lead):
+    weights = {"company_size": 40, "title": 30, "email": 20, "phone": 10}
+    if isinstance(lead.get("email"), float):
+        # The original raised TypeError for a NaN email; the rules score it like None
+        lead = dict(lead, email=None)
+    score = sum(original_field_weight(field, lead.get(field, None)) * weight for field, weight in weights.items())
+    return int(min(100, max(0, score // 100)))
+
+
+VALUES = {
+    "company_size": [None, math.nan, 0, -5, 10, 50, 249, 250, 999, 1000, 5000, "300", "many", 120.7],
+    "title": [None, math.nan, "", "CEO", "Chief of Staff", "VP Sales", "Sales Director", "Manager", "Engineer", 0],
+    # NaN is left out: the original `"@" not in field_value` raised TypeError for it
+    "email": [None, "", "no-at-sign", "a@acme.com", "a@gmail.com", "a@mail.yahoo.com", "a@b@outlook.com"],
+    "phone": [None, math.nan, "", "555-0100", 0, 5550100],
+}
+
+
+@pytest.fixture(scope="module")
+def plan():
+    return get_scoring_plan("lead_intelligence")
+
+
+@pytest.mark.parametrize("field,value", [(field, value) for field, values in VALUES.items() for value in values])
+def test_field_factor_matches_original(plan, field, value):
+    assert plan.field_factor(field, value) == original_field_weight(field, value)
+
+
+def test_nan_title_and_phone_score_as_values(plan):
+    # Python treats NaN as truthy: a NaN phone counted as present and a NaN title as "other"
+    assert plan.field_factor("phone", math.nan) == 1.0
+    assert plan.field_factor("title", math.nan) == 0.1
+    assert plan.field_factor("phone", None) == 0.0
+    assert plan.field_factor("title", None) == 0.0
+    assert plan.field_factor("email", math.nan) == 0.0
+
+
+def test_frame_and_records_match_original(plan):
+    rng = np.random.default_rng(0)
+    rows = 2000
+    leads = pd.DataFrame({field: [values[i] for i in rng.integers(0, len(values), rows)]
+                          for field, values in VALUES.items()})
+    expected = [original_score(lead) for lead in leads.to_dict(orient="records")]
+    assert [plan.score_record(lead) for lead in leads.to_dict(orient="records")] == expected
+    assert plan.score_frame(leads).tolist() == expected
+
+
+def test_float_columns_with_nan(plan):
+    # All-numeric phone and title columns are float64, so their gaps are NaN rather than None
+    leads = pd.DataFrame({"company_size": [100.0, np.nan, 2000.0], "title": [np.nan, np.nan, 1.0],
+                          "email": ["a@acme.com", None, "b@gmail.com"], "phone": [np.nan, 5550100.0, 0.0]})
+    expected = [original_score(lead) for lead in leads.to_dict(orient="records")]
+    assert plan.score_frame(leads).tolist() == expected
+    assert [plan.score_record(lead) for lead in leads.to_dict(orient="records")] == expected